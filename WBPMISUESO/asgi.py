@@ -3,6 +3,9 @@ ASGI config for WBPMISUESO project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Only the notification stream (/notifications/stream/) is served from here;
+the rest of the site runs under WBPMISUESO.wsgi.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import worker_ready
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'WBPMISUESO.settings')
 
@@ -12,8 +13,20 @@ else:
 	app.conf.broker_url = 'redis://127.0.0.1:6379/0'  # Or your Railway Redis URL
 
 # --- Celery Startup Hook ---
-@app.on_after_configure.connect
+def consumes_default_queue(consumer):
+	"""Whether the worker serves the default queue (the inference worker only serves ai_inference)."""
+	try:
+		queues = {queue.name for queue in consumer.task_consumer.queues}
+	except AttributeError:
+		return os.environ.get('AI_INFERENCE_WORKER', 'False') != 'True'
+	return app.conf.task_default_queue in queues
+
+
+# Runs when a default-queue worker starts, not in web processes that only publish tasks
+@worker_ready.connect
 def celery_startup(sender, **kwargs):
+	if not consumes_default_queue(sender):
+		return
 	print("✓ Celery worker started and ready. Triggering all scheduled tasks once...")
 	try:
 		from system.scheduler.tasks import (
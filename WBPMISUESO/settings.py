@@ -127,6 +127,9 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
 
+    # API key usage metering and RateLimit headers
+    'system.api.middleware.APIUsageMiddleware',
+
     # Custom Cache Middleware
     'system.users.middleware.SmartCacheMiddleware',
 
@@ -142,9 +145,25 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'system.api.ratelimit.APIConnectionRateThrottle',
+    ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# Verified API keys are cached (Redis, then per process) so requests skip the key hash check;
+# saving an APIConnection or APIKey drops its entry
+API_KEY_CACHE_SECONDS = int(os.environ.get('API_KEY_CACHE_SECONDS', 300))
+API_KEY_LOCAL_CACHE_SECONDS = int(os.environ.get('API_KEY_LOCAL_CACHE_SECONDS', 5))
+
+# Token bucket per API connection: requests per minute by tier (also the burst size; 0 = unlimited)
+API_RATE_LIMITS = {
+    'TIER_1': int(os.environ.get('API_RATE_LIMIT_TIER_1', 60)),
+    'TIER_2': int(os.environ.get('API_RATE_LIMIT_TIER_2', 120)),
+    'TIER_3': int(os.environ.get('API_RATE_LIMIT_TIER_3', 300)),
+}
+API_USAGE_RETENTION_DAYS = int(os.environ.get('API_USAGE_RETENTION_DAYS', 30))
+
 # API Documentation Metadata
 SPECTACULAR_SETTINGS = {
     'TITLE': 'UESO-PMIS',
@@ -307,8 +326,30 @@ if os.environ.get('DEPLOYED', 'False') == 'True':
 if os.environ.get('DEPLOYED', 'False') == 'True':
     SENDGRID_API_KEY = os.environ.get('SENDGRID_API_KEY', '')
     SENDGRID_FROM_EMAIL = os.environ.get('SENDGRID_FROM_EMAIL', 'noreply@example.com')
+    EMAIL_OUTBOX_TRANSPORT = os.environ.get('EMAIL_OUTBOX_TRANSPORT', 'sendgrid' if SENDGRID_API_KEY else 'django')
 else:
-    EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+    EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+    # e.g. EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend with a local debugging SMTP server
+    EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+    EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 1025))
+    EMAIL_OUTBOX_TRANSPORT = os.environ.get('EMAIL_OUTBOX_TRANSPORT', 'django')
+
+# Outbox: async_send_mail stores messages in EmailOutbox and a Celery worker sends them in batches.
+# EMAIL_OUTBOX_TRANSPORT (above): 'sendgrid' posts to the SendGrid v3 API, 'django' delivers
+# through EMAIL_BACKEND (console or a local SMTP server as an offline stand-in).
+# Drain in the web process right after commit instead of on a worker (development without Celery)
+EMAIL_OUTBOX_EAGER = os.environ.get(
+    'EMAIL_OUTBOX_EAGER', 'False' if os.environ.get('DEPLOYED', 'False') == 'True' else 'True'
+) == 'True'
+EMAIL_OUTBOX_BATCH_SIZE = int(os.environ.get('EMAIL_OUTBOX_BATCH_SIZE', 200))      # rows claimed per batch
+EMAIL_OUTBOX_MAX_BATCHES = int(os.environ.get('EMAIL_OUTBOX_MAX_BATCHES', 25))     # batches per drain task
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS', 6))    # before a row is marked FAILED
+EMAIL_OUTBOX_BASE_BACKOFF = 30        # seconds before the first retry, doubled per attempt
+EMAIL_OUTBOX_MAX_BACKOFF = 60 * 60    # longest wait between retries
+EMAIL_OUTBOX_LEASE_SECONDS = 5 * 60   # a claimed row is retried if its worker dies before finishing
+EMAIL_OUTBOX_TIMEOUT = 15             # seconds per provider request
+EMAIL_OUTBOX_POOL_SIZE = 4            # keep-alive connections in the shared HTTP session
+EMAIL_OUTBOX_RETENTION_DAYS = 14      # sent rows kept for latency metrics and auditing
 
 
 # ============================================================
@@ -345,6 +386,9 @@ CSRF_COOKIE_NAME = 'csrftoken'
 USER_CACHE_SECONDS = 600            # 10 minutes for logged-in pages
 CACHE_MIDDLEWARE_SECONDS = 86400    # 24 hours for anonymous pages
 CACHE_MIDDLEWARE_KEY_PREFIX = ''
+ANALYTICS_CACHE_SECONDS = int(os.environ.get('ANALYTICS_CACHE_SECONDS', 15 * 60))  # analytics results are fresh this long (stale sooner on relevant writes)
+ANALYTICS_CACHE_STALE_SECONDS = int(os.environ.get('ANALYTICS_CACHE_STALE_SECONDS', 24 * 60 * 60))  # stale results served while refreshing, up to this age
+ANALYTICS_CACHE_WAIT_SECONDS = int(os.environ.get('ANALYTICS_CACHE_WAIT_SECONDS', 10))  # wait for a concurrent computation of the same result
 
 if os.environ.get('DEPLOYED', 'False') == 'True':  
     REDIS_URL = os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379')
@@ -366,6 +410,13 @@ CACHES = {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
             'KEY_PREFIX': 'session:',
         }
+    },
+    'counters': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': f"{REDIS_URL}/3",  # Unread notification counters (survive page cache clears)
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+        }
     }
 }
 
@@ -379,6 +430,75 @@ SESSION_SAVE_EVERY_REQUEST = False
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False
 
 
+# ============================================================
+# AI TEAM GENERATION (INFERENCE SERVICE)
+# ============================================================
+
+# 'celery': web workers send searches to one dedicated worker that keeps the model loaded:
+#     AI_INFERENCE_WORKER=True celery -A WBPMISUESO worker -Q ai_inference --pool=solo
+# 'local': the model runs inside the web process (development)
+if os.environ.get('DEPLOYED', 'False') == 'True':
+    AI_INFERENCE_MODE = os.environ.get('AI_INFERENCE_MODE', 'celery')
+else:
+    AI_INFERENCE_MODE = os.environ.get('AI_INFERENCE_MODE', 'local')
+
+AI_INFERENCE_QUEUE = 'ai_inference'
+AI_INFERENCE_MAX_QUEUE = int(os.environ.get('AI_INFERENCE_MAX_QUEUE', 8))      # pending searches before returning 503
+AI_INFERENCE_TIMEOUT = int(os.environ.get('AI_INFERENCE_TIMEOUT', 30))         # seconds a web worker waits for a result
+AI_INFERENCE_THREADS = int(os.environ.get('AI_INFERENCE_THREADS', 2))          # torch CPU threads on the inference worker
+AI_INFERENCE_WORKER = os.environ.get('AI_INFERENCE_WORKER', 'False') == 'True' # preload the model when this worker starts
+
+
+# ============================================================
+# SCHEDULER
+# ============================================================
+
+# Re-evaluate faculty expert status right after project/provider changes,
+# between the daily full runs of update_user_expert_status
+EXPERT_STATUS_INCREMENTAL = os.environ.get('EXPERT_STATUS_INCREMENTAL', 'True') == 'True'
+
+
+# ============================================================
+# EXPORTS
+# ============================================================
+
+# Generated export files. Keep this outside MEDIA_ROOT (served publicly under /media/);
+# the web process and the Celery worker must both see it
+EXPORT_ARTIFACT_ROOT = os.environ.get('EXPORT_ARTIFACT_ROOT', os.path.join(BASE_DIR, 'private_media'))
+
+# An export job that has not written progress for this long (worker died or the
+# task was lost) is treated as dead: approving or downloading queues it again
+EXPORT_JOB_LEASE_SECONDS = int(os.environ.get('EXPORT_JOB_LEASE_SECONDS', 15 * 60))
+
+
+# ============================================================
+# NOTIFICATIONS
+# ============================================================
+
+# Notification fan-out runs in a Celery task after the log entry commits;
+# eager mode fans out in the web process instead (development without a worker)
+NOTIFICATION_FANOUT_EAGER = os.environ.get(
+    'NOTIFICATION_FANOUT_EAGER', 'False' if os.environ.get('DEPLOYED', 'False') == 'True' else 'True'
+) == 'True'
+NOTIFICATION_FANOUT_CHUNK_SIZE = int(os.environ.get('NOTIFICATION_FANOUT_CHUNK_SIZE', 1000))  # rows per INSERT
+# Unread counters are updated in place; this job rewrites any that drifted
+NOTIFICATION_COUNTER_RECONCILE_SECONDS = int(os.environ.get('NOTIFICATION_COUNTER_RECONCILE_SECONDS', 60 * 60))
+# Server-sent notification stream. The site runs under WSGI and answers 204 on the stream path;
+# the ASGI stream process (Procfile "stream", railway-stream.json) serves it. Either route
+# /notifications/stream/ to that process with a proxy, or give it its own host and set
+# NOTIFICATION_STREAM_URL to e.g. https://stream.example.com/notifications/stream/ (pages then
+# open it with a signed token, since the session cookie is not sent to another site)
+NOTIFICATION_STREAM_URL = os.environ.get('NOTIFICATION_STREAM_URL', '/notifications/stream/')
+NOTIFICATION_STREAM_TOKEN_SECONDS = int(os.environ.get('NOTIFICATION_STREAM_TOKEN_SECONDS', SESSION_COOKIE_AGE))
+# Site origins allowed to read a stream served from another host
+NOTIFICATION_STREAM_ALLOWED_ORIGINS = [
+    origin for origin in os.environ.get('NOTIFICATION_STREAM_ALLOWED_ORIGINS', ','.join(CSRF_TRUSTED_ORIGINS)).split(',') if origin
+]
+NOTIFICATION_STREAM_HEARTBEAT_SECONDS = int(os.environ.get('NOTIFICATION_STREAM_HEARTBEAT_SECONDS', 15))
+NOTIFICATION_STREAM_MAX_SECONDS = int(os.environ.get('NOTIFICATION_STREAM_MAX_SECONDS', 10 * 60))  # then the browser reconnects
+NOTIFICATION_STREAM_RETRY_MS = int(os.environ.get('NOTIFICATION_STREAM_RETRY_MS', 3000))
+
+
 # ============================================================
 # CELERY CONFIGURATION
 # ============================================================
@@ -387,6 +507,12 @@ SESSION_EXPIRE_AT_BROWSER_CLOSE = False
 CELERY_BROKER_URL = f"{REDIS_URL}/0"
 CELERY_RESULT_BACKEND = f"{REDIS_URL}/0"
 
+# AI team generation runs on its own queue in 'celery' inference mode
+if AI_INFERENCE_MODE == 'celery':
+    CELERY_TASK_ROUTES = {
+        'internal.experts.tasks.*': {'queue': AI_INFERENCE_QUEUE},
+    }
+
 
 CELERY_BEAT_SCHEDULE = {
     'publish_announcements_every_minute': {
@@ -413,4 +539,25 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'system.scheduler.tasks.celery_send_event_reminders',
         'schedule': 24 * 60 * 60,  # every 24 hours
     },
-}
\ No newline at end of file
+    'drain_email_outbox_every_minute': {
+        'task': 'system.utils.tasks.drain_email_outbox',
+        'schedule': 60.0,  # every minute (picks up retries and rows whose enqueue signal was lost)
+    },
+    'purge_email_outbox_daily': {
+        'task': 'system.utils.tasks.purge_email_outbox',
+        'schedule': 24 * 60 * 60,  # every 24 hours
+    },
+    'reconcile_notification_counters_hourly': {
+        'task': 'system.notifications.tasks.reconcile_notification_counters',
+        'schedule': NOTIFICATION_COUNTER_RECONCILE_SECONDS,  # every hour by default
+    },
+    'rebuild_analytics_facts_daily': {
+        'task': 'internal.analytics.tasks.rebuild_analytics_facts',
+        'schedule': 24 * 60 * 60,  # every 24 hours (signals keep the facts current in between)
+    },
+    'refresh_expert_embeddings_daily': {
+        'task': 'internal.experts.tasks.refresh_text_embeddings',
+        'schedule': 24 * 60 * 60,  # every 24 hours
+    },
+}
+
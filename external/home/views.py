@@ -60,6 +60,7 @@ def home_view(request):
     upcoming_meetings_count = 0
     my_alerts = []
     events_json = '[]'
+    events_window_start = events_window_end = ''
 
     pending_submissions_list = []
     revision_submissions_list = []
@@ -151,8 +152,17 @@ def home_view(request):
             viewed=False
         ).select_related('project', 'submission').order_by('-updated_at')[:5]
          
-        events_by_date = calendar_services.get_events_by_date(request.user, for_main_calendar_view=True)
+        # The mini calendar embeds events and holidays around the current year and
+        # fetches other months from meeting_event_list when the user navigates to them
+        window_start, window_end = calendar_services.get_calendar_window(years=1)
+        events_by_date = calendar_services.get_events_by_date(
+            request.user,
+            for_main_calendar_view=True,
+            start_date=window_start,
+            end_date=window_end,
+        )
         events_json = json.dumps(events_by_date)
+        events_window_start, events_window_end = window_start.isoformat(), window_end.isoformat()
 
     latest_announcements = Announcement.objects.filter(published_at__isnull=False, archived=False).order_by('-published_at')[:2]
     
@@ -209,6 +219,8 @@ def home_view(request):
         'upcoming_meetings_count': upcoming_meetings_count,
         'my_alerts': my_alerts,
         'events_json': events_json,
+        'events_window_start': events_window_start,
+        'events_window_end': events_window_end,
         'notifications': notifications,
         'show_notifications': show_notifications,
         'pending_submissions_list': pending_submissions_list,
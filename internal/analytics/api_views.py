@@ -1,19 +1,27 @@
+import base64
 import logging
+from itertools import islice
 
-from django.http import JsonResponse
+from django.db.models import Prefetch
+from django.http import JsonResponse, StreamingHttpResponse
 from datetime import datetime, timedelta # Make sure timedelta is imported
 from django.utils import timezone # Import timezone for aware datetimes
-from . import services 
+from .cache import get_cached_bundle, get_cached_result, get_cache_stats, reset_cache_stats
 from rest_framework.decorators import api_view, permission_classes, authentication_classes
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.authentication import TokenAuthentication, SessionAuthentication
 from rest_framework.permissions import IsAuthenticated
 
-from shared.projects.models import Project 
-from .serializers import ProjectReadOnlySerializer, ProjectPublicSerializer
-from drf_spectacular.utils import extend_schema
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.urls import replace_query_param
+
+from shared.projects.models import Project, ProjectEvaluation
+from internal.submissions.models import Submission
+from .serializers import ProjectReadOnlySerializer, ProjectPublicSerializer, ProjectDataPageSerializer
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 from system.api.permissions import TieredAPIPermission
+from system.users.decorators import role_required
 
 # --- Updated Utility Function ---
 def parse_dates_from_request(request, default_days=300): # Added default_days
@@ -26,10 +34,11 @@ def parse_dates_from_request(request, default_days=300): # Added default_days
     end_date_str = request.GET.get('end_date')     # Changed from end
     
     current_tz = timezone.get_current_timezone()
-    now = timezone.now()
+    # Local time, so the default range covers whole local days like explicit dates do
+    now = timezone.localtime()
 
     # Default end_date is today (end of day)
-    default_end_date = now.replace(hour=23, minute=59, second=59)
+    default_end_date = now.replace(hour=23, minute=59, second=59, microsecond=0)
     # Default start_date is 'default_days' ago (start of day)
     default_start_date = (default_end_date - timedelta(days=default_days)).replace(hour=0, minute=0, second=0)
 
@@ -79,7 +88,7 @@ def projects_metric_api(request):
     # --- MODIFIED: Added try/except block ---
     try:
         user_college = get_user_college(request)
-        data = services.get_total_projects_count(start_date, end_date, college=user_college)
+        data = get_cached_result('projects', start_date, end_date, college=user_college)
         return JsonResponse(data)
     except Exception:
         logging.getLogger(__name__).exception("Internal error in projects_metric_api")
@@ -94,7 +103,7 @@ def events_metric_api(request):
     # --- MODIFIED: Added try/except block ---
     try:
         user_college = get_user_college(request)
-        data = services.get_total_events_count(start_date, end_date, college=user_college)
+        data = get_cached_result('events', start_date, end_date, college=user_college)
         return JsonResponse(data)
     except Exception:
         logging.getLogger(__name__).exception("Internal error in events_metric_api")
@@ -109,7 +118,7 @@ def providers_metric_api(request):
     # --- MODIFIED: Added try/except block ---
     try:
         user_college = get_user_college(request)
-        data = services.get_total_providers_count(start_date, end_date, college=user_college)
+        data = get_cached_result('providers', start_date, end_date, college=user_college)
         return JsonResponse(data)
     except Exception:
         logging.getLogger(__name__).exception("Internal error in providers_metric_api")
@@ -124,7 +133,7 @@ def individuals_metric_api(request):
     # --- MODIFIED: Added try/except block ---
     try:
         user_college = get_user_college(request)
-        data = services.get_total_individuals_trained(start_date, end_date, college=user_college)
+        data = get_cached_result('individuals', start_date, end_date, college=user_college)
         return JsonResponse(data)
     except Exception:
         logging.getLogger(__name__).exception("Internal error in individuals_metric_api")
@@ -133,6 +142,27 @@ def individuals_metric_api(request):
         }, status=500)
     # --- END MODIFIED ---
 
+def analytics_bundle_api(request):
+    """Every card, trend and chart of the dashboard in one response (cached per day range and college)."""
+    start_date, end_date, error_response = parse_dates_from_request(request, default_days=300)
+    if error_response: return error_response
+    try:
+        user_college = get_user_college(request)
+        data = get_cached_bundle(start_date, end_date, college=user_college)
+        return JsonResponse(data)
+    except Exception:
+        logging.getLogger(__name__).exception("Internal error in analytics_bundle_api")
+        return JsonResponse({
+            'error': 'Internal Server Error while calculating analytics data.',
+        }, status=500)
+
+@role_required(allowed_roles=["VP", "DIRECTOR", "UESO"])
+def analytics_cache_stats_api(request):
+    """Analytics cache hits, stale hits, shared results and misses per metric. POST resets them."""
+    if request.method == 'POST':
+        reset_cache_stats()
+    return JsonResponse({'metrics': get_cache_stats()})
+
 # ==============================================================================
 # CHART DATA VIEWS (Now use aware datetimes)
 # ==============================================================================
@@ -143,7 +173,7 @@ def active_projects_chart_api(request):
     # --- MODIFIED: Added try/except block ---
     try:
         user_college = get_user_college(request)
-        data = services.get_active_projects_over_time(start_date, end_date, college=user_college) 
+        data = get_cached_result('active', start_date, end_date, college=user_college) 
         return JsonResponse(data)
     except Exception:
         logging.getLogger(__name__).exception("Internal error in active_projects_chart_api")
@@ -159,7 +189,7 @@ def budget_allocation_chart_api(request):
     try:
         user_college = get_user_college(request)
         # This now calls the multi-series function in services.py
-        data = services.get_budget_allocation_data(start_date, end_date, college=user_college)
+        data = get_cached_result('budget', start_date, end_date, college=user_college)
         return JsonResponse(data)
     except Exception:
         logging.getLogger(__name__).exception("Internal error in budget_allocation_chart_api")
@@ -174,7 +204,7 @@ def agenda_distribution_chart_api(request):
     # --- MODIFIED: Added try/except block ---
     try:
         user_college = get_user_college(request)
-        data = services.get_agenda_distribution_data(start_date, end_date, college=user_college)
+        data = get_cached_result('agenda', start_date, end_date, college=user_college)
         return JsonResponse(data)
     except Exception:
         logging.getLogger(__name__).exception("Internal error in agenda_distribution_chart_api")
@@ -189,7 +219,7 @@ def trained_individuals_chart_api(request):
     # --- MODIFIED: Added try/except block ---
     try:
         user_college = get_user_college(request)
-        data = services.get_trained_individuals_data(start_date, end_date, college=user_college)
+        data = get_cached_result('trained', start_date, end_date, college=user_college)
         return JsonResponse(data)
     except Exception:
         logging.getLogger(__name__).exception("Internal error in trained_individuals_chart_api")
@@ -204,7 +234,7 @@ def request_status_chart_api(request):
     # --- MODIFIED: Added try/except block ---
     try:
         user_college = get_user_college(request)
-        data = services.get_request_status_distribution(start_date, end_date, college=user_college)
+        data = get_cached_result('requests', start_date, end_date, college=user_college)
         return JsonResponse(data)
     except Exception:
         logging.getLogger(__name__).exception("Internal error in request_status_chart_api")
@@ -219,7 +249,7 @@ def project_trends_api(request):
     # --- MODIFIED: Added try/except block ---
     try:
         user_college = get_user_college(request)
-        data = services.get_project_trends(start_date, end_date, college=user_college)
+        data = get_cached_result('trends', start_date, end_date, college=user_college)
         return JsonResponse(data)
     except Exception:
         logging.getLogger(__name__).exception("Internal error in project_trends_api")
@@ -263,28 +293,138 @@ def get_public_projects(request):
         logging.getLogger(__name__).exception("Internal error in get_public_projects")
         return Response({'error': 'Internal server error.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+# ==============================================================================
+# FULL PROJECT DATA (keyset pages, streamed)
+# ==============================================================================
+
+PROJECT_DATA_PAGE_SIZE = 100
+PROJECT_DATA_MAX_PAGE_SIZE = 500
+# Projects loaded (with their related rows) per query while a page streams
+PROJECT_DATA_CHUNK_SIZE = 50
+
+# Related rows each nested field needs, so a sparse fields= request loads only those
+PROJECT_DATA_PREFETCHES = {
+    'documents': ['documents'],
+    'additional_documents': ['additional_documents'],
+    'events': ['events'],
+    'evaluations': [Prefetch('evaluations', queryset=ProjectEvaluation.objects.select_related('evaluated_by'))],
+    'providers': ['providers'],
+    'sdgs': ['sdgs'],
+    'further_action': [Prefetch(
+        'submissions',
+        queryset=Submission.objects.filter(downloadable__submission_type='final').order_by('id'),
+        to_attr='final_submissions',
+    )],
+}
+PROJECT_DATA_JOINS = {'project_leader': 'project_leader', 'agenda': 'agenda'}
+
+
+def encode_cursor(last_id):
+    return base64.urlsafe_b64encode(f'id={last_id}'.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """The last project id of the previous page, or None when the cursor is invalid."""
+    try:
+        key, _, value = base64.urlsafe_b64decode(cursor.encode()).decode().partition('=')
+        return int(value) if key == 'id' else None
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def serialize_projects(ids, fields):
+    """
+    Yield each project of ``ids`` as JSON. Projects are loaded
+    PROJECT_DATA_CHUNK_SIZE at a time, so memory does not grow with the page.
+    """
+    encoder = JSONEncoder()
+    queryset = Project.objects.select_related(*[PROJECT_DATA_JOINS[name] for name in fields if name in PROJECT_DATA_JOINS])
+    prefetches = [lookup for name in fields for lookup in PROJECT_DATA_PREFETCHES.get(name, [])]
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+
+    for offset in range(0, len(ids), PROJECT_DATA_CHUNK_SIZE):
+        chunk = queryset.filter(id__in=ids[offset:offset + PROJECT_DATA_CHUNK_SIZE]).order_by('id')
+        for project in chunk:
+            yield encoder.encode(ProjectReadOnlySerializer(project, fields=fields).data)
+
+
+def stream_project_page(ids, fields, next_url):
+    """
+    One page as streamed JSON: {"results": [...], "next": ...}.
+
+    The first chunk is serialized before the response starts, so a failure
+    there still raises (and becomes a 500). A later failure cannot change the
+    status any more: it is logged and the page ends with "next": null and an
+    "error" member, so the client still gets valid JSON and knows the page is
+    incomplete.
+    """
+    encoder = JSONEncoder()
+    projects = serialize_projects(ids, fields)
+    first_chunk = list(islice(projects, PROJECT_DATA_CHUNK_SIZE))
+
+    def page():
+        yield '{"results":[' + ','.join(first_chunk)
+        separator = ',' if first_chunk else ''
+        try:
+            for project in projects:
+                yield separator + project
+                separator = ','
+        except Exception:
+            logging.getLogger(__name__).exception("Internal error while streaming get_all_project_data")
+            yield '],"next":null,"error":%s}' % encoder.encode('Internal server error: the page is incomplete.')
+            return
+        yield '],"next":%s}' % encoder.encode(next_url)
+
+    return page()
+
+
 @extend_schema(
-    responses={200: ProjectReadOnlySerializer(many=True)}
+    parameters=[
+        OpenApiParameter('cursor', str, description="Opaque cursor from the previous page's 'next' URL."),
+        OpenApiParameter('page_size', int, description=f"Projects per page (default {PROJECT_DATA_PAGE_SIZE}, max {PROJECT_DATA_MAX_PAGE_SIZE})."),
+        OpenApiParameter('fields', str, description="Comma-separated project fields to return (default: all)."),
+    ],
+    responses={200: ProjectDataPageSerializer}
 ) 
 @api_view(['GET'])
 @authentication_classes([TokenAuthentication, SessionAuthentication])
 @permission_classes([IsAuthenticated, TieredAPIPermission]) 
 def get_all_project_data(request):
+    """
+    All projects with their documents, events, evaluations, providers and SDGs,
+    in id order. Pages are keyset-paginated: follow 'next' until it is null.
+    """
+    all_fields = list(ProjectReadOnlySerializer().fields)
+    fields = all_fields
+    if request.GET.get('fields'):
+        fields = [name.strip() for name in request.GET['fields'].split(',') if name.strip()]
+        unknown = sorted(set(fields) - set(all_fields))
+        if unknown:
+            return Response({'error': f"Unknown field(s): {', '.join(unknown)}."}, status=status.HTTP_400_BAD_REQUEST)
+
     try:
-        projects = Project.objects.prefetch_related(
-            'documents', 
-            'events', 
-            'evaluations', 
-            'project_leader', 
-            'providers', 
-            'agenda', 
-            'sdgs'
-        ).all()
-
-        serializer = ProjectReadOnlySerializer(projects, many=True)
-        
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page_size = min(max(int(request.GET.get('page_size', PROJECT_DATA_PAGE_SIZE)), 1), PROJECT_DATA_MAX_PAGE_SIZE)
+    except ValueError:
+        return Response({'error': 'page_size must be a number.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    after_id = 0
+    if request.GET.get('cursor'):
+        after_id = decode_cursor(request.GET['cursor'])
+        if after_id is None:
+            return Response({'error': 'Invalid cursor.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        ids = list(
+            Project.objects.filter(id__gt=after_id).order_by('id').values_list('id', flat=True)[:page_size + 1]
+        )
+        next_url = None
+        if len(ids) > page_size:
+            ids = ids[:page_size]
+            next_url = replace_query_param(request.build_absolute_uri(), 'cursor', encode_cursor(ids[-1]))
+
+        return StreamingHttpResponse(stream_project_page(ids, fields, next_url), content_type='application/json')
         
     except Exception:
         logging.getLogger(__name__).exception("Internal error in get_all_project_data")
-        return Response({'error': 'Internal server error.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        return Response({'error': 'Internal server error.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,293 @@
+"""
+Cached analytics results.
+
+Every analytics result (a card metric, a chart, the trends or the whole
+dashboard bundle) is cached per metric, local start day, local end day,
+college and granularity. Requests for the same days share one entry,
+whatever time of day they were made, and are computed from normalized
+whole-day bounds.
+
+Entries are served stale-while-revalidate:
+- fresh: computed under the current analytics version less than
+  ANALYTICS_CACHE_SECONDS ago; served as is.
+- stale: older, or computed before a write bumped the version (fact
+  refreshes, budgets, agendas); served as is while one
+  refresh_analytics_result task recomputes it.
+- missing (entries expire after ANALYTICS_CACHE_STALE_SECONDS): computed
+  by the first request. Concurrent requests for the same entry wait up to
+  ANALYTICS_CACHE_WAIT_SECONDS for that result instead of computing it too.
+
+Hits, stale hits, shared results and misses are counted per metric in the
+'counters' cache; get_cache_stats reports them to administrators.
+"""
+
+import logging
+import time
+from datetime import datetime, time as day_time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_VERSION_KEY = 'analytics:version'
+
+# Metric name -> function in services that computes it
+ANALYTICS_METRICS = {
+    'projects': 'get_total_projects_count',
+    'events': 'get_total_events_count',
+    'providers': 'get_total_providers_count',
+    'individuals': 'get_total_individuals_trained',
+    'trends': 'get_project_trends',
+    'active': 'get_active_projects_over_time',
+    'trained': 'get_trained_individuals_data',
+    'budget': 'get_budget_allocation_data',
+    'agenda': 'get_agenda_distribution_data',
+    'requests': 'get_request_status_distribution',
+    'bundle': 'get_analytics_bundle',
+}
+# Metrics grouped into time buckets; the rest are keyed with granularity 'total'
+TIME_SERIES_METRICS = {'active', 'trained', 'bundle'}
+
+CACHE_OUTCOMES = ('hit', 'stale', 'shared', 'miss')
+
+# How long one request or task may hold an entry's computation
+COMPUTE_LOCK_SECONDS = 60
+
+
+# ==============================================================================
+# Versions
+# ==============================================================================
+
+def _fresh_version():
+    # Time-based, so a version key lost from the cache never reuses an old number
+    return int(time.time() * 1000)
+
+
+def bump_analytics_version():
+    """Mark every cached analytics result stale."""
+    try:
+        cache.incr(ANALYTICS_VERSION_KEY)
+    except ValueError:
+        cache.set(ANALYTICS_VERSION_KEY, _fresh_version(), None)
+    except Exception as exc:
+        logger.warning("Analytics cache version not bumped: %s", exc)
+
+
+def get_analytics_version():
+    """The current analytics version, or None when the cache is unavailable."""
+    try:
+        version = cache.get(ANALYTICS_VERSION_KEY)
+        if version is None:
+            cache.add(ANALYTICS_VERSION_KEY, _fresh_version(), None)
+            version = cache.get(ANALYTICS_VERSION_KEY)
+        return version
+    except Exception as exc:
+        logger.warning("Analytics cache unavailable: %s", exc)
+        return None
+
+
+# ==============================================================================
+# Keys and computation
+# ==============================================================================
+
+def normalize_range(start_date, end_date):
+    """The local start and end days of a date range."""
+    from .facts import local_day
+    return local_day(start_date), local_day(end_date)
+
+
+def day_range_bounds(start_day, end_day):
+    """Aware datetimes for the whole local days, as parse_dates_from_request builds them."""
+    current_tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(start_day, day_time(0, 0, 0)), current_tz),
+        timezone.make_aware(datetime.combine(end_day, day_time(23, 59, 59)), current_tz),
+    )
+
+
+def granularity_for(metric, start_day, end_day):
+    if metric not in TIME_SERIES_METRICS:
+        return 'total'
+    from .services import _get_trunc_object
+    return _get_trunc_object(start_day, end_day)[1]
+
+
+def result_cache_key(metric, start_day, end_day, college_id=None):
+    granularity = granularity_for(metric, start_day, end_day)
+    return f"analytics:result:{metric}:{start_day}:{end_day}:{college_id or 'all'}:{granularity}"
+
+
+def compute_result(metric, start_day, end_day, college=None):
+    from . import services
+    start_date, end_date = day_range_bounds(start_day, end_day)
+    return getattr(services, ANALYTICS_METRICS[metric])(start_date, end_date, college=college)
+
+
+def _store_result(key, version, metric, start_day, end_day, college):
+    """Compute a result and cache it under the version read before computing."""
+    value = compute_result(metric, start_day, end_day, college)
+    entry = {'value': value, 'version': version, 'computed_at': time.time()}
+    try:
+        cache.set(key, entry, settings.ANALYTICS_CACHE_STALE_SECONDS)
+    except Exception as exc:
+        logger.warning("Analytics result %s not cached: %s", key, exc)
+    return value
+
+
+def _get_entry(key):
+    try:
+        return cache.get(key)
+    except Exception as exc:
+        logger.warning("Analytics result %s unavailable: %s", key, exc)
+        return None
+
+
+def _lock_key(key):
+    return f'{key}:computing'
+
+
+def _wait_for_entry(key):
+    """The entry another request is computing, or None if it does not arrive in time."""
+    deadline = time.monotonic() + settings.ANALYTICS_CACHE_WAIT_SECONDS
+    delay = 0.05
+    while time.monotonic() < deadline:
+        time.sleep(delay)
+        entry = _get_entry(key)
+        if entry is not None or cache.get(_lock_key(key)) is None:
+            return entry
+        delay = min(delay * 2, 0.5)
+    return None
+
+
+# ==============================================================================
+# Reading results
+# ==============================================================================
+
+def get_cached_result(metric, start_date, end_date, college=None):
+    """The result of an analytics metric for the days of the range, served stale-while-revalidate."""
+    start_day, end_day = normalize_range(start_date, end_date)
+    version = get_analytics_version()
+    if version is None:
+        return compute_result(metric, start_day, end_day, college)
+
+    college_id = college.pk if college is not None else None
+    key = result_cache_key(metric, start_day, end_day, college_id)
+    entry = _get_entry(key)
+    if entry is not None:
+        if entry['version'] == version and time.time() - entry['computed_at'] < settings.ANALYTICS_CACHE_SECONDS:
+            record_outcome(metric, 'hit')
+        else:
+            record_outcome(metric, 'stale')
+            schedule_refresh(metric, start_day, end_day, college_id)
+        return entry['value']
+
+    # Missing: the first request computes, concurrent ones wait for its result
+    lock = _lock_key(key)
+    if cache.add(lock, 1, COMPUTE_LOCK_SECONDS):
+        record_outcome(metric, 'miss')
+        try:
+            return _store_result(key, version, metric, start_day, end_day, college)
+        finally:
+            cache.delete(lock)
+
+    entry = _wait_for_entry(key)
+    if entry is not None:
+        record_outcome(metric, 'shared')
+        return entry['value']
+    record_outcome(metric, 'miss')
+    return compute_result(metric, start_day, end_day, college)
+
+
+def get_cached_bundle(start_date, end_date, college=None):
+    """The dashboard bundle (services.get_analytics_bundle) for the range and college."""
+    return get_cached_result('bundle', start_date, end_date, college=college)
+
+
+def schedule_refresh(metric, start_day, end_day, college_id=None):
+    """Queue one recomputation of a stale result (inline if the broker is unreachable)."""
+    key = result_cache_key(metric, start_day, end_day, college_id)
+    if not cache.add(_lock_key(key), 1, COMPUTE_LOCK_SECONDS):
+        return  # Already being recomputed
+
+    from .tasks import refresh_analytics_result
+    try:
+        refresh_analytics_result.apply_async(
+            args=[metric, start_day.isoformat(), end_day.isoformat(), college_id], retry=False
+        )
+    except Exception as exc:
+        logger.warning("Analytics result refresh not queued (%s); refreshing inline", exc)
+        refresh_result(metric, start_day, end_day, college_id)
+
+
+def refresh_result(metric, start_day, end_day, college_id=None):
+    """Recompute and cache one result, releasing the lock schedule_refresh took."""
+    from system.users.models import College
+
+    key = result_cache_key(metric, start_day, end_day, college_id)
+    try:
+        college = College.objects.get(pk=college_id) if college_id else None
+        version = get_analytics_version()
+        _store_result(key, version, metric, start_day, end_day, college)
+    except College.DoesNotExist:
+        cache.delete(key)
+    finally:
+        cache.delete(_lock_key(key))
+
+
+# ==============================================================================
+# Hit/miss counters
+# ==============================================================================
+
+def _outcome_key(metric, outcome):
+    return f'analytics_cache_{metric}_{outcome}'
+
+
+def record_outcome(metric, outcome):
+    counters = caches['counters']
+    key = _outcome_key(metric, outcome)
+    try:
+        try:
+            counters.incr(key)
+        except ValueError:
+            if not counters.add(key, 1, None):
+                counters.incr(key)
+    except Exception as exc:
+        logger.warning("Analytics cache counter %s not updated: %s", key, exc)
+
+
+def get_cache_stats():
+    """
+    Cache outcomes per metric since the counters were last reset.
+
+    Returns:
+        list: dicts with metric, hit, stale, shared, miss, requests and
+              hit_rate (percent of requests served without computing)
+    """
+    keys = {(metric, outcome): _outcome_key(metric, outcome) for metric in ANALYTICS_METRICS for outcome in CACHE_OUTCOMES}
+    try:
+        values = caches['counters'].get_many(list(keys.values()))
+    except Exception as exc:
+        logger.warning("Analytics cache counters unavailable: %s", exc)
+        values = {}
+
+    stats = []
+    for metric in ANALYTICS_METRICS:
+        row = {'metric': metric}
+        for outcome in CACHE_OUTCOMES:
+            row[outcome] = int(values.get(keys[(metric, outcome)], 0))
+        row['requests'] = sum(row[outcome] for outcome in CACHE_OUTCOMES)
+        served = row['hit'] + row['stale'] + row['shared']
+        row['hit_rate'] = round(100 * served / row['requests'], 1) if row['requests'] else None
+        stats.append(row)
+    return stats
+
+
+def reset_cache_stats():
+    try:
+        caches['counters'].delete_many(
+            [_outcome_key(metric, outcome) for metric in ANALYTICS_METRICS for outcome in CACHE_OUTCOMES]
+        )
+    except Exception as exc:
+        logger.warning("Analytics cache counters not reset: %s", exc)
@@ -0,0 +1,242 @@
+"""
+Daily analytics fact table (DailyAnalyticsFact).
+
+The dashboard charts read per-day, per-college rollups instead of
+aggregating Project, ProjectEvent, Submission and ClientRequest on every
+request. A day's rows are rebuilt from those tables whenever a row that
+counts on the day is saved or deleted: the days are collected per
+transaction and refreshed by a Celery task after commit (inline if the
+broker is unreachable). Changes that bypass signals (queryset.update, a
+leader moving to another college) are picked up by the daily full rebuild
+(rebuild_analytics_facts task and management command).
+
+Days are local dates in TIME_ZONE, matching the date-range filters of the
+analytics API.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, date, time, timedelta
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum, Min, Max, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from shared.projects.models import Project, ProjectEvent
+from shared.request.models import ClientRequest
+from internal.submissions.models import Submission
+from system.utils.commit_hooks import mark_dispatched, on_commit_once
+from .cache import bump_analytics_version
+from .models import DailyAnalyticsFact
+
+logger = logging.getLogger(__name__)
+
+FACT_FIELDS = (
+    'projects_started', 'projects_created', 'projects_ended', 'budget_committed',
+    'events_held', 'individuals_trained',
+    'requests_approved', 'requests_rejected', 'requests_ongoing',
+)
+
+# Serializes fact rebuilds on PostgreSQL (SQLite already serializes writers)
+FACT_LOCK_ID = 0x46414354  # 'FACT'
+
+# Days waiting for this thread's transaction to commit before their refresh
+_refresh_state = threading.local()
+
+
+def local_day(value):
+    """The local date of a datetime (dates are returned as they are)."""
+    if isinstance(value, datetime):
+        return timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+    return value
+
+
+def days_for(model, values):
+    """The days a source row with these field values counts on."""
+    if model is Submission:
+        if not values.get('event_id'):
+            return set()
+        event_datetime = ProjectEvent.objects.filter(pk=values['event_id']).values_list('datetime', flat=True).first()
+        values = {'datetime': event_datetime}
+    return {local_day(value) for value in values.values() if value is not None}
+
+
+# ==============================================================================
+# Rebuilding
+# ==============================================================================
+
+def _day_bounds(start, end):
+    """Aware datetimes covering the local days start..end (end exclusive bound)."""
+    current_tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(start, time.min), current_tz),
+        timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), current_tz),
+    )
+
+
+def compute_facts(start, end):
+    """
+    Facts for the local days start..end (inclusive) from the source tables.
+
+    Returns:
+        dict: {(day, college_id): {fact field: value}} for days with activity
+    """
+    since, until = _day_bounds(start, end)
+    facts = defaultdict(lambda: dict.fromkeys(FACT_FIELDS, 0))
+
+    started = Project.objects.filter(start_date__range=[start, end]).values(
+        'start_date', 'project_leader__college_id'
+    ).annotate(count=Count('id'), budget=Sum('internal_budget'))
+    for row in started:
+        fact = facts[(row['start_date'], row['project_leader__college_id'])]
+        fact['projects_started'] = row['count']
+        fact['budget_committed'] = row['budget'] or Decimal('0')
+
+    created = Project.objects.filter(created_at__gte=since, created_at__lt=until).annotate(
+        day=TruncDate('created_at')
+    ).values('day', 'project_leader__college_id').annotate(count=Count('id'))
+    for row in created:
+        facts[(row['day'], row['project_leader__college_id'])]['projects_created'] = row['count']
+
+    ended = Project.objects.filter(estimated_end_date__range=[start, end]).values(
+        'estimated_end_date', 'project_leader__college_id'
+    ).annotate(count=Count('id'))
+    for row in ended:
+        facts[(row['estimated_end_date'], row['project_leader__college_id'])]['projects_ended'] = row['count']
+
+    events = ProjectEvent.objects.filter(datetime__gte=since, datetime__lt=until).annotate(
+        day=TruncDate('datetime')
+    ).values('day', 'project__project_leader__college_id').annotate(count=Count('id'))
+    for row in events:
+        facts[(row['day'], row['project__project_leader__college_id'])]['events_held'] = row['count']
+
+    trained = Submission.objects.filter(
+        event__datetime__gte=since, event__datetime__lt=until, num_trained_individuals__isnull=False
+    ).annotate(
+        day=TruncDate('event__datetime')
+    ).values('day', 'event__project__project_leader__college_id').annotate(total=Sum('num_trained_individuals'))
+    for row in trained:
+        facts[(row['day'], row['event__project__project_leader__college_id'])]['individuals_trained'] = row['total'] or 0
+
+    # Client requests have no college
+    requests = ClientRequest.objects.filter(submitted_at__gte=since, submitted_at__lt=until).annotate(
+        day=TruncDate('submitted_at')
+    ).values('day').annotate(
+        approved=Count('id', filter=Q(status='APPROVED')),
+        rejected=Count('id', filter=Q(status='REJECTED')),
+        ongoing=Count('id', filter=~Q(status__in=['APPROVED', 'REJECTED'])),
+    )
+    for row in requests:
+        fact = facts[(row['day'], None)]
+        fact['requests_approved'] = row['approved']
+        fact['requests_rejected'] = row['rejected']
+        fact['requests_ongoing'] = row['ongoing']
+
+    return facts
+
+
+def refresh_facts(start, end):
+    """Replace the fact rows of the local days start..end. Returns the number of rows written."""
+    with transaction.atomic():
+        # Compute under the lock so a slower, older rebuild cannot overwrite a newer one
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(%s)', [FACT_LOCK_ID])
+        facts = compute_facts(start, end)
+        DailyAnalyticsFact.objects.filter(day__range=[start, end]).delete()
+        DailyAnalyticsFact.objects.bulk_create(
+            [DailyAnalyticsFact(day=day, college_id=college_id, **values) for (day, college_id), values in facts.items()],
+            batch_size=1000,
+        )
+    bump_analytics_version()
+    return len(facts)
+
+
+def refresh_days(days):
+    """Refresh the given days, one rebuild per run of consecutive days."""
+    days = sorted(set(days))
+    written = 0
+    run_start = previous = None
+    for day in days + [None]:
+        if run_start is not None and (day is None or day != previous + timedelta(days=1)):
+            written += refresh_facts(run_start, previous)
+            run_start = None
+        if day is not None and run_start is None:
+            run_start = day
+        previous = day
+    return written
+
+
+def rebuild_all_facts(years_per_batch=1):
+    """
+    Rebuild every fact row from the full history, a year at a time.
+    Rows outside the history's date span are removed.
+    """
+    bounds = {
+        **Project.objects.aggregate(
+            low_start=Min('start_date'), high_start=Max('start_date'),
+            low_end=Min('estimated_end_date'), high_end=Max('estimated_end_date'),
+            low_created=Min('created_at'), high_created=Max('created_at'),
+        ),
+        **ProjectEvent.objects.aggregate(low_event=Min('datetime'), high_event=Max('datetime')),
+        **ClientRequest.objects.aggregate(low_request=Min('submitted_at'), high_request=Max('submitted_at')),
+    }
+    lows = [local_day(value) for name, value in bounds.items() if name.startswith('low') and value is not None]
+    highs = [local_day(value) for name, value in bounds.items() if name.startswith('high') and value is not None]
+    if not lows:
+        deleted, _ = DailyAnalyticsFact.objects.all().delete()
+        print(f"✓ No analytics history; removed {deleted} fact row(s).")
+        return 0
+
+    first, last = min(lows), max(highs)
+    DailyAnalyticsFact.objects.filter(Q(day__lt=first) | Q(day__gt=last)).delete()
+
+    written = 0
+    year = first.year
+    while year <= last.year:
+        batch_start = max(first, date(year, 1, 1))
+        batch_end = min(last, date(year + years_per_batch - 1, 12, 31))
+        written += refresh_facts(batch_start, batch_end)
+        year += years_per_batch
+    print(f"✓ Rebuilt {written} analytics fact row(s) for {first} to {last}.")
+    return written
+
+
+# ==============================================================================
+# Incremental refresh
+# ==============================================================================
+
+def _pending_days():
+    if not hasattr(_refresh_state, 'days'):
+        _refresh_state.days = set()
+    return _refresh_state.days
+
+
+def queue_fact_refresh(days):
+    """Add days to this transaction's refresh batch; one task refreshes them all after commit."""
+    if not days:
+        return
+    _pending_days().update(days)
+    on_commit_once(dispatch_fact_refresh)
+
+
+def dispatch_fact_refresh():
+    """Send the pending days to the refresh task (inline if the broker is unreachable)."""
+    mark_dispatched(dispatch_fact_refresh)
+    pending = _pending_days()
+    days = sorted(pending)
+    pending.clear()
+    if not days:
+        return
+
+    # Providers and agendas are read from the projects table itself
+    bump_analytics_version()
+    from .tasks import refresh_analytics_fact_days
+    try:
+        refresh_analytics_fact_days.apply_async(args=[[day.isoformat() for day in days]], retry=False)
+    except Exception as exc:
+        logger.warning("Analytics fact refresh not queued (%s); refreshing inline", exc)
+        refresh_days(days)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the daily analytics fact table from projects, events, submissions
+    and client requests. Run once after deploying the table; afterwards it is
+    kept current by signals and the daily rebuild task.
+    """
+
+    help = "Rebuild the daily analytics facts used by the analytics charts."
+
+    def handle(self, *args, **options):
+        from internal.analytics.facts import rebuild_all_facts
+        rebuild_all_facts()
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyAnalyticsFact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('projects_started', models.PositiveIntegerField(default=0)),
+                ('projects_created', models.PositiveIntegerField(default=0)),
+                ('projects_ended', models.PositiveIntegerField(default=0, help_text='Projects whose estimated end date is this day')),
+                ('budget_committed', models.DecimalField(decimal_places=2, default=0, help_text='Internal budget of the projects started this day', max_digits=15)),
+                ('events_held', models.PositiveIntegerField(default=0)),
+                ('individuals_trained', models.PositiveIntegerField(default=0)),
+                ('requests_approved', models.PositiveIntegerField(default=0)),
+                ('requests_rejected', models.PositiveIntegerField(default=0)),
+                ('requests_ongoing', models.PositiveIntegerField(default=0)),
+                ('college', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='analytics_facts', to='users.college')),
+            ],
+            options={
+                'verbose_name': 'Daily Analytics Fact',
+                'verbose_name_plural': 'Daily Analytics Facts',
+                'indexes': [models.Index(fields=['college', 'day'], name='analytics_fact_college_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'college'), name='unique_analytics_fact_day_college')],
+            },
+        ),
+    ]
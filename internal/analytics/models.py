@@ -0,0 +1,95 @@
+from django.db import models, transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from shared.projects.models import Project, ProjectEvent
+from shared.request.models import ClientRequest
+from internal.submissions.models import Submission
+from internal.agenda.models import Agenda
+from shared.budget.models import CollegeBudget
+
+
+class DailyAnalyticsFact(models.Model):
+    """
+    Additive analytics figures for one day and one college (the project
+    leader's college; null for client requests and leaders without one).
+
+    Rows are derived data, rebuilt from the source tables by
+    internal.analytics.facts; days without activity have no row.
+    """
+    day = models.DateField()
+    college = models.ForeignKey('users.College', on_delete=models.CASCADE, null=True, blank=True, related_name='analytics_facts')
+
+    projects_started = models.PositiveIntegerField(default=0)
+    projects_created = models.PositiveIntegerField(default=0)
+    projects_ended = models.PositiveIntegerField(default=0, help_text="Projects whose estimated end date is this day")
+    budget_committed = models.DecimalField(max_digits=15, decimal_places=2, default=0, help_text="Internal budget of the projects started this day")
+    events_held = models.PositiveIntegerField(default=0)
+    individuals_trained = models.PositiveIntegerField(default=0)
+    requests_approved = models.PositiveIntegerField(default=0)
+    requests_rejected = models.PositiveIntegerField(default=0)
+    requests_ongoing = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Daily Analytics Fact'
+        verbose_name_plural = 'Daily Analytics Facts'
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'college'], name='unique_analytics_fact_day_college'),
+        ]
+        indexes = [
+            models.Index(fields=['college', 'day'], name='analytics_fact_college_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} ({self.college_id or 'no college'})"
+
+
+# ==============================================================================
+# Keep the facts current: each change queues a refresh of the days it touched
+# ==============================================================================
+
+# Fields that decide which days a source row counts on
+FACT_DAY_FIELDS = {
+    Project: ('start_date', 'created_at', 'estimated_end_date'),
+    ProjectEvent: ('datetime',),
+    Submission: ('event_id',),
+    ClientRequest: ('submitted_at',),
+}
+
+
+@receiver(pre_save, sender=Project)
+@receiver(pre_save, sender=ProjectEvent)
+@receiver(pre_save, sender=Submission)
+def remember_fact_days(sender, instance, **kwargs):
+    """Note the days an existing row counted on if the save moves it to other days."""
+    if instance.pk is None:
+        return
+    from .facts import days_for
+    fields = FACT_DAY_FIELDS[sender]
+    old = sender.objects.filter(pk=instance.pk).values(*fields).first()
+    if old is not None and any(getattr(instance, field) != old[field] for field in fields):
+        instance._analytics_old_days = days_for(sender, old)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=ProjectEvent)
+@receiver(post_save, sender=Submission)
+@receiver(post_save, sender=ClientRequest)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=ProjectEvent)
+@receiver(post_delete, sender=Submission)
+@receiver(post_delete, sender=ClientRequest)
+def refresh_fact_days(sender, instance, **kwargs):
+    from .facts import days_for, queue_fact_refresh
+    days = days_for(sender, {field: getattr(instance, field) for field in FACT_DAY_FIELDS[sender]})
+    queue_fact_refresh(days | instance.__dict__.pop('_analytics_old_days', set()))
+
+
+@receiver(post_save, sender=CollegeBudget)
+@receiver(post_delete, sender=CollegeBudget)
+@receiver(post_save, sender=Agenda)
+@receiver(post_delete, sender=Agenda)
+def invalidate_analytics_cache(sender, instance, **kwargs):
+    """Budgets and agenda names are read by the budget and agenda charts."""
+    from .cache import bump_analytics_version
+    transaction.on_commit(bump_analytics_version)
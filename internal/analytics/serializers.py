@@ -51,8 +51,8 @@ class ProjectDocumentSerializer(serializers.ModelSerializer):
     def get_name(self, obj) -> str:
         return obj.file.name.split('/')[-1]
 
-    def get_size(self, obj) -> int:
-        return obj.file.size
+    def get_size(self, obj) -> Optional[int]:
+        return obj.file_size
     
     def get_extension(self, obj) -> str:
         return obj.file.name.split('.')[-1]
@@ -82,6 +82,7 @@ class ProjectEvaluationSerializer(serializers.ModelSerializer):
 class ProjectReadOnlySerializer(serializers.ModelSerializer):
     """
     This serializer id for READ-ONLY display. Additional for spectacular yml added
+    Pass fields=[...] to serialize only those fields.
     """
     duration = serializers.SerializerMethodField()
     status = serializers.SerializerMethodField()
@@ -102,6 +103,13 @@ class ProjectReadOnlySerializer(serializers.ModelSerializer):
         model = Project
         fields = '__all__'
         read_only = True
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
     
     def get_duration(self, obj) -> str: 
         """Calculates duration in years/days."""
@@ -120,13 +128,16 @@ class ProjectReadOnlySerializer(serializers.ModelSerializer):
         if obj.status != 'COMPLETED':
             return None
         
-        # Get final submissions for this project
-        # Using local import to avoid circular dependency
-        from internal.submissions.models import Submission
-        final_submissions = Submission.objects.filter(
-            project=obj,
-            downloadable__submission_type='final'
-        ).first()
+        # Get final submissions for this project (prefetched as final_submissions by get_all_project_data)
+        if hasattr(obj, 'final_submissions'):
+            final_submissions = obj.final_submissions[0] if obj.final_submissions else None
+        else:
+            # Using local import to avoid circular dependency
+            from internal.submissions.models import Submission
+            final_submissions = Submission.objects.filter(
+                project=obj,
+                downloadable__submission_type='final'
+            ).first()
         
         if not final_submissions:
             return None
@@ -146,4 +157,10 @@ class ProjectAggregationSerializer(serializers.Serializer):
     """ Defines the expected aggregated output for the API view. """
     total_projects = serializers.IntegerField(help_text="The total number of projects.")
     completed_projects = serializers.IntegerField(help_text="The count of projects with a 'Completed' status.")
-    projects_by_status = serializers.JSONField(help_text="A dictionary detailing projects counts by status.")
\ No newline at end of file
+    projects_by_status = serializers.JSONField(help_text="A dictionary detailing projects counts by status.")
+
+class ProjectDataPageSerializer(serializers.Serializer):
+    """ Defines one page of get_all_project_data. """
+    results = ProjectReadOnlySerializer(many=True)
+    next = serializers.URLField(allow_null=True, help_text="URL of the next page, or null on the last page.")
+    error = serializers.CharField(required=False, help_text="Present when the page failed part way; its results are incomplete.")
@@ -10,10 +10,27 @@ from shared.request.models import ClientRequest
 from internal.submissions.models import Submission
 from system.users.models import User, College
 from shared.budget.models import CollegeBudget # Added import
+from .models import DailyAnalyticsFact
+from .facts import local_day
 
 # Define active statuses (for use in other functions/charts)
 ACTIVE_STATUSES = ['IN_PROGRESS', 'ON_HOLD']
 
+
+def _facts(start_date, end_date, college=None):
+    """
+    Daily fact rows for the local days of the reporting range (see facts.py).
+    Counts and sums come from these instead of the raw tables.
+    """
+    queryset = DailyAnalyticsFact.objects.filter(day__range=[local_day(start_date), local_day(end_date)])
+    if college is not None:
+        queryset = queryset.filter(college=college)
+    return queryset
+
+
+def _fact_total(start_date, end_date, field, college=None):
+    return _facts(start_date, end_date, college).aggregate(total=Sum(field))['total'] or 0
+
 # ==============================================================================
 # CARD METRIC DATA FUNCTIONS (Unchanged)
 # ==============================================================================
@@ -23,22 +40,14 @@ def get_total_projects_count(start_date, end_date, college=None):
     FIX: Returns the count of projects that STARTED within the reporting date range.
     If college is provided, filters to only projects where project_leader belongs to that college.
     """
-    queryset = Project.objects.filter(start_date__range=[start_date, end_date])
-    if college is not None:
-        queryset = queryset.filter(project_leader__college=college)
-    count = queryset.count()
-    return {'metric': count}
+    return {'metric': _fact_total(start_date, end_date, 'projects_started', college)}
 
 def get_total_events_count(start_date, end_date, college=None):
     """
     Returns the total count of project events whose datetime is within the range.
     If college is provided, filters to events from projects where project_leader belongs to that college.
     """
-    queryset = ProjectEvent.objects.filter(datetime__range=[start_date, end_date])
-    if college is not None:
-        queryset = queryset.filter(project__project_leader__college=college)
-    count = queryset.count()
-    return {'metric': count}
+    return {'metric': _fact_total(start_date, end_date, 'events_held', college)}
 
 def get_total_providers_count(start_date, end_date, college=None):
     """
@@ -55,17 +64,12 @@ def get_total_providers_count(start_date, end_date, college=None):
     if college is not None:
         queryset = queryset.filter(project_leader__college=college)
     
-    relevant_projects = queryset.distinct()
-
-    leader_ids = relevant_projects.values_list('project_leader_id', flat=True).distinct()
-    unique_leaders_count = len(leader_ids)
-
-    college_ids = relevant_projects.filter(
-        project_leader__college__isnull=False
-    ).values_list('project_leader__college_id', flat=True).distinct()
-    unique_colleges_count = len(college_ids)
-
-    total_count = unique_colleges_count + unique_leaders_count
+    # Distinct leaders and their colleges, counted in the database
+    counts = queryset.aggregate(
+        leaders=Count('project_leader_id', distinct=True),
+        colleges=Count('project_leader__college_id', distinct=True),
+    )
+    total_count = counts['colleges'] + counts['leaders']
 
     return {'metric': total_count}
 
@@ -75,19 +79,7 @@ def get_total_individuals_trained(start_date, end_date, college=None):
     linked to ProjectEvents within the date range.
     If college is provided, filters to submissions from projects where project_leader belongs to that college.
     """
-    queryset = Submission.objects.filter(
-        event__datetime__range=[start_date, end_date], 
-        num_trained_individuals__isnull=False   
-    )
-    
-    if college is not None:
-        queryset = queryset.filter(event__project__project_leader__college=college)
-    
-    total_trained = queryset.aggregate(
-        total_trained=Sum('num_trained_individuals')
-    )['total_trained'] or 0 
-
-    return {'metric': total_trained}
+    return {'metric': _fact_total(start_date, end_date, 'individuals_trained', college)}
 
 # ==============================================================================
 # CHART DATA FUNCTIONS 
@@ -127,14 +119,10 @@ def get_active_projects_over_time(start_date, end_date, college=None):
     """
     TruncFunc, time_unit = _get_trunc_object(start_date, end_date)
 
-    queryset = Project.objects.filter(start_date__range=[start_date, end_date])
-    if college is not None:
-        queryset = queryset.filter(project_leader__college=college)
-    
-    timescale_data = queryset.annotate(
-        timescale_unit=TruncFunc('start_date')
+    timescale_data = _facts(start_date, end_date, college).filter(projects_started__gt=0).annotate(
+        timescale_unit=TruncFunc('day')
     ).values('timescale_unit').annotate(
-        count=Count('id')
+        count=Sum('projects_started')
     ).order_by('timescale_unit')
 
     data = [
@@ -156,17 +144,10 @@ def get_trained_individuals_data(start_date, end_date, college=None):
     """
     TruncFunc, time_unit = _get_trunc_object(start_date, end_date) # <-- GET UNIT HERE
 
-    queryset = Submission.objects.filter(
-        event__datetime__range=[start_date, end_date],
-        num_trained_individuals__isnull=False
-    )
-    if college is not None:
-        queryset = queryset.filter(event__project__project_leader__college=college)
-    
-    timescale_data = queryset.annotate(
-        timescale_unit=TruncFunc('event__datetime')
+    timescale_data = _facts(start_date, end_date, college).filter(individuals_trained__gt=0).annotate(
+        timescale_unit=TruncFunc('day')
     ).values('timescale_unit').annotate(
-        total_trained=Sum('num_trained_individuals')
+        total_trained=Sum('individuals_trained')
     ).order_by('timescale_unit')
 
     data = [
@@ -191,6 +172,12 @@ def get_budget_multi_series_data(start_date, end_date, college=None):
     
     if college is not None:
         budget_queryset = budget_queryset.filter(college=college)
+
+    # Internal budget of the projects each college started in the fiscal year
+    committed_by_college = dict(
+        DailyAnalyticsFact.objects.filter(day__year=int(fiscal_year), college__isnull=False)
+        .values('college_id').annotate(committed=Sum('budget_committed')).values_list('college_id', 'committed')
+    )
     
     labels = []
     allotted_data = []
@@ -205,8 +192,8 @@ def get_budget_multi_series_data(start_date, end_date, college=None):
     
     for cb in budget_queryset:
         allotted = cb.total_assigned or Decimal('0')
-        committed = cb.total_committed_to_projects 
-        uncommitted = cb.uncommitted_remaining
+        committed = committed_by_college.get(cb.college_id) or Decimal('0')
+        uncommitted = allotted - committed
         
         if allotted > Decimal('0') or committed > Decimal('0') or uncommitted != allotted:
             college_name = cb.college.name if cb.college else "Unassigned College"
@@ -257,16 +244,18 @@ def get_request_status_distribution(start_date, end_date, college=None):
     Note: ClientRequest doesn't have direct college relationship, so filtering may not apply.
     If college filtering is needed, this would need adjustment based on your model relationships.
     """
-    requests = ClientRequest.objects.filter(submitted_at__range=[start_date, end_date])
-    
     # Note: ClientRequest filtering by college would need to be implemented based on your model structure
     # For now, keeping original logic as ClientRequest may not have direct college relationship
-    
-    total_count = requests.count()
+    counts = _facts(start_date, end_date).aggregate(
+        approved=Sum('requests_approved'), rejected=Sum('requests_rejected'), ongoing=Sum('requests_ongoing')
+    )
+    return _request_status_payload(counts['approved'] or 0, counts['rejected'] or 0, counts['ongoing'] or 0)
+
+
+def _request_status_payload(approved_count, rejected_count, ongoing_count):
+    """Request status percentages, rounded to add up to 100."""
+    total_count = approved_count + rejected_count + ongoing_count
     if total_count == 0: return {'labels': ['Approved', 'Ongoing', 'Rejected'], 'approved_pct': 0, 'ongoing_pct': 0, 'rejected_pct': 0, 'total_count': 0}
-    approved_count = requests.filter(status='APPROVED').count()
-    rejected_count = requests.filter(status='REJECTED').count()
-    ongoing_count = requests.exclude(Q(status='APPROVED') | Q(status='REJECTED')).count()
     approved_pct = round((approved_count / total_count) * 100, 1)
     rejected_pct = round((rejected_count / total_count) * 100, 1)
     ongoing_pct = round((ongoing_count / total_count) * 100, 1)
@@ -283,46 +272,111 @@ def get_project_trends(start_date, end_date, college=None):
     Returns project trends comparing current period vs previous period.
     If college is provided, filters to projects where project_leader belongs to that college.
     """
+    previous_start_dt, previous_end_dt = _previous_period(start_date, end_date)
+    
+    # Both periods in one query over the daily facts
+    current_days = Q(day__range=[local_day(start_date), local_day(end_date)])
+    previous_days = Q(day__range=[local_day(previous_start_dt), local_day(previous_end_dt)])
+    totals = _facts(previous_start_dt, end_date, college).aggregate(
+        current_created=Sum('projects_created', filter=current_days),
+        current_completed=Sum('projects_ended', filter=current_days),
+        previous_created=Sum('projects_created', filter=previous_days),
+        previous_completed=Sum('projects_ended', filter=previous_days),
+    )
+    
+    return {
+        'created': _trend(totals['current_created'] or 0, totals['previous_created'] or 0),
+        'completed': _trend(totals['current_completed'] or 0, totals['previous_completed'] or 0),
+    }
+
+
+def _previous_period(start_date, end_date):
+    """The period of the same length that ends the day before start_date."""
     current_duration = end_date.date() - start_date.date()
     previous_end_date = start_date - timedelta(days=1)
     previous_start_date = previous_end_date - current_duration
     current_tz = timezone.get_current_timezone()
     previous_start_dt = timezone.make_aware(datetime.combine(previous_start_date, datetime.min.time()), current_tz)
     previous_end_dt = timezone.make_aware(datetime.combine(previous_end_date, datetime.max.time()), current_tz)
-    
-    # Current period queries
-    current_created_query = Project.objects.filter(created_at__range=[start_date, end_date])
-    current_completed_query = Project.objects.filter(estimated_end_date__range=[start_date, end_date])
-    
-    # Previous period queries
-    previous_created_query = Project.objects.filter(created_at__range=[previous_start_dt, previous_end_dt])
-    previous_completed_query = Project.objects.filter(estimated_end_date__range=[previous_start_dt, previous_end_dt])
-    
-    # Apply college filter if provided
-    if college is not None:
-        current_created_query = current_created_query.filter(project_leader__college=college)
-        current_completed_query = current_completed_query.filter(project_leader__college=college)
-        previous_created_query = previous_created_query.filter(project_leader__college=college)
-        previous_completed_query = previous_completed_query.filter(project_leader__college=college)
-    
-    current_created_count = current_created_query.count()
-    previous_created_count = previous_created_query.count()
-    created_change = 0
-    created_trend = "flat"
-    if previous_created_count > 0:
-        created_change = round(((current_created_count - previous_created_count) / previous_created_count) * 100)
-        if created_change > 0: created_trend = "up"
-        elif created_change < 0: created_trend = "down"
-    elif current_created_count > 0: created_change = 100; created_trend = "up"
-    
-    current_completed_count = current_completed_query.count()
-    previous_completed_count = previous_completed_query.count()
-    completed_change = 0
-    completed_trend = "flat"
-    if previous_completed_count > 0:
-        completed_change = round(((current_completed_count - previous_completed_count) / previous_completed_count) * 100)
-        if completed_change > 0: completed_trend = "up"
-        elif completed_change < 0: completed_trend = "down"
-    elif current_completed_count > 0: completed_change = 100; completed_trend = "up"
-    
-    return {'created': {'number': current_created_count, 'change': created_change, 'trend': created_trend}, 'completed': {'number': current_completed_count, 'change': completed_change, 'trend': completed_trend}}
\ No newline at end of file
+    return previous_start_dt, previous_end_dt
+
+
+def _trend(current_count, previous_count):
+    """Percent change against the previous period, as {'number', 'change', 'trend'}."""
+    change = 0
+    trend = "flat"
+    if previous_count > 0:
+        change = round(((current_count - previous_count) / previous_count) * 100)
+        if change > 0: trend = "up"
+        elif change < 0: trend = "down"
+    elif current_count > 0: change = 100; trend = "up"
+    return {'number': current_count, 'change': change, 'trend': trend}
+
+
+# ==============================================================================
+# DASHBOARD BUNDLE
+# ==============================================================================
+
+def get_analytics_bundle(start_date, end_date, college=None):
+    """
+    Every card, trend and chart of the analytics dashboard in one pass:
+    one aggregate over the daily facts for the totals, trends and request
+    statuses, one grouped query for both time series, one for providers,
+    one for agendas and two for the budget chart.
+
+    Keys hold what the matching per-metric function returns: projects,
+    events, providers, individuals, trends, active, trained, budget, agenda
+    and requests.
+    """
+    TruncFunc, time_unit = _get_trunc_object(start_date, end_date)
+    previous_start_dt, previous_end_dt = _previous_period(start_date, end_date)
+
+    current_days = Q(day__range=[local_day(start_date), local_day(end_date)])
+    previous_days = Q(day__range=[local_day(previous_start_dt), local_day(previous_end_dt)])
+    # Requests have no college, so the college filter applies per total
+    in_college = Q(college=college) if college is not None else Q()
+    current = current_days & in_college
+    previous = previous_days & in_college
+    totals = _facts(previous_start_dt, end_date).aggregate(
+        projects=Sum('projects_started', filter=current),
+        events=Sum('events_held', filter=current),
+        individuals=Sum('individuals_trained', filter=current),
+        current_created=Sum('projects_created', filter=current),
+        current_completed=Sum('projects_ended', filter=current),
+        previous_created=Sum('projects_created', filter=previous),
+        previous_completed=Sum('projects_ended', filter=previous),
+        approved=Sum('requests_approved', filter=current_days),
+        rejected=Sum('requests_rejected', filter=current_days),
+        ongoing=Sum('requests_ongoing', filter=current_days),
+    )
+
+    series = _facts(start_date, end_date, college).filter(
+        Q(projects_started__gt=0) | Q(individuals_trained__gt=0)
+    ).annotate(
+        timescale_unit=TruncFunc('day')
+    ).values('timescale_unit').annotate(
+        started=Sum('projects_started'), trained=Sum('individuals_trained')
+    ).order_by('timescale_unit')
+    active_data, trained_data = [], []
+    for item in series:
+        x = item['timescale_unit'].strftime('%Y-%m-%d')
+        if item['started']:
+            active_data.append({"x": x, "y": item['started']})
+        if item['trained']:
+            trained_data.append({"x": x, "y": item['trained']})
+
+    return {
+        'projects': {'metric': totals['projects'] or 0},
+        'events': {'metric': totals['events'] or 0},
+        'providers': get_total_providers_count(start_date, end_date, college=college),
+        'individuals': {'metric': totals['individuals'] or 0},
+        'trends': {
+            'created': _trend(totals['current_created'] or 0, totals['previous_created'] or 0),
+            'completed': _trend(totals['current_completed'] or 0, totals['previous_completed'] or 0),
+        },
+        'active': {'data': active_data, 'timeUnit': time_unit},
+        'trained': {'data': trained_data, 'timeUnit': time_unit},
+        'budget': get_budget_allocation_data(start_date, end_date, college=college),
+        'agenda': get_agenda_distribution_data(start_date, end_date, college=college),
+        'requests': _request_status_payload(totals['approved'] or 0, totals['rejected'] or 0, totals['ongoing'] or 0),
+    }
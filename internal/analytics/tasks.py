@@ -0,0 +1,24 @@
+from datetime import date
+
+from WBPMISUESO.celery import app
+
+
+@app.task(ignore_result=True)
+def refresh_analytics_fact_days(days):
+    """Rebuild the analytics facts of the given days (ISO dates) after a change."""
+    from .facts import refresh_days
+    return refresh_days([date.fromisoformat(day) for day in days])
+
+
+@app.task
+def rebuild_analytics_facts():
+    """Rebuild every analytics fact row, catching changes that skipped the signals."""
+    from .facts import rebuild_all_facts
+    return rebuild_all_facts()
+
+
+@app.task(ignore_result=True)
+def refresh_analytics_result(metric, start_day, end_day, college_id=None):
+    """Recompute a stale cached analytics result while readers are served the old one."""
+    from .cache import refresh_result
+    refresh_result(metric, date.fromisoformat(start_day), date.fromisoformat(end_day), college_id)
@@ -1,3 +1,180 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.db.models import Q, Sum
 from django.test import TestCase
+from django.utils import timezone
+from django_redis import get_redis_connection
+from rest_framework_api_key.models import APIKey
+
+from internal.submissions.models import Submission
+from shared.downloadables.models import Downloadable
+from shared.projects.models import Project, ProjectEvent
+from shared.request.models import ClientRequest
+from system.settings.models import APIConnection
+from system.users.models import College, User
+from . import services
+from .facts import FACT_FIELDS, compute_facts, rebuild_all_facts
+from .serializers import ProjectReadOnlySerializer
+
+PROJECT_DATA_URL = '/analytics/api/all-project-data/'
+
+
+def create_project(title, status='COMPLETED', **fields):
+    return Project.objects.create(
+        title=title, status=status, estimated_events=2, estimated_trainees=10,
+        primary_beneficiary='Community', primary_location='Campus', logistics_type='BOTH',
+        start_date=fields.pop('start_date', date(2025, 1, 6)),
+        estimated_end_date=fields.pop('estimated_end_date', date(2025, 3, 28)),
+        **fields,
+    )
+
+
+class ProjectDataAPITests(TestCase):
+    """Keyset pages of get_all_project_data, sparse fields and failures while streaming."""
+
+    def setUp(self):
+        get_redis_connection('default').flushdb()
+        self.user = User.objects.create_user(username='partner', email='partner@example.com', password='pw')
+        api_key, key = APIKey.objects.create_key(name='partner')
+        APIConnection.objects.create(name='Partner', requested_by=self.user, api_key=api_key, status='ACTIVE', tier='TIER_1')
+        self.client.force_login(self.user, backend='django.contrib.auth.backends.ModelBackend')
+        self.headers = {'X-Api-Key': key}
+        self.projects = [create_project(f'Project {number}') for number in range(5)]
+
+    def get(self, url, **params):
+        response = self.client.get(url, params, headers=self.headers)
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, json.loads(content)
+
+    def test_cursor_pages_cover_every_project_once(self):
+        ids, url, pages = [], PROJECT_DATA_URL + '?page_size=2', 0
+        while url:
+            response, page = self.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(project['id'] for project in page['results'])
+            url, pages = page['next'], pages + 1
+        self.assertEqual(ids, [project.id for project in self.projects])
+        self.assertEqual(pages, 3)
+
+    def test_fields_limits_the_project_members(self):
+        _, page = self.get(PROJECT_DATA_URL, fields='id,title,providers')
+        self.assertEqual(page['results'][0], {'id': self.projects[0].id, 'title': 'Project 0', 'providers': []})
+
+    def test_bad_parameters_are_rejected(self):
+        self.assertEqual(self.get(PROJECT_DATA_URL, fields='id,secret')[0].status_code, 400)
+        self.assertEqual(self.get(PROJECT_DATA_URL, cursor='garbage')[0].status_code, 400)
+
+    def fail_on(self, project):
+        original = ProjectReadOnlySerializer.get_status
+
+        def get_status(serializer, obj):
+            if obj.id == project.id:
+                raise RuntimeError('broken project')
+            return original(serializer, obj)
+
+        return mock.patch.object(ProjectReadOnlySerializer, 'get_status', get_status)
+
+    def test_failure_in_first_chunk_is_a_server_error(self):
+        with self.fail_on(self.projects[0]), self.assertLogs('internal.analytics.api_views', 'ERROR'):
+            response, body = self.get(PROJECT_DATA_URL, page_size=2)
+        self.assertEqual(response.status_code, 500)
+        self.assertIn('error', body)
+
+    def test_failure_while_streaming_ends_with_valid_json(self):
+        with mock.patch('internal.analytics.api_views.PROJECT_DATA_CHUNK_SIZE', 2), self.fail_on(self.projects[3]), \
+                self.assertLogs('internal.analytics.api_views', 'ERROR'):
+            response, page = self.get(PROJECT_DATA_URL, page_size=4)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([project['id'] for project in page['results']], [project.id for project in self.projects[:3]])
+        self.assertIsNone(page['next'])
+        self.assertIn('error', page)
+
+
+def local_datetime(*args):
+    return timezone.make_aware(datetime(*args), timezone.get_current_timezone())
+
+
+class DailyFactTests(TestCase):
+    """The fact table reproduces the raw-table aggregates the dashboard used to run."""
+
+    START = local_datetime(2025, 1, 1)
+    END = local_datetime(2025, 3, 31, 23, 59, 59)
+
+    def setUp(self):
+        get_redis_connection('default').flushdb()
+        self.colleges = [College.objects.create(name='Engineering'), College.objects.create(name='Nursing')]
+        leaders = [
+            User.objects.create_user(username=f'leader{number}', email=f'leader{number}@example.com', password='pw',
+                                     role='FACULTY', college=college)
+            for number, college in enumerate(self.colleges + [None])
+        ]
+        template = Downloadable.objects.create(file='downloadables/files/report.docx', submission_type='final')
+        starts = [date(2024, 12, 31), date(2025, 1, 1), date(2025, 2, 14), date(2025, 3, 31), date(2025, 4, 1)]
+        for number, start in enumerate(starts):
+            leader = leaders[number % len(leaders)]
+            project = create_project(
+                f'Project {number}', start_date=start, estimated_end_date=date(2025, 3, number + 1),
+                project_leader=leader, internal_budget=Decimal('1000.50') * (number + 1),
+            )
+            for day in (1, 15):
+                event = ProjectEvent.objects.create(
+                    project=project, title='Training', datetime=local_datetime(start.year, start.month, day, 23, 30),
+                )
+                Submission.objects.create(
+                    project=project, downloadable=template, deadline=event.datetime, event=event,
+                    num_trained_individuals=10 * (number + 1),
+                )
+        submitted = [
+            ('APPROVED', local_datetime(2024, 12, 31, 23, 30)), ('REJECTED', local_datetime(2025, 1, 1)),
+            ('UNDER_REVIEW', local_datetime(2025, 3, 31, 23, 30)), ('APPROVED', local_datetime(2025, 2, 1)),
+            ('APPROVED', local_datetime(2025, 4, 1)),
+        ]
+        for status, submitted_at in submitted:
+            client_request = ClientRequest.objects.create(
+                title='Request', organization='Barangay', primary_location='Hall', primary_beneficiary='Youth',
+                summary='Summary', status=status,
+            )
+            ClientRequest.objects.filter(pk=client_request.pk).update(submitted_at=submitted_at)
+        rebuild_all_facts()
+
+    def raw_totals(self, college=None):
+        """The pre-fact aggregates over the raw tables."""
+        projects = Project.objects.filter(start_date__range=[self.START, self.END])
+        events = ProjectEvent.objects.filter(datetime__range=[self.START, self.END])
+        submissions = Submission.objects.filter(event__datetime__range=[self.START, self.END], num_trained_individuals__isnull=False)
+        if college is not None:
+            projects = projects.filter(project_leader__college=college)
+            events = events.filter(project__project_leader__college=college)
+            submissions = submissions.filter(event__project__project_leader__college=college)
+        return {
+            'projects': projects.count(),
+            'budget': projects.aggregate(total=Sum('internal_budget'))['total'] or 0,
+            'events': events.count(),
+            'individuals': submissions.aggregate(total=Sum('num_trained_individuals'))['total'] or 0,
+        }
+
+    def test_compute_facts_matches_raw_aggregates(self):
+        facts = compute_facts(self.START.date(), self.END.date())
+        totals = {field: sum(values[field] for values in facts.values()) for field in FACT_FIELDS}
+        raw = self.raw_totals()
+        self.assertEqual((raw['projects'], raw['events']), (3, 6))  # Rows on both sides of the range edges
+        self.assertEqual(totals['projects_started'], raw['projects'])
+        self.assertEqual(totals['budget_committed'], raw['budget'])
+        self.assertEqual(totals['events_held'], raw['events'])
+        self.assertEqual(totals['individuals_trained'], raw['individuals'])
+
+        requests = ClientRequest.objects.filter(submitted_at__range=[self.START, self.END])
+        self.assertEqual(totals['requests_approved'], requests.filter(status='APPROVED').count())
+        self.assertEqual(totals['requests_rejected'], requests.filter(status='REJECTED').count())
+        self.assertEqual(totals['requests_ongoing'], requests.exclude(Q(status='APPROVED') | Q(status='REJECTED')).count())
 
-# Create your tests here.
+    def test_metrics_match_raw_aggregates_per_college(self):
+        for college in self.colleges + [None]:
+            with self.subTest(college=college):
+                raw = self.raw_totals(college)
+                self.assertEqual(services.get_total_projects_count(self.START, self.END, college)['metric'], raw['projects'])
+                self.assertEqual(services.get_total_events_count(self.START, self.END, college)['metric'], raw['events'])
+                self.assertEqual(services.get_total_individuals_trained(self.START, self.END, college)['metric'], raw['individuals'])
@@ -5,6 +5,10 @@ from . import api_views
 urlpatterns = [
     path('', views.analytics_view, name='analytics'),
 
+    # 1. DASHBOARD BUNDLE (every card, trend and chart in one request)
+    path('data/bundle/', api_views.analytics_bundle_api, name='analytics_bundle_data'),
+    path('data/cache-stats/', api_views.analytics_cache_stats_api, name='analytics_cache_stats'),
+
     # 2. CARD METRIC DATA VIEWS (Mapped to API Views)
     path('data/metric/projects/', api_views.projects_metric_api, name='projects_metric_data'),
     path('data/metric/events/', api_views.events_metric_api, name='events_metric_data'),
@@ -1,14 +1,11 @@
 from django.shortcuts import render
 from django.utils import timezone
 from datetime import datetime, timedelta
-from . import services 
+from .cache import get_cached_bundle
 
 # Imports for Excel Export
-import io
-import openpyxl
 from openpyxl.styles import Font
-from django.http import HttpResponse
-from openpyxl.utils import get_column_letter 
+from system.exports.xlsx import new_workbook, set_column_widths, styled, workbook_response
 
 # ==============================================================================
 # HELPER FUNCTION (MOVED TO TOP LEVEL)
@@ -42,8 +39,8 @@ def _get_validated_dates(request):
         end_date_naive = datetime.strptime(end_date_str, '%Y-%m-%d')
         
         # Make aware, setting start to beginning of day and end to end of day
-        start_date = current_tz.localize(start_date_naive.replace(hour=0, minute=0, second=0, microsecond=0))
-        end_date = current_tz.localize(end_date_naive.replace(hour=23, minute=59, second=59, microsecond=999999))
+        start_date = timezone.make_aware(start_date_naive.replace(hour=0, minute=0, second=0, microsecond=0), current_tz)
+        end_date = timezone.make_aware(end_date_naive.replace(hour=23, minute=59, second=59, microsecond=999999), current_tz)
         
         context_dates = {
             'selected_start_date': start_date,
@@ -76,14 +73,8 @@ def analytics_view(request):
         user_college = request.user.college
         is_college_restricted = True
     
+    # Cards, trends and charts are loaded by the page from the bundle endpoint
     context = {
-        'card_metrics': {
-            'total_projects': services.get_total_projects_count(start_date, end_date, college=user_college),
-            'total_events': services.get_total_events_count(start_date, end_date, college=user_college),
-            'total_providers': services.get_total_providers_count(start_date, end_date, college=user_college),
-            'total_trained': services.get_total_individuals_trained(start_date, end_date, college=user_college),
-        },
-        'project_trends': services.get_project_trends(start_date, end_date, college=user_college),
         'is_college_restricted': is_college_restricted,  
     }
     
@@ -103,161 +94,90 @@ def export_analytics_to_excel(request):
     if hasattr(request.user, 'role') and request.user.role in ['PROGRAM_HEAD', 'DEAN', 'COORDINATOR']:
         user_college = request.user.college
     
-    wb = openpyxl.Workbook()
+    bundle = get_cached_bundle(start_date, end_date, college=user_college)
+
+    wb = new_workbook()
     header_font = Font(bold=True, size=12)
     title_font = Font(bold=True, size=16)
 
-    ws_overview = wb.active
-    ws_overview.title = "Overview"
-    
-    ws_overview['A1'] = "Analytics Report"
-    ws_overview['A1'].font = title_font
-    ws_overview['A2'] = f"Date Range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
-    
-    ws_overview['A4'] = "Key Metrics"
-    ws_overview['A4'].font = header_font
+    # Write-only sheets are filled top to bottom; widths are set before the first row
+    ws_overview = wb.create_sheet(title="Overview")
+    set_column_widths(ws_overview, [35, 15])
+    ws_overview.append([styled(ws_overview, "Analytics Report", font=title_font)])
+    ws_overview.append([f"Date Range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"])
+    ws_overview.append([])
+    ws_overview.append([styled(ws_overview, "Key Metrics", font=header_font)])
     
     metrics = {
-        "Total Projects Started": services.get_total_projects_count(start_date, end_date, college=user_college)['metric'],
-        "Total Events": services.get_total_events_count(start_date, end_date, college=user_college)['metric'],
-        "Total Providers (Faculty & Colleges)": services.get_total_providers_count(start_date, end_date, college=user_college)['metric'],
-        "Total Individuals Trained": services.get_total_individuals_trained(start_date, end_date, college=user_college)['metric']
+        "Total Projects Started": bundle['projects']['metric'],
+        "Total Events": bundle['events']['metric'],
+        "Total Providers (Faculty & Colleges)": bundle['providers']['metric'],
+        "Total Individuals Trained": bundle['individuals']['metric']
     }
-    
-    row = 5
     for key, value in metrics.items():
-        ws_overview[f'A{row}'] = key
-        ws_overview[f'B{row}'] = value
-        row += 1
-    ws_overview.column_dimensions['A'].width = 35
-    ws_overview.column_dimensions['B'].width = 15
+        ws_overview.append([key, value])
 
     ws_projects = wb.create_sheet(title="Projects Over Time")
-    ws_projects['A1'] = "Active Projects Created Over Time"
-    ws_projects['A1'].font = header_font
-    ws_projects['A3'] = "Date/Time Unit"
-    ws_projects['B3'] = "Projects Created"
-    ws_projects['A3'].font = header_font
-    ws_projects['B3'].font = header_font
-    
-    project_data = services.get_active_projects_over_time(start_date, end_date, college=user_college).get('data', [])
-    for i, item in enumerate(project_data, start=4):
-        ws_projects[f'A{i}'] = item['x']
-        ws_projects[f'B{i}'] = item['y']
-    ws_projects.column_dimensions['A'].width = 25
-    ws_projects.column_dimensions['B'].width = 20
+    set_column_widths(ws_projects, [25, 20])
+    ws_projects.append([styled(ws_projects, "Active Projects Created Over Time", font=header_font)])
+    ws_projects.append([])
+    ws_projects.append([styled(ws_projects, "Date/Time Unit", font=header_font), styled(ws_projects, "Projects Created", font=header_font)])
+    for item in bundle['active'].get('data', []):
+        ws_projects.append([item['x'], item['y']])
 
     ws_trained = wb.create_sheet(title="Individuals Trained")
-    ws_trained['A1'] = "Individuals Trained Over Time"
-    ws_trained['A1'].font = header_font
-    ws_trained['A3'] = "Date/Time Unit"
-    ws_trained['B3'] = "Individuals Trained"
-    ws_trained['A3'].font = header_font
-    ws_trained['B3'].font = header_font
-    
-    trained_data = services.get_trained_individuals_data(start_date, end_date, college=user_college).get('data', [])
-    for i, item in enumerate(trained_data, start=4):
-        ws_trained[f'A{i}'] = item['x']
-        ws_trained[f'B{i}'] = item['y']
-    ws_trained.column_dimensions['A'].width = 25
-    ws_trained.column_dimensions['B'].width = 20
-
-    ws_budget = wb.create_sheet(title="Budget Allocation")
-    ws_budget['A1'] = "Budget Allocation by College"
-    ws_budget['A1'].font = title_font
-    ws_budget['A2'] = f"Data Based on Fiscal Year: {end_date.year}"
-    
-    budget_data = services.get_budget_allocation_data(start_date, end_date, college=user_college)
+    set_column_widths(ws_trained, [25, 20])
+    ws_trained.append([styled(ws_trained, "Individuals Trained Over Time", font=header_font)])
+    ws_trained.append([])
+    ws_trained.append([styled(ws_trained, "Date/Time Unit", font=header_font), styled(ws_trained, "Individuals Trained", font=header_font)])
+    for item in bundle['trained'].get('data', []):
+        ws_trained.append([item['x'], item['y']])
+
+    budget_data = bundle['budget']
     labels = budget_data.get('labels', [])
     datasets = budget_data.get('datasets', [])
-    
-    ws_budget['A4'] = "College"
-    ws_budget['A4'].font = header_font
-    
-    current_col = 2
-    for dataset in datasets:
-        header_title = dataset['label']
-        cell = ws_budget.cell(row=4, column=current_col, value=f"{header_title} (₱)")
-        cell.font = header_font
-        current_col += 1
-        
-    for i, label in enumerate(labels, start=5):
-        ws_budget[f'A{i}'] = label
-        
-        current_col = 2
-        for dataset in datasets:
-            data_list = dataset['data']
-            value = data_list[i-5] 
-            cell = ws_budget.cell(row=i, column=current_col, value=value)
-            cell.number_format = '₱#,##0.00'
-            current_col += 1
 
-    ws_budget.column_dimensions['A'].width = 40
-    for col_idx in range(2, current_col):
-        ws_budget.column_dimensions[get_column_letter(col_idx)].width = 25
+    ws_budget = wb.create_sheet(title="Budget Allocation")
+    set_column_widths(ws_budget, [40] + [25] * len(datasets))
+    ws_budget.append([styled(ws_budget, "Budget Allocation by College", font=title_font)])
+    ws_budget.append([f"Data Based on Fiscal Year: {end_date.year}"])
+    ws_budget.append([])
+    ws_budget.append(
+        [styled(ws_budget, "College", font=header_font)]
+        + [styled(ws_budget, f"{dataset['label']} (₱)", font=header_font) for dataset in datasets]
+    )
+    for i, label in enumerate(labels):
+        ws_budget.append(
+            [label]
+            + [styled(ws_budget, dataset['data'][i], number_format='₱#,##0.00') for dataset in datasets]
+        )
 
+    agenda_data = bundle['agenda']
     ws_agenda = wb.create_sheet(title="Agenda Distribution")
-    ws_agenda['A1'] = "Project Distribution by Agenda"
-    ws_agenda['A1'].font = header_font
-    ws_agenda['A3'] = "Agenda"
-    ws_agenda['B3'] = "Project Count"
-    ws_agenda['A3'].font = header_font
-    ws_agenda['B3'].font = header_font
-    
-    agenda_data = services.get_agenda_distribution_data(start_date, end_date, college=user_college)
-    for i, label in enumerate(agenda_data.get('labels', []), start=4):
-        ws_agenda[f'A{i}'] = label
-        ws_agenda[f'B{i}'] = agenda_data['counts'][i-4]
-    ws_agenda.column_dimensions['A'].width = 40
-    ws_agenda.column_dimensions['B'].width = 20
-
-    ws_requests = wb.create_sheet(title="Request Status")
-    ws_requests['A1'] = "Client Request Status"
-    ws_requests['A1'].font = header_font
-    
-    request_data = services.get_request_status_distribution(start_date, end_date, college=user_college)
+    set_column_widths(ws_agenda, [40, 20])
+    ws_agenda.append([styled(ws_agenda, "Project Distribution by Agenda", font=header_font)])
+    ws_agenda.append([])
+    ws_agenda.append([styled(ws_agenda, "Agenda", font=header_font), styled(ws_agenda, "Project Count", font=header_font)])
+    for i, label in enumerate(agenda_data.get('labels', [])):
+        ws_agenda.append([label, agenda_data['counts'][i]])
+
+    request_data = bundle['requests']
     total_count = request_data.get('total_count', 0)
-    
-    ws_requests['A3'] = "Status"
-    ws_requests['B3'] = "Percentage"
-    ws_requests['C3'] = "Count (Approx.)"
-    ws_requests['A3'].font = header_font
-    ws_requests['B3'].font = header_font
-    ws_requests['C3'].font = header_font
-    
-    ws_requests['A4'] = "Approved"
-    ws_requests['A5'] = "Ongoing"
-    ws_requests['A6'] = "Rejected"
-    
-    ws_requests['B4'] = request_data.get('approved_pct', 0) / 100
-    ws_requests['B5'] = request_data.get('ongoing_pct', 0) / 100
-    ws_requests['B6'] = request_data.get('rejected_pct', 0) / 100
-    ws_requests['B4'].number_format = '0.0%'
-    ws_requests['B5'].number_format = '0.0%'
-    ws_requests['B6'].number_format = '0.0%'
-    
-    ws_requests['C4'] = round(total_count * (request_data.get('approved_pct', 0) / 100))
-    ws_requests['C5'] = round(total_count * (request_data.get('ongoing_pct', 0) / 100))
-    ws_requests['C6'] = round(total_count * (request_data.get('rejected_pct', 0) / 100))
-    
-    ws_requests['A8'] = "Total Requests"
-    ws_requests['C8'] = total_count
-    ws_requests['A8'].font = header_font
-    ws_requests['C8'].font = header_font
 
-    ws_requests.column_dimensions['A'].width = 20
-    ws_requests.column_dimensions['B'].width = 15
-    ws_requests.column_dimensions['C'].width = 20
-        
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
+    ws_requests = wb.create_sheet(title="Request Status")
+    set_column_widths(ws_requests, [20, 15, 20])
+    ws_requests.append([styled(ws_requests, "Client Request Status", font=header_font)])
+    ws_requests.append([])
+    ws_requests.append([
+        styled(ws_requests, "Status", font=header_font),
+        styled(ws_requests, "Percentage", font=header_font),
+        styled(ws_requests, "Count (Approx.)", font=header_font),
+    ])
+    for label, key in (("Approved", 'approved_pct'), ("Ongoing", 'ongoing_pct'), ("Rejected", 'rejected_pct')):
+        share = request_data.get(key, 0) / 100
+        ws_requests.append([label, styled(ws_requests, share, number_format='0.0%'), round(total_count * share)])
+    ws_requests.append([])
+    ws_requests.append([styled(ws_requests, "Total Requests", font=header_font), None, styled(ws_requests, total_count, font=header_font)])
 
-    response = HttpResponse(
-        output,
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
     filename = f"analytics_export_{timezone.now().strftime('%Y-%m-%d')}.xlsx"
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    
-    return response
\ No newline at end of file
+    return workbook_response(wb, filename)
\ No newline at end of file
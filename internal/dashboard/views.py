@@ -193,7 +193,15 @@ def dashboard_view(request):
     
     dashboard_goals.sort(key=lambda g: (g['progress'] >= 100, -g['progress']))
            
-    events_by_date = services.get_events_by_date(request.user, for_main_calendar_view=False)
+    # The mini calendar embeds events and holidays around the current year and
+    # fetches other months from meeting_event_list when the user navigates to them
+    window_start, window_end = services.get_calendar_window(years=1)
+    events_by_date = services.get_events_by_date(
+        request.user,
+        for_main_calendar_view=False,
+        start_date=window_start,
+        end_date=window_end,
+    )
     events_json = json.dumps(events_by_date)
 
     from django.contrib.messages import get_messages
@@ -247,6 +255,8 @@ def dashboard_view(request):
         'projects': projects,
         'agenda_distribution': agenda_counts,
         'events_json': events_json,
+        'events_window_start': window_start.isoformat(),
+        'events_window_end': window_end.isoformat(),
         'dashboard_goals': dashboard_goals,
         'show_events_card': show_events_card,
         'notifications': notifications,
@@ -1,11 +1,12 @@
 import numpy as np
 import os
-import re
 from django.conf import settings
 from django.db.models import Q
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import SentenceTransformer
 from system.users.models import User
 from shared.projects.models import Project
+from .embeddings import MODEL_NAME, get_embedding_store, normalize_text
+from .lexical_index import ExpertLexicalIndex
 
 
 class AITeamGenerator:
@@ -14,6 +15,11 @@ class AITeamGenerator:
     - Degree
     - Expertise
     - Project Titles (softmax-based multi-title scoring)
+
+    Text embeddings come from the persistent EmbeddingStore, so a search encodes
+    only the keywords (plus any texts not embedded yet) and scores every
+    candidate text with one matrix-vector product. Candidates are first narrowed
+    to a keyword-overlap shortlist by the ExpertLexicalIndex.
     """
 
     # Scoring weights
@@ -34,6 +40,14 @@ class AITeamGenerator:
     DEGREE_MIN_SCORE = 0.16
     EXPERTISE_MIN_SCORE = 0.18
 
+    ELIGIBLE_ROLES = ['FACULTY', 'PROGRAM_HEAD', 'DEAN', 'COORDINATOR', 'DIRECTOR', 'VP']
+
+    # Candidates passed from the lexical index to semantic scoring per search
+    SHORTLIST_SIZE = 200
+
+    # Project statuses that count as ongoing work
+    ACTIVE_PROJECT_STATUSES = ("IN_PROGRESS", "NOT_STARTED")
+
     MAX_PROJECT_TITLES_FOR_SCORING = 12
     TOP_PROJECT_TITLES_FOR_SCORE = 3
     MAX_WORKLOAD_PENALTY = 0.12
@@ -79,12 +93,34 @@ class AITeamGenerator:
         },
     }
 
-    MODEL_NAME = 'all-MiniLM-L6-v2'
+    MODEL_NAME = MODEL_NAME
     MODEL_CACHE_DIR = os.path.join(settings.BASE_DIR, 'internal', 'experts', 'ai_model')
 
 
     def __init__(self):
         self.model = None
+        self._lexical_index = None
+        self._compile_expansions()
+
+
+    # Tokenize each KEYWORD_EXPANSIONS concept once and index concepts by token
+    def _compile_expansions(self):
+        self._concept_tokens = []
+        self._token_concepts = {}
+        for key, related_terms in self.KEYWORD_EXPANSIONS.items():
+            concept_tokens = set(self._tokenize(key))
+            for term in related_terms:
+                concept_tokens.update(self._tokenize(term))
+            concept_id = len(self._concept_tokens)
+            self._concept_tokens.append(frozenset(concept_tokens))
+            for token in concept_tokens:
+                self._token_concepts.setdefault(token, []).append(concept_id)
+
+
+    def _get_lexical_index(self):
+        if self._lexical_index is None:
+            self._lexical_index = ExpertLexicalIndex(self)
+        return self._lexical_index
 
 
     # Load or get cached model
@@ -95,20 +131,13 @@ class AITeamGenerator:
         return self.model
     
 
-    # Softmax function for multi-title scoring
-    def _softmax(self, x):
-        if len(x) == 0:
-            return np.array([])
-        x = np.array(x)
-        exp = np.exp(x - np.max(x))
-        return exp / exp.sum()
+    # Clamp an array of scores to [0, 1], mapping NaN to 0 (array form of _clamp_score)
+    def _clamp_array(self, scores):
+        return np.clip(np.nan_to_num(np.asarray(scores, dtype=np.float64), nan=0.0), 0.0, 1.0)
 
 
     def _normalize_text(self, text):
-        if not text:
-            return ""
-        normalized = re.sub(r"[^a-z0-9\s]", " ", str(text).lower())
-        return re.sub(r"\s+", " ", normalized).strip()
+        return normalize_text(text)
 
 
     def _tokenize(self, text):
@@ -126,18 +155,22 @@ class AITeamGenerator:
             return set()
 
         expanded = set(tokens)
-        for key, related_terms in self.KEYWORD_EXPANSIONS.items():
-            concept_tokens = set()
-            concept_tokens.update(self._tokenize(key))
-            for term in related_terms:
-                concept_tokens.update(self._tokenize(term))
-
-            if tokens.intersection(concept_tokens):
-                expanded.update(concept_tokens)
+        matched_concepts = {
+            concept_id
+            for token in tokens
+            for concept_id in self._token_concepts.get(token, ())
+        }
+        for concept_id in matched_concepts:
+            expanded.update(self._concept_tokens[concept_id])
 
         return expanded
 
 
+    def _text_tokens(self, text):
+        """Expanded token set of a single text."""
+        return self._expand_tokens(self._tokenize(text))
+
+
     def _expand_keywords(self, keyword_text):
         base_tokens = self._tokenize(keyword_text)
         expanded_tokens = self._expand_tokens(base_tokens)
@@ -162,69 +195,84 @@ class AITeamGenerator:
         return max(0.0, min(1.0, score_val))
 
 
-    # Cosine similarity between two embeddings
-    def _sim(self, emb1, emb2):
-        """Cosine similarity returning float."""
-        return self._clamp_score(util.cos_sim(emb1, emb2)[0][0])
+    # Cosine similarity of every text against the keywords in one matrix product
+    def _similarity_vector(self, keyword_vec, texts, model):
+        """
+        Returns ({normalized text: column}, clamped similarities) for all unique texts.
+        Uncached texts are encoded together in one batched model.encode call.
+        """
+        unique_texts, matrix = get_embedding_store().get_matrix(texts, model)
+        if not unique_texts:
+            return {}, np.zeros(0, dtype=np.float64)
+        sims = self._clamp_array((matrix @ keyword_vec).astype(np.float64))
+        return {text: i for i, text in enumerate(unique_texts)}, sims
 
 
-    def _semantic_score(self, keyword_emb, text, model):
-        """Returns semantic similarity score for text, or 0 for empty inputs."""
-        normalized = self._normalize_text(text)
-        if not normalized:
-            return 0.0
-        text_emb = model.encode(normalized, convert_to_tensor=True)
-        return self._sim(keyword_emb, text_emb)
+    def _text_columns(self, texts, text_index):
+        """Column of each text in the similarity vector, or -1 for empty text."""
+        columns = np.full(len(texts), -1, dtype=np.int64)
+        for i, text in enumerate(texts):
+            normalized = self._normalize_text(text)
+            if normalized:
+                columns[i] = text_index[normalized]
+        return columns
 
 
-    def _lexical_overlap_score(self, keyword_tokens, text):
-        """Simple keyword overlap score to stabilize relevance on domain terms."""
-        if not keyword_tokens:
-            return 0.0
+    def _gather(self, sims, columns):
+        """Similarity for each column, 0 where the column is -1."""
+        if sims.size == 0:
+            return np.zeros(columns.shape, dtype=np.float64)
+        return np.where(columns >= 0, sims[np.maximum(columns, 0)], 0.0)
 
-        expanded_keyword_tokens = self._expand_tokens(keyword_tokens)
-        text_tokens = self._expand_tokens(self._tokenize(text))
 
-        if not text_tokens:
-            return 0.0
+    def _title_columns(self, title_lists, text_index):
+        """
+        Candidate x MAX_PROJECT_TITLES_FOR_SCORING matrix of similarity columns,
+        padded with -1. Titles are normalized, deduplicated in order, then capped.
+        """
+        columns = np.full((len(title_lists), self.MAX_PROJECT_TITLES_FOR_SCORING), -1, dtype=np.int64)
+        for row, titles in enumerate(title_lists):
+            clean_titles = [title for title in (self._normalize_text(t) for t in titles) if title]
+            unique_titles = list(dict.fromkeys(clean_titles))[:self.MAX_PROJECT_TITLES_FOR_SCORING]
+            columns[row, :len(unique_titles)] = [text_index[title] for title in unique_titles]
+        return columns
 
-        overlap = len(expanded_keyword_tokens.intersection(text_tokens))
-        return self._clamp_score(overlap / max(1, len(expanded_keyword_tokens)))
 
+    # Softmax-weighted aggregate of the top project title scores, one row per candidate
+    def _score_project_titles(self, title_columns, sims):
+        """
+        Each row's score is the softmax-weighted mean of its top
+        TOP_PROJECT_TITLES_FOR_SCORE title similarities; rows without titles score 0.
+        """
+        if title_columns.shape[0] == 0:
+            return np.zeros(0, dtype=np.float64)
 
-    def _workload_penalty(self, active_project_count):
-        if active_project_count <= 0:
-            return 0.0
-        return min(self.MAX_WORKLOAD_PENALTY, active_project_count * 0.03)
+        valid = title_columns >= 0
+        scores = np.where(valid, self._gather(sims, title_columns), -np.inf)
+        top = -np.sort(-scores, axis=1)[:, :self.TOP_PROJECT_TITLES_FOR_SCORE]
+        top_valid = np.isfinite(top)
 
+        row_max = np.where(top_valid[:, 0], top[:, 0], 0.0)
+        exp = np.where(top_valid, np.exp(np.where(top_valid, top, 0.0) - row_max[:, None]), 0.0)
+        totals = exp.sum(axis=1)
+        weights = exp / np.where(totals > 0, totals, 1.0)[:, None]
+        aggregate = (np.where(top_valid, top, 0.0) * weights).sum(axis=1)
+        return self._clamp_array(aggregate)
 
-    # Score project titles with softmax-weighted similarity
-    def _score_project_titles(self, keyword_emb, project_titles, model):
-        """
-        Score project titles using top-k semantic matches.
-        Returns (aggregate_score, per_title_score_map).
-        """
-        clean_titles = [self._normalize_text(title) for title in project_titles if self._normalize_text(title)]
-        if not clean_titles:
-            return 0.0, {}
-
-        # Deduplicate while preserving order, and cap list size.
-        unique_titles = list(dict.fromkeys(clean_titles))[:self.MAX_PROJECT_TITLES_FOR_SCORING]
-
-        title_embs = model.encode(unique_titles, convert_to_tensor=True)
-        sim_vector = util.cos_sim(keyword_emb, title_embs)[0].tolist()
-        clamped_sims = [self._clamp_score(score) for score in sim_vector]
-        per_title_map = {
-            title: score for title, score in zip(unique_titles, clamped_sims)
-        }
 
-        top_scores = sorted(clamped_sims, reverse=True)[:self.TOP_PROJECT_TITLES_FOR_SCORE]
-        if not top_scores:
-            return 0.0, per_title_map
+    def _lexical_overlap_score(self, expanded_keyword_tokens, text_tokens):
+        """Simple keyword overlap score to stabilize relevance on domain terms."""
+        if not expanded_keyword_tokens or not text_tokens:
+            return 0.0
+
+        overlap = len(expanded_keyword_tokens.intersection(text_tokens))
+        return self._clamp_score(overlap / max(1, len(expanded_keyword_tokens)))
+
 
-        weights = self._softmax(top_scores)
-        aggregate = float(np.sum(np.array(top_scores) * weights))
-        return self._clamp_score(aggregate), per_title_map
+    def _workload_penalty(self, active_project_counts):
+        """Per-candidate penalty for ongoing projects, capped at MAX_WORKLOAD_PENALTY."""
+        counts = np.asarray(active_project_counts, dtype=np.float64)
+        return np.where(counts > 0, np.minimum(self.MAX_WORKLOAD_PENALTY, counts * 0.03), 0.0)
 
 
     # Generate team method
@@ -238,21 +286,21 @@ class AITeamGenerator:
 
         model = self._load_model()
         expanded_keyword_text, keyword_tokens = self._expand_keywords(keyword_text)
-        keyword_emb = model.encode(expanded_keyword_text, convert_to_tensor=True)
+        keyword_vec = model.encode(expanded_keyword_text, convert_to_numpy=True, normalize_embeddings=True)
+        expanded_keyword_tokens = self._expand_tokens(keyword_tokens)
 
         # ============================================================================
         # 1. Fetch Expert Users - must be is_expert=True and have an eligible role
         # ============================================================================
 
-        eligible_roles = ['FACULTY', 'PROGRAM_HEAD', 'DEAN', 'COORDINATOR', 'DIRECTOR', 'VP']
-
         users = User.objects.filter(
             is_expert=True,
-            role__in=eligible_roles,
+            role__in=self.ELIGIBLE_ROLES,
             is_confirmed=True,
             is_active=True,
         ).select_related('college__campus')
 
+        campus_id = None
         if campus_filter:
             try:
                 campus_id = int(campus_filter)
@@ -263,6 +311,16 @@ class AITeamGenerator:
         if college_filter:
             users = users.filter(college_id=college_filter)
 
+        # Only the best keyword-overlap candidates go on to project loading and scoring.
+        shortlist = self._get_lexical_index().shortlist(
+            expanded_keyword_tokens,
+            self.SHORTLIST_SIZE,
+            include_in_progress=include_in_progress,
+            campus_id=campus_id,
+            college_id=college_filter,
+        )
+        users = users.filter(id__in=shortlist)
+
 
         # ============================================================================
         # 2. Pre-fetch Projects for Users
@@ -286,17 +344,17 @@ class AITeamGenerator:
 
 
         # ============================================================================
-        # 3. Process Each User
+        # 3. Select Candidates and Collect Their Texts
         # ============================================================================
 
-        results = []
-        fallback_candidates = []
+        candidates = []
+        candidate_texts = []
 
         for user in users:
             # Deduplicate projects by ID while preserving order.
             user_projects = list({p.id: p for p in project_map.get(user.id, [])}.values())
             completed_projects = [p for p in user_projects if p.status == "COMPLETED"]
-            active_projects = [p for p in user_projects if p.status in ("IN_PROGRESS", "NOT_STARTED")]
+            active_projects = [p for p in user_projects if p.status in self.ACTIVE_PROJECT_STATUSES]
 
             # Filter: include users with ongoing projects?
             if not include_in_progress:
@@ -311,10 +369,6 @@ class AITeamGenerator:
             if len(scoring_projects) == 0:
                 continue
 
-            # Gather data
-            degree_text = (user.degree or "").strip()
-            expertise_text = (user.expertise or "").strip()
-
             completed_project_titles = [
                 p.title.strip() for p in completed_projects
                 if getattr(p, 'title', None)
@@ -329,87 +383,133 @@ class AITeamGenerator:
             else:
                 project_titles = completed_project_titles
 
-            # ========================================================================
-            # 4. Similarity Scoring
-            # ========================================================================
+            candidates.append({
+                "user": user,
+                "user_projects": user_projects,
+                "active_projects": active_projects,
+                "scoring_projects": scoring_projects,
+                "degree_text": (user.degree or "").strip(),
+                "expertise_text": (user.expertise or "").strip(),
+                "completed_project_titles": completed_project_titles,
+                "active_project_titles": active_project_titles if include_in_progress else [],
+                "project_titles": project_titles,
+            })
+            candidate_texts.extend([user.degree, user.expertise])
+            candidate_texts.extend(p.title for p in scoring_projects)
 
-            degree_score = self._semantic_score(keyword_emb, degree_text, model)
-            expertise_score = self._semantic_score(keyword_emb, expertise_text, model)
+        if not candidates:
+            return []
 
-            completed_project_score, completed_title_semantic_map = self._score_project_titles(
-                keyword_emb,
-                completed_project_titles,
-                model,
-            )
 
-            active_project_score = 0.0
-            active_title_semantic_map = {}
-            if include_in_progress and active_project_titles:
-                active_project_score, active_title_semantic_map = self._score_project_titles(
-                    keyword_emb,
-                    active_project_titles,
-                    model,
-                )
-
-            # Prioritize completed work while still considering in-progress context.
-            if completed_project_titles:
-                project_score = completed_project_score
-                if include_in_progress and active_project_titles:
-                    project_score = self._clamp_score((completed_project_score * 0.85) + (active_project_score * 0.15))
-            else:
-                project_score = self._clamp_score(active_project_score * 0.75) if include_in_progress else 0.0
+        # ============================================================================
+        # 4. Similarity Scoring - one encode batch, one matrix product, array ops
+        # ============================================================================
 
-            title_semantic_map = {}
-            title_semantic_map.update(active_title_semantic_map)
-            title_semantic_map.update(completed_title_semantic_map)
+        text_index, sims = self._similarity_vector(keyword_vec, candidate_texts, model)
 
-            lexical_context = " ".join([degree_text, expertise_text] + project_titles)
-            lexical_score = self._lexical_overlap_score(keyword_tokens, lexical_context)
+        degree_scores = self._gather(sims, self._text_columns([c["degree_text"] for c in candidates], text_index))
+        expertise_scores = self._gather(sims, self._text_columns([c["expertise_text"] for c in candidates], text_index))
+
+        completed_project_scores = self._score_project_titles(
+            self._title_columns([c["completed_project_titles"] for c in candidates], text_index),
+            sims,
+        )
+        active_project_scores = self._score_project_titles(
+            self._title_columns([c["active_project_titles"] for c in candidates], text_index),
+            sims,
+        )
 
-            # Accept if at least one core signal (degree/expertise/projects) is relevant,
-            # while still prioritizing project recency via score weights.
-            semantic_peak = max(degree_score, expertise_score, project_score)
-            profile_score = max(degree_score, expertise_score)
-            degree_signal = degree_score >= self.DEGREE_MIN_SCORE
-            expertise_signal = expertise_score >= self.EXPERTISE_MIN_SCORE
-            project_signal = project_score >= self.PROJECT_MIN_SCORE
-            has_lexical_signal = lexical_score >= self.MIN_LEXICAL_MATCH_SCORE
+        # Prioritize completed work while still considering in-progress context.
+        has_completed = np.array([bool(c["completed_project_titles"]) for c in candidates])
+        has_active = np.array([bool(c["active_project_titles"]) for c in candidates])
+        blended_project_scores = self._clamp_array((completed_project_scores * 0.85) + (active_project_scores * 0.15))
+        active_only_scores = self._clamp_array(active_project_scores * 0.75) if include_in_progress else np.zeros(len(candidates))
+        project_scores = np.where(
+            has_completed,
+            np.where(has_active, blended_project_scores, completed_project_scores),
+            active_only_scores,
+        )
 
-            if not (degree_signal or expertise_signal or project_signal):
-                continue
+        # Expanded tokens per unique text, so the union over a candidate's texts equals
+        # the expansion of their combined lexical context.
+        text_tokens_cache = {}
 
-            # If no profile signal is present, allow strong project evidence to pass.
-            if profile_score < self.PROFILE_MIN_SCORE and not project_signal:
-                continue
+        def text_tokens(text):
+            if text not in text_tokens_cache:
+                text_tokens_cache[text] = self._text_tokens(text)
+            return text_tokens_cache[text]
 
+        lexical_scores = np.array([
+            self._lexical_overlap_score(
+                expanded_keyword_tokens,
+                set().union(*(text_tokens(text) for text in [c["degree_text"], c["expertise_text"]] + c["project_titles"])),
+            )
+            for c in candidates
+        ])
+
+        # Accept if at least one core signal (degree/expertise/projects) is relevant,
+        # while still prioritizing project recency via score weights.
+        semantic_peak = np.maximum(np.maximum(degree_scores, expertise_scores), project_scores)
+        profile_scores = np.maximum(degree_scores, expertise_scores)
+        degree_signal = degree_scores >= self.DEGREE_MIN_SCORE
+        expertise_signal = expertise_scores >= self.EXPERTISE_MIN_SCORE
+        project_signal = project_scores >= self.PROJECT_MIN_SCORE
+        has_lexical_signal = lexical_scores >= self.MIN_LEXICAL_MATCH_SCORE
+
+        semantic_blend = (
+            degree_scores * self.DEGREE_WEIGHT +
+            expertise_scores * self.EXPERTISE_WEIGHT +
+            project_scores * self.PROJECT_WEIGHT
+        )
+        final_scores = semantic_blend + (lexical_scores * self.LEXICAL_WEIGHT)
+
+        if include_in_progress:
+            final_scores = final_scores - self._workload_penalty([len(c["active_projects"]) for c in candidates])
+
+        final_scores = self._clamp_array(final_scores)
+
+        accepted = (
+            (degree_signal | expertise_signal | project_signal)
+            # If no profile signal is present, allow strong project evidence to pass.
+            & ~((profile_scores < self.PROFILE_MIN_SCORE) & ~project_signal)
             # Reject ultra-weak noise that survives only because of expanded lexical terms.
-            if semantic_peak < self.FALLBACK_SEMANTIC_SCORE and not has_lexical_signal:
-                continue
+            & ~((semantic_peak < self.FALLBACK_SEMANTIC_SCORE) & ~has_lexical_signal)
+            & (final_scores >= self.FALLBACK_MIN_FINAL_SCORE)
+        )
 
-            semantic_blend = (
-                degree_score * self.DEGREE_WEIGHT +
-                expertise_score * self.EXPERTISE_WEIGHT +
-                project_score * self.PROJECT_WEIGHT
+        is_strict_match = (
+            (final_scores >= self.MIN_FINAL_SCORE) & (
+                (project_scores >= self.MIN_SEMANTIC_SCORE)
+                | (expertise_scores >= self.MIN_ANCHOR_SCORE)
+                | (degree_scores >= self.MIN_ANCHOR_SCORE)
             )
-            final_score = semantic_blend + (lexical_score * self.LEXICAL_WEIGHT)
+        )
 
-            if include_in_progress:
-                final_score -= self._workload_penalty(len(active_projects))
 
-            final_score = self._clamp_score(final_score)
-            if final_score < self.FALLBACK_MIN_FINAL_SCORE:
-                continue
+        # ============================================================================
+        # 5. Build Payloads for Accepted Candidates
+        # ============================================================================
+
+        results = []
+        fallback_candidates = []
+
+        for i in np.flatnonzero(accepted):
+            candidate = candidates[i]
+            user = candidate["user"]
+            degree_score = float(degree_scores[i])
+            expertise_score = float(expertise_scores[i])
+            project_score = float(project_scores[i])
+            lexical_score = float(lexical_scores[i])
+            final_score = float(final_scores[i])
 
             # Calculate per-project relevance scores
             project_details = []
-            for p in scoring_projects:
+            for p in candidate["scoring_projects"]:
                 if not p.title:
                     continue
                 normalized_title = self._normalize_text(p.title)
-                p_semantic = title_semantic_map.get(normalized_title)
-                if p_semantic is None:
-                    p_semantic = self._semantic_score(keyword_emb, normalized_title, model)
-                p_lexical = self._lexical_overlap_score(keyword_tokens, normalized_title)
+                p_semantic = float(sims[text_index[normalized_title]]) if normalized_title else 0.0
+                p_lexical = self._lexical_overlap_score(expanded_keyword_tokens, text_tokens(normalized_title))
                 p_score = self._clamp_score(p_semantic + (p_lexical * 0.15))
                 project_details.append({
                     "id": p.id,
@@ -429,7 +529,7 @@ class AITeamGenerator:
                 "user": user,
                 "degree": user.degree,
                 "expertise": user.expertise,
-                "project_titles": project_titles,
+                "project_titles": candidate["project_titles"],
                 "degree_score": degree_score,
                 "expertise_score": expertise_score,
                 "project_title_score": project_score,
@@ -438,8 +538,8 @@ class AITeamGenerator:
                 # Additional Information
                 "campus": user.college.campus.name if getattr(user, 'college', None) and getattr(user.college, 'campus', None) and getattr(user.college.campus, 'name', None) else None,
                 "college": user.college.name if getattr(user, 'college', None) and getattr(user.college, 'name', None) else None,
-                "total_projects": len(user_projects),
-                "ongoing_projects": len(active_projects),
+                "total_projects": len(candidate["user_projects"]),
+                "ongoing_projects": len(candidate["active_projects"]),
                 "projects": project_details,
                 # DEBUG: Weighted scores for inspection
                 "_debug_weighted_scores": {
@@ -447,7 +547,7 @@ class AITeamGenerator:
                     "expertise_score": expertise_score,
                     "project_title_score": project_score,
                     "lexical_score": lexical_score,
-                    "semantic_blend": semantic_blend,
+                    "semantic_blend": float(semantic_blend[i]),
                     "final_score": final_score,
                     "weights": {
                         "degree": self.DEGREE_WEIGHT,
@@ -458,15 +558,7 @@ class AITeamGenerator:
                 },
             }
 
-            is_strict_match = (
-                final_score >= self.MIN_FINAL_SCORE and (
-                    project_score >= self.MIN_SEMANTIC_SCORE
-                    or expertise_score >= self.MIN_ANCHOR_SCORE
-                    or degree_score >= self.MIN_ANCHOR_SCORE
-                )
-            )
-
-            if is_strict_match and final_score >= self.MIN_FINAL_SCORE:
+            if is_strict_match[i]:
                 results.append(candidate_payload)
             else:
                 fallback_candidates.append(candidate_payload)
@@ -474,10 +566,7 @@ class AITeamGenerator:
         # Sort and return top N
         ranking_key = lambda x: (x["final_score"], x["project_title_score"], x["expertise_score"], x["degree_score"])
 
-        results.sort(
-            key=lambda x: (x["final_score"], x["project_title_score"], x["expertise_score"], x["degree_score"]),
-            reverse=True,
-        )
+        results.sort(key=ranking_key, reverse=True)
         if results:
             return results[:num_participants]
 
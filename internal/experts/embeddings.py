@@ -0,0 +1,152 @@
+"""
+Persistent embedding store for the AI team generator.
+
+Degree, expertise and project title texts are embedded once, stored in
+TextEmbedding keyed by a content hash, and looked up as a matrix so a team
+search scores every candidate text with a single matrix-vector product.
+"""
+
+import hashlib
+import logging
+import re
+from collections import OrderedDict
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+
+
+def normalize_text(text):
+    """Lowercase, strip punctuation and collapse whitespace (the form that gets embedded)."""
+    if not text:
+        return ""
+    normalized = re.sub(r"[^a-z0-9\s]", " ", str(text).lower())
+    return re.sub(r"\s+", " ", normalized).strip()
+
+
+class EmbeddingStore:
+    """
+    Database-backed embedding lookup with a bounded in-process cache.
+
+    Texts are normalized before hashing. Vectors are L2-normalized float32,
+    so ``matrix @ query`` gives cosine similarities.
+    """
+
+    ENCODE_BATCH_SIZE = 64
+    MEMORY_CACHE_SIZE = 20000
+
+    def __init__(self, model_name=MODEL_NAME):
+        self.model_name = model_name
+        self._memory = OrderedDict()
+
+    def content_hash(self, text):
+        return hashlib.sha256(f"{self.model_name}\x00{text}".encode('utf-8')).hexdigest()
+
+    def _remember(self, content_hash, vector):
+        self._memory[content_hash] = vector
+        self._memory.move_to_end(content_hash)
+        while len(self._memory) > self.MEMORY_CACHE_SIZE:
+            self._memory.popitem(last=False)
+
+    def _unique_texts(self, texts):
+        return list(dict.fromkeys(t for t in (normalize_text(text) for text in texts) if t))
+
+    def missing_texts(self, texts):
+        """Return the normalized texts that have no stored embedding yet."""
+        from .models import TextEmbedding
+
+        unique = self._unique_texts(texts)
+        if not unique:
+            return []
+        hashes = {self.content_hash(text): text for text in unique}
+        unknown = [h for h in hashes if h not in self._memory]
+        if not unknown:
+            return []
+        stored = set(TextEmbedding.objects.filter(content_hash__in=unknown).values_list('content_hash', flat=True))
+        return [hashes[h] for h in unknown if h not in stored]
+
+    def get_vectors(self, texts, model):
+        """
+        Return {normalized text: vector} for the given texts.
+
+        Texts missing from memory are loaded from the database in one query;
+        texts missing from the database are encoded in one batched call and stored.
+        """
+        from .models import TextEmbedding
+
+        unique = self._unique_texts(texts)
+        vectors = {}
+        pending = {}
+        for text in unique:
+            content_hash = self.content_hash(text)
+            vector = self._memory.get(content_hash)
+            if vector is None:
+                pending[content_hash] = text
+            else:
+                vectors[text] = vector
+
+        if pending:
+            for row in TextEmbedding.objects.filter(content_hash__in=list(pending)).only('content_hash', 'vector'):
+                vector = np.frombuffer(bytes(row.vector), dtype=np.float32)
+                self._remember(row.content_hash, vector)
+                vectors[pending.pop(row.content_hash)] = vector
+
+        if pending:
+            encoded = self.encode(list(pending.values()), model)
+            rows = []
+            for (content_hash, text), vector in zip(pending.items(), encoded):
+                self._remember(content_hash, vector)
+                vectors[text] = vector
+                rows.append(TextEmbedding(
+                    content_hash=content_hash,
+                    model_name=self.model_name,
+                    text=text,
+                    dimensions=vector.shape[0],
+                    vector=vector.tobytes(),
+                ))
+            try:
+                TextEmbedding.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+            except Exception as e:
+                logger.warning(f"Could not persist {len(rows)} embeddings: {e}")
+
+        return vectors
+
+    def get_matrix(self, texts, model):
+        """
+        Return (texts, matrix) where row i of the float32 matrix is the embedding of texts[i].
+        """
+        unique = self._unique_texts(texts)
+        vectors = self.get_vectors(unique, model)
+        if not unique:
+            return [], np.zeros((0, 0), dtype=np.float32)
+        return unique, np.vstack([vectors[text] for text in unique])
+
+    def encode(self, texts, model):
+        """Encode texts in one batched call, returning L2-normalized float32 rows."""
+        return model.encode(
+            texts,
+            batch_size=self.ENCODE_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        ).astype(np.float32)
+
+    def refresh(self, texts, model):
+        """Make sure every given text has a stored embedding. Returns the number newly encoded."""
+        missing = self.missing_texts(texts)
+        if missing:
+            self.get_vectors(missing, model)
+        return len(missing)
+
+
+# Singleton Instance
+_store = None
+
+def get_embedding_store():
+    global _store
+    if _store is None:
+        _store = EmbeddingStore()
+    return _store
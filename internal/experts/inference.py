@@ -0,0 +1,108 @@
+"""
+Inference service for AI team generation.
+
+With AI_INFERENCE_MODE = 'celery', web workers never load the SentenceTransformer:
+searches are sent to a dedicated Celery queue served by one worker that keeps the
+model warm, and the ranked candidates come back as plain data. With 'local'
+(development), the generator runs inside the web process.
+"""
+
+import logging
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceBusy(Exception):
+    """The inference queue already holds AI_INFERENCE_MAX_QUEUE pending searches."""
+
+
+class InferenceTimeout(Exception):
+    """The inference worker did not answer within AI_INFERENCE_TIMEOUT seconds."""
+
+
+def warm_up(refresh_embeddings=False):
+    """
+    Load the model once, apply the CPU thread limit and run a first encode,
+    so the first real search does not pay the load cost.
+    """
+    from .ai_team_generator import get_team_generator
+
+    threads = getattr(settings, 'AI_INFERENCE_THREADS', None)
+    if threads:
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+
+    model = get_team_generator()._load_model()
+    model.encode("warm up", show_progress_bar=False)
+
+    if refresh_embeddings:
+        from .tasks import refresh_text_embeddings
+        refresh_text_embeddings()
+
+    return model
+
+
+def run_team_query(keywords, include_in_progress=False, campus_filter=None, college_filter=None, num_participants=5):
+    """
+    Run a team search in this process and return JSON-serializable candidates
+    (every generator field except the ``user`` instance).
+    """
+    from .ai_team_generator import get_team_generator
+
+    team_members = get_team_generator().generate_team(
+        keywords=keywords,
+        include_in_progress=include_in_progress,
+        campus_filter=campus_filter,
+        college_filter=college_filter,
+        num_participants=num_participants,
+    )
+    return [{key: value for key, value in member.items() if key != 'user'} for member in team_members]
+
+
+def inference_queue_depth():
+    """Number of searches waiting in the inference queue (0 if the broker cannot tell)."""
+    from WBPMISUESO.celery import app
+
+    try:
+        with app.connection_for_read() as connection:
+            return connection.default_channel.queue_declare(
+                queue=settings.AI_INFERENCE_QUEUE, passive=True
+            ).message_count
+    except Exception:
+        return 0
+
+
+def generate_team(**params):
+    """
+    Generate a team through the configured inference mode.
+
+    Raises:
+        InferenceBusy: The bounded inference queue is full
+        InferenceTimeout: No answer within AI_INFERENCE_TIMEOUT seconds
+    """
+    if settings.AI_INFERENCE_MODE != 'celery':
+        return run_team_query(**params)
+
+    from celery.exceptions import TimeoutError as CeleryTimeoutError
+    from .tasks import generate_team_task
+
+    if inference_queue_depth() >= settings.AI_INFERENCE_MAX_QUEUE:
+        raise InferenceBusy()
+
+    timeout = settings.AI_INFERENCE_TIMEOUT
+    # Searches nobody is waiting for anymore are dropped instead of run.
+    result = generate_team_task.apply_async(kwargs=params, queue=settings.AI_INFERENCE_QUEUE, expires=timeout)
+    try:
+        return result.get(timeout=timeout)
+    except CeleryTimeoutError:
+        result.revoke()
+        logger.warning(f"Team generation timed out after {timeout}s for keywords: {params.get('keywords')}")
+        raise InferenceTimeout()
+    finally:
+        result.forget()
@@ -0,0 +1,164 @@
+"""
+Inverted token index over expert profiles for AI team generation.
+
+Maps every expanded token of an eligible expert's degree, expertise and project
+titles to the experts who have it, and keeps the statuses of each expert's
+projects. A search ranks the candidates that pass the project filters by
+keyword overlap from the postings alone and hands a bounded shortlist to the
+semantic scoring stage, so work per query depends on the shortlist size, not
+faculty headcount.
+"""
+
+import heapq
+import time
+from collections import Counter
+
+from django.core.cache import cache
+
+
+INDEX_VERSION_KEY = 'experts:lexical_index_version'
+
+
+def bump_index_version():
+    """Mark every process's index stale (called when profiles or projects change)."""
+    try:
+        cache.incr(INDEX_VERSION_KEY)
+    except ValueError:
+        cache.set(INDEX_VERSION_KEY, 1, None)
+    except Exception:
+        # Cache unavailable: indexes fall back to MAX_AGE expiry.
+        pass
+
+
+class ExpertLexicalIndex:
+    """
+    Process-level token -> expert index, rebuilt when the shared version key
+    changes (or after MAX_AGE seconds when the cache cannot be reached).
+    """
+
+    MAX_AGE = 300
+
+    def __init__(self, generator):
+        self.generator = generator
+        self.postings = {}
+        self.experts = {}
+        self.project_statuses = {}
+        self.version = None
+        self.built_at = None
+
+    def _current_version(self):
+        try:
+            return cache.get(INDEX_VERSION_KEY, 0)
+        except Exception:
+            return None
+
+    def ensure_fresh(self):
+        version = self._current_version()
+        stale = (
+            self.built_at is None
+            or version != self.version
+            or (version is None and time.monotonic() - self.built_at > self.MAX_AGE)
+        )
+        if stale:
+            self.build(version)
+
+    def build(self, version=None):
+        """Index every eligible expert's degree, expertise and project title tokens and project statuses."""
+        from shared.projects.models import Project
+        from system.users.models import User
+
+        generator = self.generator
+        experts = {}
+        expert_tokens = {}
+        for user_id, degree, expertise, college_id, campus_id in User.objects.filter(
+            is_expert=True,
+            role__in=generator.ELIGIBLE_ROLES,
+            is_confirmed=True,
+            is_active=True,
+        ).order_by('id').values_list('id', 'degree', 'expertise', 'college_id', 'college__campus_id'):
+            experts[user_id] = (college_id, campus_id)
+            expert_tokens[user_id] = generator._text_tokens(degree) | generator._text_tokens(expertise)
+
+        title_tokens = {}
+        project_titles = {}
+        project_status = {}
+        project_statuses = {}
+        for project_id, title, status, leader_id in Project.objects.values_list(
+            'id', 'title', 'status', 'project_leader_id',
+        ):
+            project_titles[project_id] = title
+            project_status[project_id] = status
+            if leader_id in expert_tokens:
+                expert_tokens[leader_id] |= self._title_tokens(title, title_tokens)
+                project_statuses.setdefault(leader_id, set()).add(status)
+
+        for project_id, user_id in Project.providers.through.objects.filter(
+            user_id__in=list(experts),
+        ).values_list('project_id', 'user_id'):
+            expert_tokens[user_id] |= self._title_tokens(project_titles.get(project_id), title_tokens)
+            project_statuses.setdefault(user_id, set()).add(project_status.get(project_id))
+
+        postings = {}
+        for user_id, tokens in expert_tokens.items():
+            for token in tokens:
+                postings.setdefault(token, []).append(user_id)
+
+        self.postings = postings
+        self.experts = experts
+        self.project_statuses = project_statuses
+        self.version = version
+        self.built_at = time.monotonic()
+
+    def _title_tokens(self, title, title_tokens):
+        if title not in title_tokens:
+            title_tokens[title] = self.generator._text_tokens(title)
+        return title_tokens[title]
+
+    def shortlist(self, keyword_tokens, limit, include_in_progress=False, campus_id=None, college_id=None):
+        """
+        Return up to ``limit`` expert IDs ranked by how many keyword tokens their
+        profile shares. If fewer experts overlap, the rest are filled in ID order
+        so small populations are scored in full.
+
+        Experts the scoring stage would drop are filtered out before ranking, so
+        they do not take shortlist places: experts without projects, and unless
+        ``include_in_progress``, experts with active projects or no completed one.
+        """
+        self.ensure_fresh()
+
+        try:
+            college_id = int(college_id) if college_id else None
+        except (TypeError, ValueError):
+            college_id = None
+
+        def eligible(user_id):
+            expert_college_id, expert_campus_id = self.experts[user_id]
+            if campus_id is not None and expert_campus_id != campus_id:
+                return False
+            if college_id is not None and expert_college_id != college_id:
+                return False
+            statuses = self.project_statuses.get(user_id)
+            if not statuses:
+                return False
+            if not include_in_progress:
+                return 'COMPLETED' in statuses and statuses.isdisjoint(active_statuses)
+            return True
+
+        active_statuses = self.generator.ACTIVE_PROJECT_STATUSES
+        overlap = Counter()
+        for token in keyword_tokens:
+            overlap.update(self.postings.get(token, ()))
+
+        ranked = heapq.nlargest(
+            limit,
+            (user_id for user_id in overlap if eligible(user_id)),
+            key=overlap.__getitem__,
+        )
+        if len(ranked) < limit:
+            matched = set(ranked)
+            for user_id in self.experts:
+                if len(ranked) >= limit:
+                    break
+                if user_id not in matched and eligible(user_id):
+                    ranked.append(user_id)
+        return ranked
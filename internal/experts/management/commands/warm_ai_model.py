@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Load the AI team generation model and embed expert texts so the first search is fast"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--worker',
+            action='store_true',
+            help='Send the warm-up to the inference worker queue instead of running it here',
+        )
+        parser.add_argument(
+            '--skip-embeddings',
+            action='store_true',
+            help='Only load the model, do not embed new degree, expertise and project title texts',
+        )
+
+    def handle(self, *args, **options):
+        if options['worker']:
+            from internal.experts.tasks import warm_up_inference_worker
+            warm_up_inference_worker.apply_async(queue=settings.AI_INFERENCE_QUEUE)
+            self.stdout.write(self.style.SUCCESS(f'✓ Warm-up sent to the {settings.AI_INFERENCE_QUEUE} queue.'))
+            return
+
+        from internal.experts.inference import warm_up
+
+        self.stdout.write(f'Loading AI model (threads: {settings.AI_INFERENCE_THREADS})...')
+        try:
+            warm_up(refresh_embeddings=not options['skip_embeddings'])
+            self.stdout.write(self.style.SUCCESS('✓ AI model loaded and warmed up.'))
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'Failed to warm up AI model: {e}'))
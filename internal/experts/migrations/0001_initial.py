@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TextEmbedding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('model_name', models.CharField(max_length=100)),
+                ('text', models.TextField()),
+                ('dimensions', models.PositiveIntegerField()),
+                ('vector', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Text Embedding',
+                'verbose_name_plural': 'Text Embeddings',
+            },
+        ),
+    ]
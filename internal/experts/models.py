@@ -1,3 +1,92 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
 
-# Create your models here.
+from shared.projects.models import Project
+from system.users.models import User
+
+
+class TextEmbedding(models.Model):
+    """
+    Sentence embedding of a normalized text used by the AI team generator.
+
+    Rows are keyed by a hash of the model name and the normalized text, so every
+    degree, expertise or project title with the same content shares one vector.
+    Vectors are stored L2-normalized as float32 bytes, so cosine similarity is a dot product.
+    """
+    content_hash = models.CharField(max_length=64, unique=True)
+    model_name = models.CharField(max_length=100)
+    text = models.TextField()
+    dimensions = models.PositiveIntegerField()
+    vector = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Text Embedding'
+        verbose_name_plural = 'Text Embeddings'
+
+    def __str__(self):
+        return f"{self.model_name}: {self.text[:50]}"
+
+
+def _queue_embedding_refresh(texts):
+    """Queue embedding of any texts that are not stored yet, once the transaction commits."""
+    from .embeddings import get_embedding_store
+
+    missing = get_embedding_store().missing_texts(texts)
+    if not missing:
+        return
+
+    def enqueue():
+        from .tasks import refresh_text_embeddings
+        try:
+            refresh_text_embeddings.apply_async(args=[missing], retry=False)
+        except Exception:
+            # Broker unavailable: the daily refresh or the next search will embed them.
+            pass
+
+    transaction.on_commit(enqueue)
+
+
+def _queue_lexical_index_rebuild():
+    """Mark the expert lexical index stale once the transaction commits."""
+    from .lexical_index import bump_index_version
+    transaction.on_commit(bump_index_version)
+
+
+# User fields that change what the lexical index holds for an expert
+LEXICAL_INDEX_USER_FIELDS = {'degree', 'expertise', 'role', 'is_expert', 'is_confirmed', 'is_active', 'college'}
+
+
+@receiver(post_save, sender=User)
+def refresh_user_search_data(sender, instance, update_fields=None, **kwargs):
+    """Embed a user's degree and expertise and re-index them when their profile changes."""
+    if update_fields is not None and not LEXICAL_INDEX_USER_FIELDS & set(update_fields):
+        return
+    _queue_lexical_index_rebuild()
+    if update_fields is not None and not {'degree', 'expertise'} & set(update_fields):
+        return
+    _queue_embedding_refresh([instance.degree, instance.expertise])
+
+
+@receiver(post_save, sender=Project)
+def refresh_project_search_data(sender, instance, update_fields=None, **kwargs):
+    """Embed a project's title and re-index it when it changes."""
+    if update_fields is not None and not {'title', 'project_leader', 'status'} & set(update_fields):
+        return
+    _queue_lexical_index_rebuild()
+    if update_fields is not None and 'title' not in update_fields:
+        return
+    _queue_embedding_refresh([instance.title])
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Project)
+def remove_from_lexical_index(sender, instance, **kwargs):
+    _queue_lexical_index_rebuild()
+
+
+@receiver(m2m_changed, sender=Project.providers.through)
+def reindex_project_providers(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        _queue_lexical_index_rebuild()
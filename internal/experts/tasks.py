@@ -0,0 +1,55 @@
+from celery.signals import worker_ready
+from django.conf import settings
+
+from WBPMISUESO.celery import app
+
+
+@app.task(ignore_result=True)
+def refresh_text_embeddings(texts=None):
+    """
+    Embed degree, expertise and project title texts for the AI team generator.
+    With no texts, backfills every expert profile and project title.
+    """
+    from .ai_team_generator import get_team_generator
+    from .embeddings import get_embedding_store
+    from shared.projects.models import Project
+    from system.users.models import User
+
+    if texts is None:
+        texts = []
+        for degree, expertise in User.objects.filter(is_expert=True).values_list('degree', 'expertise'):
+            texts.extend([degree, expertise])
+        texts.extend(Project.objects.values_list('title', flat=True))
+
+    model = get_team_generator()._load_model()
+    return get_embedding_store().refresh(texts, model)
+
+
+@app.task
+def generate_team_task(**params):
+    """Run a team search on the inference worker and return the ranked candidates."""
+    from .inference import run_team_query
+    return run_team_query(**params)
+
+
+@app.task(ignore_result=True)
+def warm_up_inference_worker():
+    """Load the model and embed any new texts on the inference worker."""
+    from .inference import warm_up
+    warm_up(refresh_embeddings=True)
+
+
+@worker_ready.connect
+def preload_inference_model(**kwargs):
+    """
+    Load the model as soon as the inference worker starts (AI_INFERENCE_WORKER=True),
+    so no search waits for it. Run that worker with --pool=solo so this process serves the tasks.
+    """
+    if not getattr(settings, 'AI_INFERENCE_WORKER', False):
+        return
+    try:
+        from .inference import warm_up
+        warm_up(refresh_embeddings=True)
+        print("✓ AI team generation model loaded.")
+    except Exception as e:
+        print(f"✗ Failed to preload AI team generation model: {e}")
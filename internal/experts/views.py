@@ -296,25 +296,31 @@ def generate_team_view(request):
             except ValueError:
                 college_filter = None
         
-        from .ai_team_generator import get_team_generator
-
-        # Generate Team
-        generator = get_team_generator()
-        team_members = generator.generate_team(
-            keywords=keywords,
-            campus_filter=campus_filter,
-            college_filter=college_filter,
-            num_participants=num_participants,
-            include_in_progress=include_in_progress
-        )
-        
+        from .inference import InferenceBusy, InferenceTimeout, generate_team
+
+        # Generate Team (on the inference worker in deployment, see AI_INFERENCE_MODE)
+        try:
+            team_members = generate_team(
+                keywords=keywords,
+                campus_filter=campus_filter,
+                college_filter=college_filter,
+                num_participants=num_participants,
+                include_in_progress=include_in_progress
+            )
+        except InferenceBusy:
+            return JsonResponse({'success': False, 'error': 'AI Team Generation is busy. Please try again in a moment.'}, status=503)
+        except InferenceTimeout:
+            return JsonResponse({'success': False, 'error': 'AI Team Generation took too long. Please try again.'}, status=504)
+
+        members_by_id = User.objects.in_bulk([member['id'] for member in team_members])
 
         # Format Response
         results = []
         for member in team_members:
             profile_pic_url = None
-            if member.get('user') and member['user'].profile_picture:
-                profile_pic_url = member['user'].profile_picture.url
+            member_user = members_by_id.get(member['id'])
+            if member_user and member_user.profile_picture:
+                profile_pic_url = member_user.profile_picture.url
 
             results.append({
                 'id': member['id'],
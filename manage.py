@@ -6,7 +6,8 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'WBPMISUESO.settings')
+    default_settings = 'WBPMISUESO.settings_test' if sys.argv[1:2] == ['test'] else 'WBPMISUESO.settings'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', default_settings)
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
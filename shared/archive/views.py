@@ -1,6 +1,5 @@
 from django.shortcuts import render
 from django.views import View
-from django.http import HttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.generics import ListAPIView
@@ -16,8 +15,7 @@ from system.users.decorators import role_required
 from .serializers import ProjectSerializer, ProjectAggregationSerializer
 from drf_spectacular.utils import extend_schema
 from django.utils import timezone
-from io import BytesIO
-import openpyxl
+from system.exports.xlsx import new_workbook, append_table, iterate, workbook_response
 
 class CustomPagination(PageNumberPagination):
     """Standard pagination class for API list views."""
@@ -329,27 +327,10 @@ def export_archive_projects(request):
     if order == 'desc':
         sort_field = f'-{sort_field}'
 
-    queryset = queryset.order_by(sort_field).distinct()
+    queryset = queryset.select_related('project_leader__college', 'agenda').order_by(sort_field).distinct()
 
-    serializer = ProjectSerializer(queryset, many=True)
-    rows = serializer.data
-
-    workbook = openpyxl.Workbook()
-    worksheet = workbook.active
-    worksheet.title = 'Archive Export'
-
-    worksheet.append([
-        'Name',
-        'Project Leader (College)',
-        'Start Date',
-        'End Date',
-        'Progress',
-        'Trainees',
-        'Status',
-        'Further Action/s',
-    ])
-
-    for item in rows:
+    def archive_row(project):
+        item = ProjectSerializer(project).data
         leader = item.get('project_leader') or {}
         leader_name = leader.get('full_name') or 'N/A'
         college = (leader.get('college') or {}).get('name')
@@ -361,7 +342,7 @@ def export_archive_projects(request):
         else:
             further_actions_text = str(further_actions)
 
-        worksheet.append([
+        return [
             item.get('title') or '',
             leader_with_college,
             item.get('start_date') or 'N/A',
@@ -370,26 +351,19 @@ def export_archive_projects(request):
             item.get('estimated_trainees') or 0,
             item.get('status') or '',
             further_actions_text,
-        ])
-
-    # Autosize columns for readability.
-    for column_cells in worksheet.columns:
-        max_length = 0
-        column_letter = column_cells[0].column_letter
-        for cell in column_cells:
-            value = '' if cell.value is None else str(cell.value)
-            if len(value) > max_length:
-                max_length = len(value)
-        worksheet.column_dimensions[column_letter].width = min(max_length + 2, 60)
-
-    output = BytesIO()
-    workbook.save(output)
-    output.seek(0)
-
-    response = HttpResponse(
-        output.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
+        ]
+
+    workbook = new_workbook()
+    append_table(workbook, 'Archive Export', [
+        'Name',
+        'Project Leader (College)',
+        'Start Date',
+        'End Date',
+        'Progress',
+        'Trainees',
+        'Status',
+        'Further Action/s',
+    ], (archive_row(project) for project in iterate(queryset)), wrap_text=False)
+
     filename = timezone.now().strftime('archive_export_%Y%m%d_%H%M%S.xlsx')
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    return response
\ No newline at end of file
+    return workbook_response(workbook, filename)
\ No newline at end of file
@@ -1,32 +1,65 @@
-from datetime import date
+import threading
+from datetime import date, datetime
 import holidays as pyholidays
 
 
+# Years on either side of the current year shown by the calendar's year selector
+CALENDAR_YEAR_WINDOW = 10
+
+# Process-level holiday table: {year: {date: {'name': str, 'type': str}}}
+_holiday_table = {}
+_holiday_table_lock = threading.Lock()
+
+
+def _classify_holiday(name):
+    """Infer 'regular' or 'special' from the holiday name."""
+    # Not perfect, but matches the old fixed/movable holiday lists
+    lower_name = name.lower()
+    if 'special' in lower_name or 'chinese' in lower_name or 'black saturday' in lower_name or 'all saints' in lower_name or 'all souls' in lower_name or 'immaculate' in lower_name or 'eve' in lower_name:
+        return 'special'
+    return 'regular'
+
+
+def _build_years(years):
+    """Build and store the holiday table for every missing year in one library call."""
+    with _holiday_table_lock:
+        missing = [year for year in years if year not in _holiday_table]
+        if not missing:
+            return
+        built = {year: {} for year in missing}
+        for d, name in sorted(pyholidays.PH(years=missing).items()):
+            if d.year in built:
+                built[d.year][d] = {'name': name, 'type': _classify_holiday(name)}
+        _holiday_table.update(built)
+
+
+def preload_philippine_holidays():
+    """Build the holiday table for the calendar's whole year window."""
+    current_year = datetime.now().year
+    _build_years(range(current_year - CALENDAR_YEAR_WINDOW, current_year + CALENDAR_YEAR_WINDOW + 1))
+
+
 def get_philippine_holidays(year=None):
     """
     Returns a dictionary of Philippine holidays for the given year.
-    If no year is specified, returns holidays for the current year and next year.
-    
+    If no year is specified, returns holidays for the current year.
+
+    Holidays are computed once per process and year; the returned dictionary
+    is shared, so callers must not modify it.
+
     Returns:
         dict: {date: {'name': str, 'type': str}}
               type can be 'regular' or 'special'
     """
     if year is None:
-        from datetime import datetime
         year = datetime.now().year
 
-    # Use the holidays library for PH holidays
-    ph_holidays = pyholidays.PH(years=year)
-    holidays = {}
-    for d, name in ph_holidays.items():
-        # Try to infer type from name (not perfect, but matches your old logic)
-        lower_name = name.lower()
-        if 'special' in lower_name or 'chinese' in lower_name or 'black saturday' in lower_name or 'all saints' in lower_name or 'all souls' in lower_name or 'immaculate' in lower_name or 'eve' in lower_name:
-            htype = 'special'
-        else:
-            htype = 'regular'
-        holidays[d] = {'name': name, 'type': htype}
-    return holidays
+    if year not in _holiday_table:
+        if not _holiday_table:
+            # First use: build the calendar's year window in one pass
+            preload_philippine_holidays()
+        _build_years([year])
+    return _holiday_table[year]
 
 
 def _get_fixed_holidays(year):
@@ -49,8 +82,7 @@ def is_philippine_holiday(check_date):
     Returns:
         dict or None: Holiday info if it's a holiday, None otherwise
     """
-    holidays = get_philippine_holidays(check_date.year)
-    return holidays.get(check_date)
+    return get_philippine_holidays(check_date.year).get(check_date)
 
 
 def get_holiday_name(check_date):
@@ -78,10 +110,9 @@ def get_holidays_in_month(year, month):
     Returns:
         dict: {date: {'name': str, 'type': str}}
     """
-    all_holidays = get_philippine_holidays(year)
     return {
-        d: info for d, info in all_holidays.items()
-        if d.year == year and d.month == month
+        d: info for d, info in get_philippine_holidays(year).items()
+        if d.month == month
     }
 
 
@@ -97,13 +128,12 @@ def get_holidays_in_range(start_date, end_date):
         dict: {date: {'name': str, 'type': str}}
     """
     holidays = {}
-    
+
     # Get holidays for all years in the range
     for year in range(start_date.year, end_date.year + 1):
-        year_holidays = get_philippine_holidays(year)
         holidays.update({
-            d: info for d, info in year_holidays.items()
+            d: info for d, info in get_philippine_holidays(year).items()
             if start_date <= d <= end_date
         })
-    
+
     return holidays
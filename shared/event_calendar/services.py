@@ -1,3 +1,4 @@
+import hashlib
 import pytz
 from datetime import datetime, date as date_class, timedelta
 import logging
@@ -6,7 +7,7 @@ from django.db import models
 from .models import MeetingEvent
 from system.users.models import User
 from shared.projects.models import ProjectEvent, Project
-from .holidays import get_philippine_holidays
+from .holidays import CALENDAR_YEAR_WINDOW, get_holidays_in_range, is_philippine_holiday
 
 logger = logging.getLogger(__name__)
 
@@ -21,44 +22,113 @@ def format_time_12hour(dt):
     display_hour = 12 if hour == 0 or hour == 12 else (hour % 12)
     return f"{display_hour}:{minute:02d} {period}"
 
-def get_events_by_date(user, for_main_calendar_view=False, include_holidays=True):
+def get_calendar_window(year=None, years=CALENDAR_YEAR_WINDOW):
+    """Return (start_date, end_date) spanning ``years`` years either side of the given year."""
+    if year is None:
+        year = datetime.now().year
+    return date_class(year - years, 1, 1), date_class(year + years, 12, 31)
+
+def get_visible_calendar_querysets(user):
     """
-    Fetches MeetingEvents, ProjectEvents, and Philippine holidays formatted for the calendar.
+    Return (meetings_qs, activities_qs) the user may see in the calendar.
     Filters based on user role for consistent security across all user types.
-    
-    Args:
-        user: The requesting user
-        for_main_calendar_view: Deprecated - kept for backward compatibility, no longer used
-        include_holidays: If True, includes Philippine holidays in the calendar
-    
-    Returns:
-        dict: Events grouped by date {date_str: [event_dict, ...]}
     """
-    events_qs = MeetingEvent.objects.none()
-    project_events_qs = ProjectEvent.objects.select_related('project').none()
-
-    # Apply role-based filtering for all requests to ensure consistent security
-    # All user types see events filtered by their role permissions
     user_role = getattr(user, 'role', None)
     if user_role in ['UESO', 'VP', 'DIRECTOR']:
-        events_qs = MeetingEvent.objects.all()
-        project_events_qs = ProjectEvent.objects.select_related('project').filter(placeholder=False)
+        meetings_qs = MeetingEvent.objects.all()
+        activities_qs = ProjectEvent.objects.filter(placeholder=False)
     elif user_role in ['PROGRAM_HEAD', 'DEAN', 'COORDINATOR']:
-        events_qs = MeetingEvent.objects.filter(participants=user)
-        project_events_qs = ProjectEvent.objects.select_related('project').filter(
+        meetings_qs = MeetingEvent.objects.filter(participants=user)
+        activities_qs = ProjectEvent.objects.filter(
             project__project_leader__college=user.college,
             placeholder=False
         )
     elif user_role in ['FACULTY', 'IMPLEMENTER']:
-        events_qs = MeetingEvent.objects.filter(participants=user)
-        project_events_qs = ProjectEvent.objects.select_related('project').filter(
+        meetings_qs = MeetingEvent.objects.filter(participants=user)
+        activities_qs = ProjectEvent.objects.filter(
             (models.Q(project__project_leader=user) |
             models.Q(project__providers=user)),
             placeholder=False
         )
     else:
-        events_qs = MeetingEvent.objects.none()
-        project_events_qs = ProjectEvent.objects.select_related('project').none()
+        meetings_qs = MeetingEvent.objects.none()
+        activities_qs = ProjectEvent.objects.none()
+    return meetings_qs, activities_qs
+
+def _filter_window(queryset, start_date=None, end_date=None):
+    """Limit an event queryset to local (Asia/Manila) dates between start_date and end_date inclusive."""
+    local_tz = pytz.timezone("Asia/Manila")
+    if start_date:
+        queryset = queryset.filter(datetime__gte=local_tz.localize(datetime.combine(start_date, datetime.min.time())))
+    if end_date:
+        queryset = queryset.filter(datetime__lt=local_tz.localize(datetime.combine(end_date + timedelta(days=1), datetime.min.time())))
+    return queryset
+
+def get_calendar_version(user, start_date=None, end_date=None):
+    """
+    Return (etag, last_modified) for the user's calendar window, computed with
+    four aggregate queries so unchanged windows can be answered with 304.
+
+    Participant and provider changes do not touch updated_at, so the count and
+    highest id of their m2m rows in the window are part of the ETag as well.
+    They cannot move Last-Modified, which browsers only use without an ETag.
+    """
+    meetings_qs, activities_qs = get_visible_calendar_querysets(user)
+    meetings_qs = _filter_window(meetings_qs, start_date, end_date)
+    activities_qs = _filter_window(activities_qs, start_date, end_date)
+    meetings = meetings_qs.aggregate(
+        count=models.Count('id', distinct=True),
+        latest=models.Max('updated_at'),
+    )
+    activities = activities_qs.aggregate(
+        count=models.Count('id', distinct=True),
+        latest=models.Max('updated_at'),
+        project_latest=models.Max('project__updated_at'),
+    )
+    participants = MeetingEvent.participants.through.objects.filter(
+        meetingevent__in=meetings_qs.values('id'),
+    ).aggregate(count=models.Count('id'), last_id=models.Max('id'))
+    providers = Project.providers.through.objects.filter(
+        project__in=activities_qs.values('project_id'),
+    ).aggregate(count=models.Count('id'), last_id=models.Max('id'))
+    changes = [meetings['latest'], activities['latest'], activities['project_latest']]
+    last_modified = max((dt for dt in changes if dt), default=None)
+
+    fingerprint = '|'.join(str(part) for part in (
+        getattr(user, 'id', None), getattr(user, 'role', None), start_date, end_date,
+        meetings['count'], activities['count'], *changes,
+        participants['count'], participants['last_id'], providers['count'], providers['last_id'],
+    ))
+    etag = hashlib.md5(fingerprint.encode('utf-8')).hexdigest()
+    return etag, last_modified
+
+def get_events_by_date(user, for_main_calendar_view=False, include_holidays=True, start_date=None, end_date=None):
+    """
+    Fetches MeetingEvents, ProjectEvents, and Philippine holidays formatted for the calendar.
+    Filters based on user role for consistent security across all user types.
+    
+    Args:
+        user: The requesting user
+        for_main_calendar_view: Deprecated - kept for backward compatibility, no longer used
+        include_holidays: If True, includes Philippine holidays in the calendar
+        start_date, end_date: Visible window (inclusive). Without them every event is returned
+            and holidays cover the year selector range.
+    
+    Returns:
+        dict: Events grouped by date {date_str: [event_dict, ...]}
+    """
+    meetings_qs, activities_qs = get_visible_calendar_querysets(user)
+
+    # Participants, leaders and providers are loaded in a fixed number of queries
+    people = User.objects.only('id', 'username', 'given_name', 'middle_initial', 'last_name', 'suffix')
+    events_qs = _filter_window(meetings_qs, start_date, end_date).prefetch_related(
+        models.Prefetch('participants', queryset=people),
+    )
+    project_events_qs = _filter_window(activities_qs, start_date, end_date).select_related(
+        'project__project_leader',
+    ).prefetch_related(
+        models.Prefetch('project__providers', queryset=people),
+    )
 
     events_by_date = {}
 
@@ -73,7 +143,8 @@ def get_events_by_date(user, for_main_calendar_view=False, include_holidays=True
         if event.end_datetime:
             end_local_dt = timezone.localtime(event.end_datetime)
             end_time_str = end_local_dt.strftime('%H:%M')
-        
+
+        participants = event.participants.all()
         event_data = {
             'id': event.id,
             'type': 'meeting',
@@ -87,9 +158,9 @@ def get_events_by_date(user, for_main_calendar_view=False, include_holidays=True
             'notes_attachment': event.notes_attachment.url if event.notes_attachment else None,
             'notes_attachment_name': event.notes_attachment.name.split('/')[-1] if event.notes_attachment else None,
             'status': event.status,
-            'participants': [str(u.id) for u in event.participants.all()],
-            'participant_names': [u.get_full_name() or u.username for u in event.participants.all()],
-            'created_by': str(event.created_by.id) if event.created_by else None,
+            'participants': [str(u.id) for u in participants],
+            'participant_names': [u.get_full_name() or u.username for u in participants],
+            'created_by': str(event.created_by_id) if event.created_by_id else None,
         }
         
         events_by_date[date_str].append(event_data)
@@ -118,34 +189,30 @@ def get_events_by_date(user, for_main_calendar_view=False, include_holidays=True
     
     # Add Philippine holidays
     if include_holidays:
-        # Include a broader year window to match the year selector UX
-        current_year = datetime.now().year
-
-        for year in range(current_year - 10, current_year + 11):
-            holidays = get_philippine_holidays(year)
-            for holiday_date, holiday_info in holidays.items():
-                date_str = holiday_date.strftime('%Y-%m-%d')
-                if date_str not in events_by_date:
-                    events_by_date[date_str] = []
-                
-                # Add holiday as a special event type
-                events_by_date[date_str].append({
-                    'id': f'holiday-{date_str}',
-                    'type': 'holiday',
-                    'title': holiday_info['name'],
-                    'description': f"Philippine {holiday_info['type'].capitalize()} Holiday",
-                    'date': date_str,
-                    'time': '00:00',
-                    'holiday_type': holiday_info['type'],  # 'regular' or 'special'
-                    'is_holiday': True,
-                })
+        default_start, default_end = get_calendar_window()
+        holidays = get_holidays_in_range(start_date or default_start, end_date or default_end)
+        for holiday_date, holiday_info in holidays.items():
+            date_str = holiday_date.strftime('%Y-%m-%d')
+            if date_str not in events_by_date:
+                events_by_date[date_str] = []
+
+            # Add holiday as a special event type
+            events_by_date[date_str].append({
+                'id': f'holiday-{date_str}',
+                'type': 'holiday',
+                'title': holiday_info['name'],
+                'description': f"Philippine {holiday_info['type'].capitalize()} Holiday",
+                'date': date_str,
+                'time': '00:00',
+                'holiday_type': holiday_info['type'],  # 'regular' or 'special'
+                'is_holiday': True,
+            })
         
     return events_by_date
 
 
 def _get_holiday_info(target_date: date_class):
-    holidays = get_philippine_holidays(target_date.year)
-    return holidays.get(target_date)
+    return is_philippine_holiday(target_date)
 
 def _parse_and_localize_datetime(date_str, time_str):
     """Helper to parse date/time and localize to Asia/Manila."""
@@ -193,27 +260,8 @@ def get_datetime_conflict(user, target_datetime, exclude_project_event_id=None):
             ),
         }
 
-    user_role = getattr(user, 'role', None)
-
     # Apply calendar visibility rules per role.
-    if user_role in ['UESO', 'VP', 'DIRECTOR']:
-        meetings_qs = MeetingEvent.objects.all()
-        activities_qs = ProjectEvent.objects.select_related('project').filter(placeholder=False)
-    elif user_role in ['PROGRAM_HEAD', 'DEAN', 'COORDINATOR']:
-        meetings_qs = MeetingEvent.objects.filter(participants=user)
-        activities_qs = ProjectEvent.objects.select_related('project').filter(
-            project__project_leader__college=user.college,
-            placeholder=False,
-        )
-    elif user_role in ['FACULTY', 'IMPLEMENTER']:
-        meetings_qs = MeetingEvent.objects.filter(participants=user)
-        activities_qs = ProjectEvent.objects.select_related('project').filter(
-            (models.Q(project__project_leader=user) | models.Q(project__providers=user)),
-            placeholder=False,
-        )
-    else:
-        meetings_qs = MeetingEvent.objects.none()
-        activities_qs = ProjectEvent.objects.select_related('project').none()
+    meetings_qs, activities_qs = get_visible_calendar_querysets(user)
 
     # 2) Meeting overlap (point-in-time overlaps with meeting duration).
     meetings_qs = meetings_qs.filter(datetime__date=target_datetime.date())
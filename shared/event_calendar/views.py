@@ -12,12 +12,18 @@ from django.db.models import Q
 from system.api.permissions import TieredAPIPermission
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 import pytz
 from datetime import datetime
 
 from . import services
 
 
+# Largest window the calendar endpoint serves at once (a six-week month grid)
+MAX_CALENDAR_WINDOW_DAYS = 42
+
+
 def get_templates(request):
     user_role = getattr(request.user, 'role', None)
     if user_role in ["VP", "DIRECTOR", "UESO", "PROGRAM_HEAD", "DEAN", "COORDINATOR"]:
@@ -98,8 +104,43 @@ def validate_datetime_conflict(request):
 @require_http_methods(["GET", "POST"])
 def meeting_event_list(request):
     if request.method == "GET":
-        events_by_date = services.get_events_by_date(request.user, for_main_calendar_view=False)
-        return JsonResponse(events_by_date)
+        # Visible window (?start=YYYY-MM-DD&end=YYYY-MM-DD): only that range is serialized,
+        # and unchanged windows are answered with 304 via ETag / Last-Modified.
+        try:
+            start_date = datetime.strptime(request.GET['start'], '%Y-%m-%d').date() if request.GET.get('start') else None
+            end_date = datetime.strptime(request.GET['end'], '%Y-%m-%d').date() if request.GET.get('end') else None
+        except ValueError:
+            return JsonResponse({'error': 'Invalid date range. Use YYYY-MM-DD.'}, status=400)
+
+        if not (start_date and end_date):
+            events_by_date = services.get_events_by_date(
+                request.user,
+                for_main_calendar_view=False,
+                start_date=start_date,
+                end_date=end_date,
+            )
+            return JsonResponse(events_by_date)
+
+        if end_date < start_date or (end_date - start_date).days >= MAX_CALENDAR_WINDOW_DAYS:
+            return JsonResponse({'error': f'Date range must span 1 to {MAX_CALENDAR_WINDOW_DAYS} days.'}, status=400)
+
+        etag, last_modified = services.get_calendar_version(request.user, start_date, end_date)
+        etag = quote_etag(etag)
+        last_modified = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = JsonResponse(services.get_events_by_date(
+                request.user,
+                for_main_calendar_view=False,
+                start_date=start_date,
+                end_date=end_date,
+            ))
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        # Browsers revalidate on every fetch; private keeps it out of the shared page cache
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
         
     elif request.method == "POST":
         try:
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Store file_size for project documents uploaded before sizes were saved
+    with the document. Each file is stat'ed on storage once; documents whose
+    file is missing are left empty and reported.
+    It is safe to run multiple times; documents with a size are skipped.
+    """
+
+    help = "Backfill stored file sizes for project documents."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Documents updated per query (default 500)')
+
+    def handle(self, *args, **options):
+        from shared.projects.models import ProjectDocument
+
+        batch_size = options['batch_size']
+        documents = ProjectDocument.objects.filter(file_size__isnull=True).exclude(file='').only('id', 'file')
+
+        updated = 0
+        missing = 0
+        batch = []
+        for document in documents.iterator(chunk_size=batch_size):
+            try:
+                document.file_size = document.file.size
+            except (OSError, ValueError):
+                missing += 1
+                continue
+            batch.append(document)
+            if len(batch) >= batch_size:
+                updated += ProjectDocument.objects.bulk_update(batch, ['file_size'])
+                batch = []
+        if batch:
+            updated += ProjectDocument.objects.bulk_update(batch, ['file_size'])
+
+        self.stdout.write(self.style.SUCCESS(f"✓ Stored sizes for {updated} document(s)"))
+        if missing:
+            self.stdout.write(self.style.WARNING(f"⊙ {missing} document(s) have no file on storage"))
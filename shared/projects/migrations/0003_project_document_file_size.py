@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectdocument',
+            name='file_size',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, help_text='File size in bytes, stored on save', null=True),
+        ),
+    ]
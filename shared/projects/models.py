@@ -50,6 +50,14 @@ class ProjectDocument(models.Model):
 			ext = os.path.splitext(self.file.name)[1].lower()
 			self.file_type = ext[1:] if ext else ''
 
+			# Store the size once (read from the upload itself for new files)
+			# so listings and the API never stat storage
+			if not self.file._committed or self.file_size is None:
+				try:
+					self.file_size = self.file.size
+				except (OSError, ValueError):
+					self.file_size = None
+
 			# Generate thumbnail for images and PDFs
 			try:
 				from PIL import Image
@@ -93,6 +101,7 @@ class ProjectDocument(models.Model):
 	document_type = models.CharField(max_length=12, choices=DOCUMENT_TYPE_CHOICES)
 	uploaded_at = models.DateTimeField(auto_now_add=True)
 	description = models.CharField(max_length=255, blank=True)
+	file_size = models.PositiveBigIntegerField(null=True, blank=True, editable=False, help_text="File size in bytes, stored on save")
 
 	class Meta:
 		indexes = [
@@ -111,6 +120,8 @@ class ProjectDocument(models.Model):
 
 	@property
 	def size(self):
+		if self.file_size is not None:
+			return f"{self.file_size / (1024 * 1024):.1f} MB"
 		if self.file and hasattr(self.file, 'size'):
 			mb = self.file.size / (1024 * 1024)
 			return f"{mb:.1f} MB"
@@ -279,18 +290,99 @@ class Project(models.Model):
 	def __init__(self, *args, **kwargs):
 		super().__init__(*args, **kwargs)
 		self._old_status = self.status
+		self._old_project_leader_id = self.project_leader_id
 
 	def save(self, *args, **kwargs):
-		# Store old status for signal
+		# Store old status and leader for signals
 		if self.pk:
 			try:
 				old_instance = Project.objects.get(pk=self.pk)
 				self._old_status = old_instance.status
+				self._old_project_leader_id = old_instance.project_leader_id
 			except Project.DoesNotExist:
 				self._old_status = None
+				self._old_project_leader_id = None
 		super().save(*args, **kwargs)
 
 
+# Log details for project status changes
+PROJECT_STATUS_MESSAGES = {
+	'NOT_STARTED': 'Project has not started yet',
+	'IN_PROGRESS': 'Project is currently in progress',
+	'COMPLETED': 'Project has been completed',
+	'ON_HOLD': 'Project is on hold',
+	'CANCELLED': 'Project has been cancelled',
+}
+
+
+def return_unspent_budget(project, user=None):
+	"""
+	Record that a completed project's unspent budget is returned to UESO for realignment.
+	Called when a project moves to COMPLETED (by save or by the scheduler's bulk transition).
+	"""
+	remaining = project.remaining_budget
+	if remaining and remaining > 0:
+		try:
+			from shared.budget.models import BudgetPool, CollegeBudget, BudgetHistory
+			from decimal import Decimal
+
+			# Determine fiscal year from project start_date
+			fiscal_year = str(project.start_date.year) if project.start_date else None
+
+			college_budget = None
+			if getattr(project.project_leader, 'college', None) and fiscal_year:
+				college_budget = CollegeBudget.objects.filter(
+					college=project.project_leader.college,
+					fiscal_year=fiscal_year,
+					status='ACTIVE',
+				).first()
+
+			# Adjust college allocation: remove remaining funds from the college "cut"
+			if college_budget:
+				original_total = college_budget.total_assigned or Decimal('0')
+				if original_total >= remaining:
+					college_budget.total_assigned = original_total - remaining
+				else:
+					college_budget.total_assigned = Decimal('0')
+				college_budget.save(update_fields=['total_assigned', 'updated_at'])
+
+				# Log the return in budget history, linked to the college budget
+				BudgetHistory.objects.create(
+					college_budget=college_budget,
+					action='ADJUSTED',
+					amount=remaining,
+					description=(
+						f"Returned unspent project budget to UESO for realignment. "
+						f"Project: {project.title} (ID {project.id})."
+					),
+					user=user,
+				)
+			else:
+				# Even without a college budget record, track the return in history
+				BudgetHistory.objects.create(
+					college_budget=None,
+					action='ADJUSTED',
+					amount=remaining,
+					description=(
+						f"Returned unspent project budget to UESO for realignment (no CollegeBudget record). "
+						f"Project: {project.title} (ID {project.id})."
+					),
+					user=user,
+				)
+
+			# Optionally, increase the central annual pool so UESO can realign funds
+			if fiscal_year:
+				pool, _ = BudgetPool.objects.get_or_create(
+					fiscal_year=fiscal_year,
+					defaults={'total_available': Decimal('0')},
+				)
+				pool.total_available = (pool.total_available or Decimal('0')) + remaining
+				pool.save(update_fields=['total_available', 'updated_at'])
+		except Exception:
+			# Budget tracking issues must not break project save / logging
+			pass
+
+
 # Log creation and update actions for Project
 # NOTE: Imports moved to top for organization
 @receiver(post_save, sender=Project)
@@ -303,80 +395,13 @@ def log_project_action(sender, instance, created, **kwargs):
 	if created:
 		details = f"A new project has been created"
 	else:
-		status_messages = {
-			'NOT_STARTED': 'Project has not started yet',
-			'IN_PROGRESS': 'Project is currently in progress',
-			'COMPLETED': 'Project has been completed',
-			'ON_HOLD': 'Project is on hold',
-			'CANCELLED': 'Project has been cancelled',
-		}
-		details = status_messages.get(instance.status, f"Project Status: {instance.get_status_display()}")
+		details = PROJECT_STATUS_MESSAGES.get(instance.status, f"Project Status: {instance.get_status_display()}")
 
 	# If a project just moved to COMPLETED and still has remaining budget,
 	# record that the unspent amount is returned to UESO for realignment.
 	if not created and hasattr(instance, '_old_status') and instance._old_status != instance.status:
 		if instance.status == 'COMPLETED':
-			remaining = instance.remaining_budget
-			if remaining and remaining > 0:
-				try:
-					from shared.budget.models import BudgetPool, CollegeBudget, BudgetHistory
-					from decimal import Decimal
-
-					# Determine fiscal year from project start_date
-					fiscal_year = str(instance.start_date.year) if instance.start_date else None
-
-					college_budget = None
-					if getattr(instance.project_leader, 'college', None) and fiscal_year:
-						college_budget = CollegeBudget.objects.filter(
-							college=instance.project_leader.college,
-							fiscal_year=fiscal_year,
-							status='ACTIVE',
-						).first()
-
-					# Adjust college allocation: remove remaining funds from the college "cut"
-					if college_budget:
-						original_total = college_budget.total_assigned or Decimal('0')
-						if original_total >= remaining:
-							college_budget.total_assigned = original_total - remaining
-						else:
-							college_budget.total_assigned = Decimal('0')
-						college_budget.save(update_fields=['total_assigned', 'updated_at'])
-
-						# Log the return in budget history, linked to the college budget
-						BudgetHistory.objects.create(
-							college_budget=college_budget,
-							action='ADJUSTED',
-							amount=remaining,
-							description=(
-								f"Returned unspent project budget to UESO for realignment. "
-								f"Project: {instance.title} (ID {instance.id})."
-							),
-							user=user,
-						)
-					else:
-						# Even without a college budget record, track the return in history
-						BudgetHistory.objects.create(
-							college_budget=None,
-							action='ADJUSTED',
-							amount=remaining,
-							description=(
-								f"Returned unspent project budget to UESO for realignment (no CollegeBudget record). "
-								f"Project: {instance.title} (ID {instance.id})."
-							),
-							user=user,
-						)
-
-					# Optionally, increase the central annual pool so UESO can realign funds
-					if fiscal_year:
-						pool, _ = BudgetPool.objects.get_or_create(
-							fiscal_year=fiscal_year,
-							defaults={'total_available': Decimal('0')},
-						)
-						pool.total_available = (pool.total_available or Decimal('0')) + remaining
-						pool.save(update_fields=['total_available', 'updated_at'])
-				except Exception:
-					# Budget tracking issues must not break project save / logging
-					pass
+			return_unspent_budget(instance, user)
 
 	# Only log creation if created
 	if created:
@@ -446,6 +471,48 @@ def log_project_provider_added(sender, instance, action, pk_set, **kwargs):
 			except User.DoesNotExist:
 				pass
 
+# --- Incremental expert status (see system.scheduler.scheduler.update_user_expert_status) ---
+
+@receiver(post_save, sender=Project)
+def refresh_leader_expert_status(sender, instance, created, **kwargs):
+	"""Re-evaluate the expert flag of the old and new leader when a project's leader changes."""
+	if created or instance._old_project_leader_id != instance.project_leader_id:
+		from system.scheduler.scheduler import queue_expert_status_refresh
+		queue_expert_status_refresh([instance._old_project_leader_id, instance.project_leader_id])
+		instance._old_project_leader_id = instance.project_leader_id
+
+
+@receiver(pre_delete, sender=Project)
+def remember_project_members(sender, instance, **kwargs):
+	"""Capture the team before the cascade removes provider rows (no m2m_changed is sent)."""
+	instance._expert_status_user_ids = [instance.project_leader_id] + list(
+		instance.providers.values_list('id', flat=True)
+	)
+
+
+@receiver(post_delete, sender=Project)
+def refresh_members_expert_status(sender, instance, **kwargs):
+	from system.scheduler.scheduler import queue_expert_status_refresh
+	queue_expert_status_refresh(getattr(instance, '_expert_status_user_ids', [instance.project_leader_id]))
+
+
+@receiver(m2m_changed, sender=Project.providers.through)
+def refresh_providers_expert_status(sender, instance, action, reverse, pk_set, **kwargs):
+	"""Re-evaluate the expert flag of providers added to or removed from a project."""
+	from system.scheduler.scheduler import queue_expert_status_refresh
+
+	if action == 'pre_clear':
+		# pk_set is not sent on clear, so remember who is being removed
+		if reverse:
+			instance._expert_status_user_ids = [instance.pk]
+		else:
+			instance._expert_status_user_ids = list(instance.providers.values_list('id', flat=True))
+	elif action == 'post_clear':
+		queue_expert_status_refresh(getattr(instance, '_expert_status_user_ids', []))
+	elif action in ('post_add', 'post_remove') and pk_set:
+		# Reverse side (user.member_projects) sends project IDs; the affected user is the instance
+		queue_expert_status_refresh([instance.pk] if reverse else pk_set)
+
 #############################################################################################################################################################################################################
 
 def project_expense_upload_to(instance, filename):
@@ -0,0 +1,64 @@
+/**
+ * Live Notification Badge
+ * Keeps the notification bell badges current from the server-sent event stream
+ * instead of polling. The stream URL comes from the script tag's data-stream-url
+ * (NOTIFICATION_STREAM_URL, with a token when the stream has its own host).
+ * New notifications are also re-dispatched on document as a 'notification:new'
+ * CustomEvent for pages that list them.
+ */
+
+(function() {
+    'use strict';
+
+    if (!window.EventSource) {
+        return;
+    }
+
+    const script = document.currentScript;
+    const STREAM_URL = (script && script.dataset.streamUrl) || '/notifications/stream/';
+    const BADGE_STYLE = 'position:absolute;top:-5px;right:-5px;background:#FF3300;color:white;border-radius:50%;width:20px;height:20px;display:flex;align-items:center;justify-content:center;font-size:10px;font-weight:bold;border:2px solid white;box-shadow:0 2px 4px rgba(0,0,0,0.2);';
+
+    /**
+     * Show the unread count on every bell (sidebar topbar and navbars)
+     */
+    function setUnreadCount(count) {
+        document.querySelectorAll('[data-notification-bell]').forEach(function(bell) {
+            let badge = bell.querySelector('[data-unread-badge]');
+            if (count > 0) {
+                if (!badge) {
+                    badge = document.createElement('span');
+                    badge.setAttribute('data-unread-badge', '');
+                    badge.setAttribute('style', BADGE_STYLE);
+                    bell.appendChild(badge);
+                }
+                badge.textContent = count;
+            } else if (badge) {
+                badge.remove();
+            }
+        });
+    }
+
+    function connect() {
+        const source = new EventSource(STREAM_URL);
+
+        source.addEventListener('unread', function(event) {
+            setUnreadCount(JSON.parse(event.data).count);
+        });
+
+        source.addEventListener('notification', function(event) {
+            document.dispatchEvent(new CustomEvent('notification:new', { detail: JSON.parse(event.data) }));
+        });
+
+        // EventSource reconnects by itself (server sends the retry delay);
+        // stop only when the page is being unloaded
+        window.addEventListener('pagehide', function() {
+            source.close();
+        });
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', connect);
+    } else {
+        connect();
+    }
+})();
@@ -0,0 +1,157 @@
+"""
+API key verification shared by APIKeyUserAuthentication and TieredAPIPermission.
+
+A key is verified against its hash once; the result (connection, tier and user)
+is kept for API_KEY_CACHE_SECONDS in Redis and API_KEY_LOCAL_CACHE_SECONDS in
+the process, keyed by the key's public prefix. A cached entry only matches a
+key whose HMAC-SHA256 (keyed with SECRET_KEY) equals the stored digest,
+compared in constant time. Saving or deleting an APIConnection or APIKey drops
+its entry, so disconnects and tier changes apply on the next request (within
+the local TTL on other processes). Within one request the result is memoized
+on the request.
+"""
+
+import hashlib
+import hmac
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_local = {}
+_local_lock = threading.Lock()
+
+# Memoized on the HttpRequest; False records "no valid key" so it is not retried
+REQUEST_ATTRIBUTE = '_api_key_credentials'
+
+
+@dataclass(frozen=True)
+class APIKeyCredentials:
+    """What an API key grants: the ACTIVE connection it belongs to, its tier and owner."""
+    api_key_id: str
+    connection_id: int
+    tier: str
+    user_id: Optional[int]
+    expiry_date: Optional[object] = None
+
+    @property
+    def has_expired(self):
+        return self.expiry_date is not None and self.expiry_date < timezone.now()
+
+
+def key_digest(key):
+    return hmac.new(settings.SECRET_KEY.encode(), key.encode(), hashlib.sha256).hexdigest()
+
+
+def cache_key(prefix):
+    return f'api_key_auth_{prefix}'
+
+
+def get_key_from_request(request):
+    """The API key from 'Authorization: Api-Key <key>' or the X-Api-Key header."""
+    authorization = request.META.get('HTTP_AUTHORIZATION', '')
+    if authorization.startswith('Api-Key '):
+        return authorization[len('Api-Key '):].strip() or None
+    return request.META.get('HTTP_X_API_KEY') or None
+
+
+def _cached(prefix, digest):
+    now = time.monotonic()
+    with _local_lock:
+        entry = _local.get(prefix)
+    if entry is not None and entry[0] > now:
+        stored_digest, credentials = entry[1]
+    else:
+        try:
+            stored = cache.get(cache_key(prefix))
+        except Exception as exc:
+            logger.warning("API key cache unavailable: %s", exc)
+            stored = None
+        if stored is None:
+            return None
+        stored_digest, credentials = stored
+        with _local_lock:
+            _local[prefix] = (now + settings.API_KEY_LOCAL_CACHE_SECONDS, stored)
+
+    if not hmac.compare_digest(stored_digest, digest):
+        return None
+    return credentials
+
+
+def _store(prefix, digest, credentials):
+    entry = (digest, credentials)
+    with _local_lock:
+        _local[prefix] = (time.monotonic() + settings.API_KEY_LOCAL_CACHE_SECONDS, entry)
+    try:
+        cache.set(cache_key(prefix), entry, settings.API_KEY_CACHE_SECONDS)
+    except Exception as exc:
+        logger.warning("API key cache unavailable: %s", exc)
+
+
+def verify_api_key(key):
+    """
+    Return the APIKeyCredentials for a valid, unrevoked key of an ACTIVE
+    connection, or None.
+    """
+    from rest_framework_api_key.models import APIKey
+    from system.settings.models import APIConnection
+
+    prefix, _, _ = key.partition('.')
+    digest = key_digest(key)
+    credentials = _cached(prefix, digest)
+    if credentials is None:
+        try:
+            api_key = APIKey.objects.get_from_key(key)
+        except APIKey.DoesNotExist:
+            return None
+        connection = APIConnection.objects.filter(api_key=api_key, status='ACTIVE').values(
+            'id', 'tier', 'requested_by_id'
+        ).first()
+        if connection is None:
+            return None
+        credentials = APIKeyCredentials(
+            api_key_id=api_key.id,
+            connection_id=connection['id'],
+            tier=connection['tier'],
+            user_id=connection['requested_by_id'],
+            expiry_date=api_key.expiry_date,
+        )
+        _store(prefix, digest, credentials)
+
+    if credentials.has_expired:
+        return None
+    return credentials
+
+
+def get_request_credentials(request):
+    """
+    Verify the request's API key once and memoize the result on the request,
+    so authentication and permission checks share one verification.
+    """
+    http_request = getattr(request, '_request', request)
+    credentials = getattr(http_request, REQUEST_ATTRIBUTE, None)
+    if credentials is None:
+        key = get_key_from_request(http_request)
+        credentials = (verify_api_key(key) if key else None) or False
+        setattr(http_request, REQUEST_ATTRIBUTE, credentials)
+    return credentials or None
+
+
+def revoke_cached_key(api_key_id):
+    """Drop the cached verification for an APIKey (its id is '<prefix>.<hash>')."""
+    if not api_key_id:
+        return
+    prefix = api_key_id.partition('.')[0]
+    with _local_lock:
+        _local.pop(prefix, None)
+    try:
+        cache.delete(cache_key(prefix))
+    except Exception as exc:
+        logger.warning("API key cache entry for %s not dropped: %s", prefix, exc)
@@ -0,0 +1,33 @@
+import time
+
+from system.api.keys import REQUEST_ATTRIBUTE as CREDENTIALS_ATTRIBUTE
+from system.api.ratelimit import REQUEST_ATTRIBUTE as RATE_LIMIT_ATTRIBUTE
+from system.api.usage import record_request
+
+
+class APIUsageMiddleware:
+    """
+    Meters requests made with an API key and adds the RateLimit-* headers set
+    by APIConnectionRateThrottle. Other requests pass through untouched.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.monotonic()
+        response = self.get_response(request)
+
+        credentials = getattr(request, CREDENTIALS_ATTRIBUTE, None)
+        if not credentials:
+            return response
+
+        rate_limit = getattr(request, RATE_LIMIT_ATTRIBUTE, None)
+        if rate_limit is not None:
+            for header, value in rate_limit.headers().items():
+                response[header] = value
+
+        match = request.resolver_match
+        endpoint = f"{request.method} /{match.route}" if match and match.route else f"{request.method} {request.path}"
+        record_request(credentials.connection_id, endpoint, response.status_code, (time.monotonic() - started) * 1000)
+        return response
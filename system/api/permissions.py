@@ -1,6 +1,5 @@
 from rest_framework import permissions
-from system.settings.models import APIConnection
-from rest_framework_api_key.models import APIKey
+from system.api.keys import get_request_credentials
 
 class TieredAPIPermission(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -8,21 +7,12 @@ class TieredAPIPermission(permissions.BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
 
-        # 2. Check API Key (Tier)
-        key = request.META.get("HTTP_X_API_KEY")
-        if not key:
+        # 2. Check API Key (Tier), verified once per request and cached
+        credentials = get_request_credentials(request)
+        if credentials is None:
             return False
 
-        try:
-            api_key = APIKey.objects.get_from_key(key)
-            if not api_key:
-                return False
-                
-            conn = APIConnection.objects.get(api_key=api_key, status='ACTIVE')
-        except (APIConnection.DoesNotExist, APIKey.DoesNotExist):
-            return False
-
-        tier = conn.tier
+        tier = credentials.tier
         method = request.method
         path = request.path
         
@@ -0,0 +1,121 @@
+"""
+Token-bucket rate limiting for API key connections.
+
+Each APIConnection gets a bucket in Redis sized by its tier
+(API_RATE_LIMITS, requests per minute, which is also the burst size). A Lua
+script refills and takes a token in one EVALSHA round trip, so concurrent
+workers see a consistent bucket. Requests without an API key (session and
+token users of the web app) are not limited here.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+from system.api.keys import get_request_credentials
+from system.utils.cache_utils import _get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] bucket hash; ARGV: capacity, refill rate (tokens/s), now (s)
+# Returns: allowed (0/1), tokens left, seconds until full, seconds until the next token
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+local wait = 0
+if allowed == 0 then
+    wait = math.ceil((1 - tokens) / rate)
+end
+return {allowed, math.floor(tokens), math.ceil((capacity - tokens) / rate), wait}
+"""
+
+# Rate limit state for the response headers, memoized on the HttpRequest
+REQUEST_ATTRIBUTE = '_api_rate_limit'
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: int
+    retry_after: int
+
+    def headers(self):
+        """IETF RateLimit header fields (draft-ietf-httpapi-ratelimit-headers)."""
+        headers = {
+            'RateLimit-Limit': str(self.limit),
+            'RateLimit-Remaining': str(self.remaining),
+            'RateLimit-Reset': str(self.reset),
+            'RateLimit-Policy': f'{self.limit};w=60',
+        }
+        if not self.allowed:
+            headers['Retry-After'] = str(self.retry_after)
+        return headers
+
+
+def bucket_key(connection_id, tier):
+    return f'api_ratelimit:{connection_id}:{tier}'
+
+
+def consume(connection_id, tier):
+    """
+    Take one token from the connection's bucket.
+
+    Returns:
+        RateLimitResult, or None when the tier is unlimited or Redis is unavailable
+    """
+    limit = settings.API_RATE_LIMITS.get(tier)
+    if not limit:
+        return None
+    client = _get_redis_client()
+    if client is None:
+        return None
+
+    rate = limit / 60.0
+    try:
+        allowed, remaining, reset, wait = client.register_script(TOKEN_BUCKET_LUA)(
+            keys=[bucket_key(connection_id, tier)], args=[limit, rate, f'{time.time():.6f}'],
+        )
+    except Exception as exc:
+        # Fail open: an unavailable limiter must not take the API down
+        logger.warning("API rate limiter unavailable: %s", exc)
+        return None
+    return RateLimitResult(bool(allowed), limit, int(remaining), int(reset), max(int(wait), 1))
+
+
+class APIConnectionRateThrottle(BaseThrottle):
+    """
+    DRF throttle for requests made with an API key, limited per connection and tier.
+    The result is kept on the request so APIUsageMiddleware can send RateLimit-* headers.
+    """
+
+    def allow_request(self, request, view):
+        credentials = get_request_credentials(request)
+        if credentials is None:
+            return True
+
+        result = consume(credentials.connection_id, credentials.tier)
+        if result is None:
+            return True
+        setattr(request._request, REQUEST_ATTRIBUTE, result)
+        self.result = result
+        return result.allowed
+
+    def wait(self):
+        return self.result.retry_after
@@ -0,0 +1,125 @@
+"""
+API usage metering per connection and endpoint.
+
+APIUsageMiddleware records each API-key request in one Redis pipeline:
+request and status-class counts, summed latency, and a latency histogram.
+All of them are fields of one hash per UTC day,
+``api_usage:<YYYY-MM-DD>``, named ``<connection id>|<endpoint>|<metric>``.
+Days expire after API_USAGE_RETENTION_DAYS. get_usage_report aggregates
+them for the usage page in system settings.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from system.utils.cache_utils import _get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; slower requests land in 'inf'
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def usage_key(day):
+    return f'api_usage:{day.isoformat()}'
+
+
+def latency_bucket(elapsed_ms):
+    for bound in LATENCY_BUCKETS_MS:
+        if elapsed_ms <= bound:
+            return str(bound)
+    return 'inf'
+
+
+def record_request(connection_id, endpoint, status_code, elapsed_ms):
+    """Count one request, in a single pipelined round trip."""
+    client = _get_redis_client()
+    if client is None:
+        return
+    key = usage_key(timezone.now().date())
+    field = f'{connection_id}|{endpoint}|'
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.hincrby(key, field + 'count', 1)
+        pipe.hincrby(key, field + f'{status_code // 100}xx', 1)
+        if status_code == 429:
+            pipe.hincrby(key, field + 'throttled', 1)
+        pipe.hincrbyfloat(key, field + 'ms', round(elapsed_ms, 3))
+        pipe.hincrby(key, field + 'le_' + latency_bucket(elapsed_ms), 1)
+        pipe.expire(key, settings.API_USAGE_RETENTION_DAYS * 24 * 60 * 60)
+        pipe.execute()
+    except Exception as exc:
+        logger.warning("API usage not recorded: %s", exc)
+
+
+def _percentile(histogram, count, fraction):
+    """Upper bound (ms) of the bucket holding the given fraction of requests."""
+    target = fraction * count
+    seen = 0
+    for bound in LATENCY_BUCKETS_MS + ('inf',):
+        seen += histogram.get(str(bound), 0)
+        if seen >= target:
+            return bound
+    return 'inf'
+
+
+def get_usage_report(days=7):
+    """
+    Usage over the last ``days`` days, one row per connection and endpoint,
+    busiest first.
+
+    Returns:
+        list: dicts with connection_id, endpoint, requests, throttled, errors
+              (4xx/5xx), avg_ms, p50_ms, p95_ms and histogram
+    """
+    client = _get_redis_client()
+    if client is None:
+        return []
+
+    today = timezone.now().date()
+    pipe = client.pipeline(transaction=False)
+    for offset in range(days):
+        pipe.hgetall(usage_key(today - timedelta(days=offset)))
+    try:
+        day_hashes = pipe.execute()
+    except Exception as exc:
+        logger.warning("API usage unavailable: %s", exc)
+        return []
+
+    rows = {}
+    for fields in day_hashes:
+        for field, value in fields.items():
+            connection_id, endpoint, metric = field.decode().rsplit('|', 2)
+            row = rows.setdefault((connection_id, endpoint), {
+                'connection_id': int(connection_id), 'endpoint': endpoint,
+                'count': 0, 'throttled': 0, 'ms': 0.0, 'histogram': {}, 'statuses': {},
+            })
+            if metric == 'ms':
+                row['ms'] += float(value)
+            elif metric.startswith('le_'):
+                bucket = metric[3:]
+                row['histogram'][bucket] = row['histogram'].get(bucket, 0) + int(value)
+            elif metric.endswith('xx'):
+                row['statuses'][metric] = row['statuses'].get(metric, 0) + int(value)
+            else:
+                row[metric] += int(value)
+
+    report = []
+    for row in rows.values():
+        count = row['count']
+        report.append({
+            'connection_id': row['connection_id'],
+            'endpoint': row['endpoint'],
+            'requests': count,
+            'throttled': row['throttled'],
+            'errors': row['statuses'].get('4xx', 0) + row['statuses'].get('5xx', 0),
+            'avg_ms': round(row['ms'] / count, 1) if count else None,
+            'p50_ms': _percentile(row['histogram'], count, 0.5) if count else None,
+            'p95_ms': _percentile(row['histogram'], count, 0.95) if count else None,
+            'histogram': [(str(bound), row['histogram'].get(str(bound), 0)) for bound in LATENCY_BUCKETS_MS + ('inf',)],
+        })
+    report.sort(key=lambda item: item['requests'], reverse=True)
+    return report
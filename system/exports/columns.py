@@ -0,0 +1,57 @@
+"""Columns of the XLSX exports, shared by direct exports and approved export requests."""
+
+
+MANAGE_USER_HEADERS = [
+    'Last Name', 'Given Name', 'Middle Initial', 'Suffix', 'Email', 'Role', 'Verified', 'Date Joined', 'College', 'Campus'
+]
+
+
+def manage_user_row(u):
+    return [
+        u.last_name,
+        u.given_name,
+        u.middle_initial,
+        u.suffix,
+        u.email,
+        u.get_role_display() if hasattr(u, 'get_role_display') else getattr(u, 'role', ''),
+        u.is_confirmed,
+        u.date_joined.strftime('%Y-%m-%d %H:%M'),
+        str(getattr(u, 'college', '')),
+        u.get_campus_display() if hasattr(u, 'get_campus_display') else getattr(u, 'campus', ''),
+    ]
+
+
+PROJECT_HEADERS = [
+    'Title', 'Leader', 'College/Unit', 'Last Updated', 'Start Date', 'Progress', 'Status'
+]
+
+
+def project_row(p):
+    return [
+        p.title,
+        p.project_leader.get_full_name() if p.project_leader else '',
+        p.project_leader.college.name if p.project_leader and p.project_leader.college else '',
+        p.updated_at.strftime('%Y-%m-%d') if p.updated_at else '',
+        p.start_date.strftime('%Y-%m-%d') if p.start_date else '',
+        getattr(p, 'progress_display', ''),
+        p.get_status_display() if hasattr(p, 'get_status_display') else p.status,
+    ]
+
+
+LOG_HEADERS = [
+    'User', 'User Email', 'Action', 'Model', 'Object ID', 'Object Repr', 'Timestamp', 'Details', 'URL'
+]
+
+
+def log_row(log):
+    return [
+        log.user.get_full_name() if log.user else '-',
+        log.user.email if log.user and log.user.email else '-',
+        log.get_action_display(),
+        log.model,
+        log.object_id,
+        log.object_repr,
+        log.timestamp.strftime('%Y-%m-%d %H:%M:%S') if log.timestamp else '',
+        log.details,
+        log.url,
+    ]
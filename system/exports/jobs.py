@@ -0,0 +1,318 @@
+"""
+Export jobs for approved export requests.
+
+Approving an ExportRequest queues generate_export_artifact, which re-applies
+the request's saved filters, writes the workbook and stores it on the
+request as its artifact, together with size, row count and SHA-256.
+Progress is written as the rows are produced, so export_status can report
+it while the job runs. export_download then serves the stored file.
+
+Job fields are written with queryset updates, so progress does not create
+a log entry (and a notification) for every step. Updates fire no signals,
+so each one evicts the cached pages tagged with the request itself.
+
+Every write also renews the job's lease (job_heartbeat_at). A job queued
+or running without a write for EXPORT_JOB_LEASE_SECONDS is considered
+dead (its worker stopped mid-job, or the task was lost) and is queued
+again by the next approve or download.
+"""
+
+import hashlib
+import logging
+import tempfile
+from datetime import timedelta
+from urllib.parse import parse_qs
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from shared.projects.models import Project
+from system.users.models import User
+from system.utils.cache_utils import invalidate_cache_tags, tags_for_instance
+from .columns import MANAGE_USER_HEADERS, manage_user_row, PROJECT_HEADERS, project_row
+from .models import ExportRequest
+from .xlsx import new_workbook, append_table, iterate, save_workbook
+
+logger = logging.getLogger(__name__)
+
+# Export type -> (sheet title, headers, row builder, download file name)
+EXPORT_SPECS = {
+    'MANAGE_USER': ("Manage Users", MANAGE_USER_HEADERS, manage_user_row, 'manage_users_export.xlsx'),
+    'PROJECT': ("Projects", PROJECT_HEADERS, project_row, 'projects_export.xlsx'),
+}
+
+# Progress is saved each time it advances by this many percent
+PROGRESS_STEP = 5
+
+
+# ==============================================================================
+# Records of a request (the filters of the page it was submitted from)
+# ==============================================================================
+
+def _requested_users(qs, submitter):
+    users = User.objects.select_related('college', 'college__campus').all()
+    search = qs.get('search', [''])[0].strip()
+    if search:
+        users = users.filter(
+            Q(given_name__icontains=search) |
+            Q(last_name__icontains=search) |
+            Q(middle_initial__icontains=search) |
+            Q(suffix__icontains=search) |
+            Q(email__icontains=search)
+        )
+    sort_by = qs.get('sort_by', ['date'])[0]
+    order = qs.get('order', ['desc'])[0]
+    role = qs.get('role', [''])[0]
+    verified = qs.get('verified', [''])[0]
+    date = qs.get('date', [''])[0]
+    college = qs.get('college', [''])[0]
+    campus = qs.get('campus', [''])[0]
+
+    # Auto-filter by submitter's college if they have restricted role
+    if submitter.role in ['PROGRAM_HEAD', 'DEAN', 'COORDINATOR'] and submitter.college:
+        college = str(submitter.college.id)
+
+    if role:
+        users = users.filter(role=role)
+    if verified == 'true':
+        users = users.filter(is_confirmed=True)
+    elif verified == 'false':
+        users = users.filter(is_confirmed=False)
+    if date:
+        users = users.filter(date_joined__date=date)
+    if college:
+        users = users.filter(college_id=college)
+    if campus:
+        users = users.filter(college__campus_id=campus)
+    if sort_by == 'name':
+        sort_field = ['last_name', 'given_name', 'middle_initial', 'suffix']
+    else:
+        sort_map = {
+            'email': 'email',
+            'date': 'date_joined',
+            'role': 'role',
+        }
+        sort_field = [sort_map.get(sort_by, 'last_name')]
+    if order == 'desc':
+        sort_field = ['-' + f for f in sort_field]
+    return users.order_by(*sort_field)
+
+
+def _requested_projects(qs, submitter):
+    projects = Project.objects.select_related('project_leader', 'project_leader__college').all()
+    search = qs.get('search', [''])[0].strip()
+    sort_by = qs.get('sort_by', ['last_updated'])[0]
+    order = qs.get('order', ['desc'])[0]
+    college = qs.get('college', [''])[0]
+    campus = qs.get('campus', [''])[0]
+    agenda = qs.get('agenda', [''])[0]
+    status = qs.get('status', [''])[0]
+    year = qs.get('year', [''])[0]
+    quarter = qs.get('quarter', [''])[0]
+    date = qs.get('date', [''])[0]
+
+    # Auto-filter by submitter's college if they have restricted role
+    if submitter.role in ['PROGRAM_HEAD', 'DEAN', 'COORDINATOR'] and submitter.college:
+        college = str(submitter.college.id)
+
+    if college:
+        projects = projects.filter(project_leader__college__id=college)
+    if campus:
+        projects = projects.filter(project_leader__college__campus_id=campus)
+    if agenda:
+        projects = projects.filter(agenda__id=agenda)
+    if status:
+        projects = projects.filter(status=status)
+    if year:
+        projects = projects.filter(start_date__year=year)
+    if quarter:
+        qmap = {'1': (1,3), '2': (4,6), '3': (7,9), '4': (10,12)}
+        if quarter in qmap:
+            start, end = qmap[quarter]
+            projects = projects.filter(start_date__month__gte=start, start_date__month__lte=end)
+    if date:
+        projects = projects.filter(start_date=date)
+    if search:
+        projects = projects.filter(title__icontains=search)
+    sort_map = {
+        'title': 'title',
+        'last_updated': 'updated_at',
+        'start_date': 'start_date',
+        'progress': '',
+    }
+    sort_field = sort_map.get(sort_by, 'title')
+    if sort_field:
+        if order == 'desc':
+            sort_field = '-' + sort_field
+        projects = projects.order_by(sort_field)
+    elif sort_by == 'progress':
+        projects = sorted(projects, key=lambda p: (p.progress[0] / p.progress[1]) if p.progress[1] else 0, reverse=(order=='desc'))
+    return projects
+
+
+def requested_records(export_request):
+    """The rows an export request covers: a queryset, or a list when sorted in Python."""
+    qs = parse_qs(export_request.querystring)
+    if export_request.type == 'MANAGE_USER':
+        return _requested_users(qs, export_request.submitted_by)
+    return _requested_projects(qs, export_request.submitted_by)
+
+
+# ==============================================================================
+# Generating the artifact
+# ==============================================================================
+
+def _evict_pages(export_request_id):
+    """Evict cached pages showing the request (e.g. the exports page badge) once the change commits."""
+    tags = tags_for_instance(ExportRequest, ExportRequest(pk=export_request_id))
+
+    def evict():
+        try:
+            invalidate_cache_tags(tags)
+        except Exception as exc:
+            logger.warning("Cached pages of export request %s not evicted: %s", export_request_id, exc)
+
+    transaction.on_commit(evict)
+
+
+def _update(export_request_id, **fields):
+    ExportRequest.objects.filter(pk=export_request_id).update(job_heartbeat_at=timezone.now(), **fields)
+    _evict_pages(export_request_id)
+
+
+def _live_job(statuses=('QUEUED', 'RUNNING')):
+    """Requests whose job is in one of the statuses and still holds its lease."""
+    return Q(job_status__in=statuses, job_heartbeat_at__gte=timezone.now() - timedelta(seconds=settings.EXPORT_JOB_LEASE_SECONDS))
+
+
+def _with_progress(export_request_id, rows, total):
+    """Pass rows through, saving the percentage written every PROGRESS_STEP percent."""
+    saved = 0
+    for index, row in enumerate(rows, 1):
+        yield row
+        percent = index * 100 // total
+        if percent >= saved + PROGRESS_STEP and percent < 100:
+            saved = percent
+            _update(export_request_id, progress=percent)
+
+
+def _digest(fileobj):
+    """SHA-256 and size of a file, read in blocks; the file is rewound afterwards."""
+    sha256 = hashlib.sha256()
+    size = 0
+    for block in iter(lambda: fileobj.read(1024 * 1024), b''):
+        sha256.update(block)
+        size += len(block)
+    fileobj.seek(0)
+    return sha256.hexdigest(), size
+
+
+def generate_artifact(export_request_id, download_url=None):
+    """
+    Build and store the file of an approved export request. The submitter is
+    emailed download_url once it is ready.
+
+    Returns:
+        bool: True if the artifact is ready
+    """
+    export_request = ExportRequest.objects.select_related('submitted_by', 'submitted_by__college').filter(
+        pk=export_request_id, status='APPROVED'
+    ).first()
+    if export_request is None:
+        return False
+    if export_request.type not in EXPORT_SPECS:
+        _update(export_request_id, job_status='FAILED', job_error='Export type not supported.')
+        return False
+    title, headers, build_row, filename = EXPORT_SPECS[export_request.type]
+
+    # Claim the job, unless another worker is running it (a duplicate of a re-queued job)
+    claimed = ExportRequest.objects.filter(pk=export_request_id).exclude(_live_job(['RUNNING'])).update(
+        job_status='RUNNING', progress=0, job_error='', job_heartbeat_at=timezone.now()
+    )
+    if not claimed:
+        return False
+    _evict_pages(export_request_id)
+    previous_artifact = export_request.artifact.name
+    try:
+        records = requested_records(export_request)
+        total = len(records) if isinstance(records, list) else records.count()
+        rows = (build_row(record) for record in iterate(records))
+
+        workbook = new_workbook()
+        row_count = append_table(workbook, title, headers, _with_progress(export_request_id, rows, max(total, 1)))
+        with tempfile.TemporaryFile(suffix='.xlsx') as output:
+            save_workbook(workbook, output)
+            checksum, size = _digest(output)
+            export_request.artifact.save(filename, File(output), save=False)
+    except Exception as exc:
+        logger.exception("Export request %s could not be generated", export_request_id)
+        _update(export_request_id, job_status='FAILED', job_error=str(exc)[:1000])
+        return False
+
+    _update(
+        export_request_id,
+        job_status='READY',
+        progress=100,
+        artifact=export_request.artifact.name,
+        artifact_size=size,
+        row_count=row_count,
+        checksum=checksum,
+        generated_at=timezone.now(),
+    )
+    if previous_artifact and previous_artifact != export_request.artifact.name:
+        export_request.artifact.storage.delete(previous_artifact)
+
+    if download_url and export_request.submitted_by.email:
+        from system.utils.email_utils import async_send_export_approved
+        async_send_export_approved(export_request.submitted_by.email, export_request.get_type_display(), download_url)
+    return True
+
+
+def queue_export_job(export_request, download_url=None):
+    """
+    Mark the request queued and start its job once the current transaction
+    commits. Returns False if a job for it is already queued or running
+    within its lease.
+    """
+    queued = ExportRequest.objects.filter(pk=export_request.pk).exclude(_live_job()).update(
+        job_status='QUEUED', progress=0, job_error='', job_heartbeat_at=timezone.now()
+    )
+    if not queued:
+        return False
+    _evict_pages(export_request.pk)
+    export_request.job_status = 'QUEUED'
+    export_request.progress = 0
+    export_request_id = export_request.pk
+    transaction.on_commit(lambda: dispatch_export_job(export_request_id, download_url))
+    return True
+
+
+def dispatch_export_job(export_request_id, download_url=None):
+    """Send the job to Celery (inline if the broker is unreachable)."""
+    from .tasks import generate_export_artifact
+    try:
+        generate_export_artifact.apply_async(args=[export_request_id, download_url], retry=False)
+    except Exception as exc:
+        logger.warning("Export job not queued (%s); generating inline", exc)
+        generate_artifact(export_request_id, download_url)
+
+
+def job_payload(export_request):
+    """The job state reported by export_status (and by export_download while not ready)."""
+    from django.urls import reverse
+    ready = export_request.job_status == 'READY' and bool(export_request.artifact)
+    return {
+        'id': export_request.id,
+        'status': export_request.status,
+        'job_status': export_request.job_status,
+        'progress': export_request.progress,
+        'row_count': export_request.row_count,
+        'size': export_request.artifact_size,
+        'checksum': export_request.checksum or None,
+        'generated_at': export_request.generated_at.isoformat() if export_request.generated_at else None,
+        'error': export_request.job_error or None,
+        'download_url': reverse('export_download', args=[export_request.id]) if ready else None,
+    }
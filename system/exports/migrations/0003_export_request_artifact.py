@@ -0,0 +1,54 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:45
+
+import system.exports.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exports', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportrequest',
+            name='artifact',
+            field=models.FileField(blank=True, upload_to=system.exports.models.export_artifact_upload_to),
+        ),
+        migrations.AddField(
+            model_name='exportrequest',
+            name='artifact_size',
+            field=models.PositiveBigIntegerField(blank=True, help_text='Bytes', null=True),
+        ),
+        migrations.AddField(
+            model_name='exportrequest',
+            name='checksum',
+            field=models.CharField(blank=True, help_text='SHA-256 of the artifact', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='exportrequest',
+            name='generated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='exportrequest',
+            name='job_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='exportrequest',
+            name='job_status',
+            field=models.CharField(choices=[('NONE', 'Not Generated'), ('QUEUED', 'Queued'), ('RUNNING', 'Generating'), ('READY', 'Ready'), ('FAILED', 'Failed')], default='NONE', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='exportrequest',
+            name='progress',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Percent of rows written'),
+        ),
+        migrations.AddField(
+            model_name='exportrequest',
+            name='row_count',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exports', '0003_export_request_artifact'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportrequest',
+            name='job_heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='Last write by the job; queued or running jobs silent for EXPORT_JOB_LEASE_SECONDS are retried', null=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:17
+
+import system.exports.models
+from django.core.files.storage import FileSystemStorage
+from django.conf import settings
+from django.db import migrations, models
+
+
+def move_artifacts_out_of_media(apps, schema_editor):
+    """Move files generated before this migration from MEDIA_ROOT (publicly served) to private storage."""
+    ExportRequest = apps.get_model('exports', 'ExportRequest')
+    media = FileSystemStorage(location=settings.MEDIA_ROOT)
+    private = system.exports.models.export_artifact_storage()
+    for export_request in ExportRequest.objects.exclude(artifact='').iterator():
+        name = export_request.artifact.name
+        if media.exists(name):
+            with media.open(name, 'rb') as source:
+                saved = private.save(name, source)
+            media.delete(name)
+            ExportRequest.objects.filter(pk=export_request.pk).update(artifact=saved)
+        elif not private.exists(name):
+            # Nothing to serve: the next download generates the file again
+            ExportRequest.objects.filter(pk=export_request.pk).update(artifact='', job_status='NONE', progress=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exports', '0004_export_job_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportrequest',
+            name='artifact',
+            field=models.FileField(blank=True, storage=system.exports.models.export_artifact_storage, upload_to=system.exports.models.export_artifact_upload_to),
+        ),
+        migrations.RunPython(move_artifacts_out_of_media, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,23 @@
+import uuid
+
 from django.db import models
 from django.conf import settings
+from django.core.files.storage import FileSystemStorage
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 # Create your models here.
 
+def export_artifact_upload_to(instance, filename):
+    # Random folder per file, so a regenerated file never replaces one being downloaded
+    return f"exports/{uuid.uuid4().hex}/{filename}"
+
+
+def export_artifact_storage():
+    # Outside MEDIA_ROOT (publicly served under /media/): only export_download reads these files
+    return FileSystemStorage(location=settings.EXPORT_ARTIFACT_ROOT)
+
+
 class ExportRequest(models.Model):
     querystring = models.TextField(blank=True, default='')
     EXPORT_TYPE_CHOICES = [
@@ -32,6 +45,27 @@ class ExportRequest(models.Model):
     )
     reviewed_at = models.DateTimeField(null=True, blank=True)
 
+    # Generated file, built by the generate_export_artifact task once approved
+    JOB_STATUS_CHOICES = [
+        ('NONE', 'Not Generated'),
+        ('QUEUED', 'Queued'),
+        ('RUNNING', 'Generating'),
+        ('READY', 'Ready'),
+        ('FAILED', 'Failed'),
+    ]
+    job_status = models.CharField(max_length=10, choices=JOB_STATUS_CHOICES, default='NONE')
+    progress = models.PositiveSmallIntegerField(default=0, help_text="Percent of rows written")
+    artifact = models.FileField(upload_to=export_artifact_upload_to, storage=export_artifact_storage, blank=True)
+    artifact_size = models.PositiveBigIntegerField(null=True, blank=True, help_text="Bytes")
+    row_count = models.PositiveIntegerField(null=True, blank=True)
+    checksum = models.CharField(max_length=64, blank=True, help_text="SHA-256 of the artifact")
+    generated_at = models.DateTimeField(null=True, blank=True)
+    job_error = models.TextField(blank=True)
+    job_heartbeat_at = models.DateTimeField(
+        null=True, blank=True,
+        help_text="Last write by the job; queued or running jobs silent for EXPORT_JOB_LEASE_SECONDS are retried",
+    )
+
     class Meta:
         indexes = [
             # Admin approval queue (PENDING status priority)
@@ -106,6 +140,12 @@ def log_export_request_action(sender, instance, created, **kwargs):
     )
 
 
+@receiver(post_delete, sender=ExportRequest)
+def delete_export_artifact(sender, instance, **kwargs):
+    if instance.artifact:
+        instance.artifact.delete(save=False)
+
+
 @receiver(post_delete, sender=ExportRequest)
 def log_export_request_delete(sender, instance, **kwargs):
     from system.logs.models import LogEntry
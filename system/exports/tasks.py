@@ -0,0 +1,8 @@
+from WBPMISUESO.celery import app
+
+
+@app.task(ignore_result=True)
+def generate_export_artifact(export_request_id, download_url=None):
+    """Build the file of an approved export request and email the submitter when it is ready."""
+    from .jobs import generate_artifact
+    return generate_artifact(export_request_id, download_url)
@@ -1,3 +1,68 @@
+import hashlib
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.core import mail
 from django.test import TestCase
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from system.users.models import User
+from .jobs import generate_artifact, queue_export_job
+from .models import ExportRequest
+
+
+class ExportJobTests(TestCase):
+    """generate_artifact stores the workbook, records failures and honours the job lease."""
+
+    def setUp(self):
+        get_redis_connection('default').flushdb()
+        self.staff = User.objects.create_user(username='ueso', email='ueso@example.com', password='pw', role='UESO')
+        User.objects.create_user(username='faculty', email='faculty@example.com', password='pw', role='FACULTY')
+        self.export_request = ExportRequest.objects.create(type='MANAGE_USER', submitted_by=self.staff, status='APPROVED')
+
+    def reload(self):
+        self.export_request.refresh_from_db()
+        return self.export_request
+
+    def test_ready_artifact_is_stored_with_its_checksum(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(generate_artifact(self.export_request.pk, download_url='https://example.com/download'))
+        export_request = self.reload()
+        self.assertEqual(export_request.job_status, 'READY')
+        self.assertEqual(export_request.progress, 100)
+        self.assertEqual(export_request.row_count, User.objects.count())
+        with export_request.artifact.open('rb') as artifact:
+            content = artifact.read()
+        self.assertEqual(export_request.artifact_size, len(content))
+        self.assertEqual(export_request.checksum, hashlib.sha256(content).hexdigest())
+        self.assertTrue(export_request.artifact.path.startswith(str(settings.EXPORT_ARTIFACT_ROOT)))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_failure_is_recorded(self):
+        with mock.patch('system.exports.jobs.requested_records', side_effect=RuntimeError('filters broke')), \
+                self.assertLogs('system.exports.jobs', 'ERROR'):
+            self.assertFalse(generate_artifact(self.export_request.pk))
+        export_request = self.reload()
+        self.assertEqual(export_request.job_status, 'FAILED')
+        self.assertEqual(export_request.job_error, 'filters broke')
+        self.assertFalse(export_request.artifact)
+
+    def test_unapproved_request_is_not_generated(self):
+        ExportRequest.objects.filter(pk=self.export_request.pk).update(status='PENDING')
+        self.assertFalse(generate_artifact(self.export_request.pk))
+        self.assertEqual(self.reload().job_status, 'NONE')
+
+    def test_running_job_within_lease_is_not_duplicated(self):
+        ExportRequest.objects.filter(pk=self.export_request.pk).update(job_status='RUNNING', job_heartbeat_at=timezone.now())
+        self.assertFalse(generate_artifact(self.export_request.pk))
+        self.assertFalse(queue_export_job(self.export_request))
+        self.assertEqual(self.reload().job_status, 'RUNNING')
 
-# Create your tests here.
+    def test_job_with_expired_lease_is_retried(self):
+        expired = timezone.now() - timedelta(seconds=settings.EXPORT_JOB_LEASE_SECONDS + 1)
+        ExportRequest.objects.filter(pk=self.export_request.pk).update(job_status='RUNNING', job_heartbeat_at=expired)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(queue_export_job(self.export_request))
+        self.assertEqual(self.reload().job_status, 'READY')
@@ -1,22 +1,22 @@
 from django.conf import settings
 from django.core.paginator import Paginator
 from django.core.mail import EmailMultiAlternatives
-from django.http import FileResponse, HttpResponse, JsonResponse
+from django.http import FileResponse, JsonResponse
 from django.shortcuts import get_object_or_404, render, redirect
 from django.utils import timezone
+from django.utils.cache import add_never_cache_headers
+from django.views.decorators.cache import never_cache
 from django.views.decorators.http import require_GET, require_POST
 from django.contrib import messages
 
 from .models import ExportRequest, can_export_direct, must_request_export
 from system.users.decorators import role_required
 from system.users.models import User
-from system.utils.email_utils import async_send_export_approved, async_send_export_rejected
+from system.utils.email_utils import async_send_export_rejected
 from shared.projects.models import Project
-
-import openpyxl
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Alignment
-from io import BytesIO
+from .columns import MANAGE_USER_HEADERS, manage_user_row, PROJECT_HEADERS, project_row, LOG_HEADERS, log_row
+from .jobs import EXPORT_SPECS, job_payload, queue_export_job
+from .xlsx import XLSX_CONTENT_TYPE, new_workbook, append_table, iterate, workbook_response
 
 
 @role_required(allowed_roles=["UESO", "VP", "DIRECTOR"], require_confirmed=True)
@@ -105,21 +105,18 @@ def approve_export_request(request, request_id):
     export_request.reviewed_at = timezone.now()
     export_request.save()
 
-    # Send email asynchronously with download link (non-blocking, no 2-minute delay!)
+    # Generate the file in the background; the submitter is emailed the download link when it is ready
     user = export_request.submitted_by
     export_type_display = export_request.get_type_display()
+
+    from django.urls import reverse
+    scheme = 'https' if request.is_secure() else 'http'
+    domain = request.get_host()
+    download_path = reverse('export_download', args=[export_request.id])
+    download_url = f"{scheme}://{domain}{download_path}"
+    queue_export_job(export_request, download_url)
     
-    if user.email:
-        # Build full download URL
-        from django.urls import reverse
-        scheme = 'https' if request.is_secure() else 'http'
-        domain = request.get_host()
-        download_path = reverse('export_download', args=[export_request.id])
-        download_url = f"{scheme}://{domain}{download_path}"
-        
-        async_send_export_approved(user.email, export_type_display, download_url)
-    
-    messages.success(request, f'{export_type_display} export request approved. Email sent to {user.get_full_name()}.')
+    messages.success(request, f'{export_type_display} export request approved. {user.get_full_name()} will be emailed when the file is ready.')
     
     # Redirect back to exports page
     return redirect('exports')
@@ -153,170 +150,46 @@ def reject_export_request(request, request_id):
     return redirect('exports')
 
 
-# Robust download endpoint for filtered export files
+def _can_access_export(user, export_request):
+    # Only allow the submitter or reviewers
+    allowed_roles = ["UESO", "VP", "DIRECTOR"]
+    return user == export_request.submitted_by or (hasattr(user, 'role') and user.role in allowed_roles)
+
+
+# Download endpoint for approved export files (generated by the export job)
 def export_download(request, request_id):
     export_request = get_object_or_404(ExportRequest, id=request_id, status='APPROVED')
-    # Only allow the submitter or reviewers to download
-    user = request.user
-    allowed_roles = ["UESO", "VP", "DIRECTOR"]
-    if not (user == export_request.submitted_by or (hasattr(user, 'role') and user.role in allowed_roles)):
+    if not _can_access_export(request.user, export_request):
         return JsonResponse({'error': 'You do not have permission to download this export.'}, status=403)
+    if export_request.type not in EXPORT_SPECS:
+        return JsonResponse({'error': 'Export type not supported.'}, status=400)
+
+    artifact = export_request.artifact
+    if export_request.job_status == 'READY' and artifact and artifact.storage.exists(artifact.name):
+        response = FileResponse(
+            artifact.open('rb'),
+            as_attachment=True,
+            filename=EXPORT_SPECS[export_request.type][3],
+            content_type=XLSX_CONTENT_TYPE,
+        )
+        response['ETag'] = f'"{export_request.checksum}"'
+        return response
 
-    from urllib.parse import parse_qs
-    file_buffer = BytesIO()
-    filename = None
-    qs = parse_qs(export_request.querystring)
-    
-    # Get the original submitter to check their role-based restrictions
-    submitter = export_request.submitted_by
+    # No stored file yet (or it went missing), or the last job failed or died: generate it now
+    queue_export_job(export_request)
+    response = JsonResponse(job_payload(export_request), status=202)
+    add_never_cache_headers(response)
+    return response
 
-    if export_request.type == 'MANAGE_USER':
-        users = User.objects.all()
-        from django.db.models import Q
-        search = qs.get('search', [''])[0].strip()
-        if search:
-            users = users.filter(
-                Q(given_name__icontains=search) |
-                Q(last_name__icontains=search) |
-                Q(middle_initial__icontains=search) |
-                Q(suffix__icontains=search) |
-                Q(email__icontains=search)
-            )
-        sort_by = qs.get('sort_by', ['date'])[0]
-        order = qs.get('order', ['desc'])[0]
-        role = qs.get('role', [''])[0]
-        verified = qs.get('verified', [''])[0]
-        date = qs.get('date', [''])[0]
-        college = qs.get('college', [''])[0]
-        campus = qs.get('campus', [''])[0]
-        
-        # Auto-filter by submitter's college if they have restricted role
-        if submitter.role in ['PROGRAM_HEAD', 'DEAN', 'COORDINATOR'] and submitter.college:
-            college = str(submitter.college.id)
-        
-        if role:
-            users = users.filter(role=role)
-        if verified == 'true':
-            users = users.filter(is_confirmed=True)
-        elif verified == 'false':
-            users = users.filter(is_confirmed=False)
-        if date:
-            users = users.filter(date_joined__date=date)
-        if college:
-            users = users.filter(college_id=college)
-        if campus:
-            users = users.filter(college__campus_id=campus)
-        if sort_by == 'name':
-            sort_field = ['last_name', 'given_name', 'middle_initial', 'suffix']
-        else:
-            sort_map = {
-                'email': 'email',
-                'date': 'date_joined',
-                'role': 'role',
-            }
-            sort_field = [sort_map.get(sort_by, 'last_name')]
-        if order == 'desc':
-            sort_field = ['-' + f for f in sort_field]
-        users = users.order_by(*sort_field)
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Manage Users"
-        headers = [
-            'Last Name', 'Given Name', 'Middle Initial', 'Suffix', 'Email', 'Role', 'Verified', 'Date Joined', 'College', 'Campus'
-        ]
-        ws.append(headers)
-        for u in users:
-            ws.append([
-                u.last_name,
-                u.given_name,
-                u.middle_initial,
-                u.suffix,
-                u.email,
-                u.get_role_display() if hasattr(u, 'get_role_display') else getattr(u, 'role', ''),
-                u.is_confirmed,
-                u.date_joined.strftime('%Y-%m-%d %H:%M'),
-                str(getattr(u, 'college', '')),
-                u.get_campus_display() if hasattr(u, 'get_campus_display') else getattr(u, 'campus', ''),
-            ])
-        wb.save(file_buffer)
-        filename = 'manage_users_export.xlsx'
-    elif export_request.type == 'PROJECT':
-        projects = Project.objects.all()
-        from django.db.models import Q
-        search = qs.get('search', [''])[0].strip()
-        sort_by = qs.get('sort_by', ['last_updated'])[0]
-        order = qs.get('order', ['desc'])[0]
-        college = qs.get('college', [''])[0]
-        campus = qs.get('campus', [''])[0]
-        agenda = qs.get('agenda', [''])[0]
-        status = qs.get('status', [''])[0]
-        year = qs.get('year', [''])[0]
-        quarter = qs.get('quarter', [''])[0]
-        date = qs.get('date', [''])[0]
-        
-        # Auto-filter by submitter's college if they have restricted role
-        if submitter.role in ['PROGRAM_HEAD', 'DEAN', 'COORDINATOR'] and submitter.college:
-            college = str(submitter.college.id)
-        
-        if college:
-            projects = projects.filter(project_leader__college__id=college)
-        if campus:
-            projects = projects.filter(project_leader__college__campus_id=campus)
-        if agenda:
-            projects = projects.filter(agenda__id=agenda)
-        if status:
-            projects = projects.filter(status=status)
-        if year:
-            projects = projects.filter(start_date__year=year)
-        if quarter:
-            qmap = {'1': (1,3), '2': (4,6), '3': (7,9), '4': (10,12)}
-            if quarter in qmap:
-                start, end = qmap[quarter]
-                projects = projects.filter(start_date__month__gte=start, start_date__month__lte=end)
-        if date:
-            projects = projects.filter(start_date=date)
-        if search:
-            projects = projects.filter(title__icontains=search)
-        sort_map = {
-            'title': 'title',
-            'last_updated': 'updated_at',
-            'start_date': 'start_date',
-            'progress': '',
-        }
-        sort_field = sort_map.get(sort_by, 'title')
-        if sort_field:
-            if order == 'desc':
-                sort_field = '-' + sort_field
-            projects = projects.order_by(sort_field)
-        elif sort_by == 'progress':
-            projects = sorted(projects, key=lambda p: (p.progress[0] / p.progress[1]) if p.progress[1] else 0, reverse=(order=='desc'))
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Projects"
-        headers = [
-            'Title', 'Leader', 'College/Unit', 'Last Updated', 'Start Date', 'Progress', 'Status'
-        ]
-        ws.append(headers)
-        for p in projects:
-            ws.append([
-                p.title,
-                p.project_leader.get_full_name() if p.project_leader else '',
-                p.project_leader.college.name if p.project_leader and p.project_leader.college else '',
-                p.updated_at.strftime('%Y-%m-%d') if p.updated_at else '',
-                p.start_date.strftime('%Y-%m-%d') if p.start_date else '',
-                getattr(p, 'progress_display', ''),
-                p.get_status_display() if hasattr(p, 'get_status_display') else p.status,
-            ])
-        wb.save(file_buffer)
-        filename = 'projects_export.xlsx'
-
-    # BUDGET
-    # GOAL
-
-    if filename:
-        file_buffer.seek(0)
-        return FileResponse(file_buffer, as_attachment=True, filename=filename, content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    return JsonResponse({'error': 'Export type not supported.'}, status=400)
+
+@require_GET
+@never_cache
+def export_status(request, request_id):
+    """Job state of an export request, for polling until its file is ready."""
+    export_request = get_object_or_404(ExportRequest, id=request_id)
+    if not _can_access_export(request.user, export_request):
+        return JsonResponse({'error': 'You do not have permission to view this export.'}, status=403)
+    return JsonResponse(job_payload(export_request))
 
 
 ########################################################################################################################
@@ -400,38 +273,9 @@ def export_manage_user(request):
     users = users.order_by(*sort_field)
 
     # Generate XLSX (direct export)
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Manage Users"
-    headers = [
-        'Last Name', 'Given Name', 'Middle Initial', 'Suffix', 'Email', 'Role', 'Verified', 'Date Joined', 'College', 'Campus'
-    ]
-    ws.append(headers)
-    for u in users:
-        ws.append([
-            u.last_name,
-            u.given_name,
-            u.middle_initial,
-            u.suffix,
-            u.email,
-            u.get_role_display() if hasattr(u, 'get_role_display') else getattr(u, 'role', ''),
-            u.is_confirmed,
-            u.date_joined.strftime('%Y-%m-%d %H:%M'),
-            str(getattr(u, 'college', '')),
-            u.get_campus_display() if hasattr(u, 'get_campus_display') else getattr(u, 'campus', ''),
-        ])
-    # Auto-fit column widths
-    for col_idx, col in enumerate(ws.columns, 1):
-        max_length = max(len(str(cell.value)) if cell.value is not None else 0 for cell in col)
-        ws.column_dimensions[get_column_letter(col_idx)].width = max(max_length + 2, 12)
-        for cell in col:
-            cell.alignment = Alignment(wrap_text=True, vertical='top')
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
-    response = HttpResponse(output.read(), content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="manage_users_export.xlsx"'
-    return response
+    workbook = new_workbook()
+    append_table(workbook, "Manage Users", MANAGE_USER_HEADERS, (manage_user_row(u) for u in iterate(users)))
+    return workbook_response(workbook, 'manage_users_export.xlsx')
 
 
 @require_GET
@@ -445,7 +289,7 @@ def export_project(request):
         'project_leader__college',
         'project_leader__college__campus',
         'agenda'
-    ).prefetch_related('providers', 'sdgs', 'events').all()
+    ).all()
     # Filters (match admin_project view)
     search = request.GET.get('search', '').strip()
     sort_by = request.GET.get('sort_by', 'last_updated')
@@ -505,39 +349,9 @@ def export_project(request):
         projects = sorted(projects, key=lambda p: (p.progress[0] / p.progress[1]) if p.progress[1] else 0, reverse=(order=='desc'))
 
     if can_export_direct(user):
-        import openpyxl
-        from openpyxl.utils import get_column_letter
-        from openpyxl.styles import Alignment
-        from io import BytesIO
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Projects"
-        headers = [
-            'Title', 'Leader', 'College/Unit', 'Last Updated', 'Start Date', 'Progress', 'Status'
-        ]
-        ws.append(headers)
-        for p in projects:
-            ws.append([
-                p.title,
-                p.project_leader.get_full_name() if p.project_leader else '',
-                p.project_leader.college.name if p.project_leader and p.project_leader.college else '',
-                p.updated_at.strftime('%Y-%m-%d') if p.updated_at else '',
-                p.start_date.strftime('%Y-%m-%d') if p.start_date else '',
-                getattr(p, 'progress_display', ''),
-                p.get_status_display() if hasattr(p, 'get_status_display') else p.status,
-            ])
-        # Auto-fit column widths
-        for col_idx, col in enumerate(ws.columns, 1):
-            max_length = max(len(str(cell.value)) if cell.value is not None else 0 for cell in col)
-            ws.column_dimensions[get_column_letter(col_idx)].width = max(max_length + 2, 12)
-            for cell in col:
-                cell.alignment = Alignment(wrap_text=True, vertical='top')
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-        response = HttpResponse(output.read(), content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = 'attachment; filename="projects_export.xlsx"'
-        return response
+        workbook = new_workbook()
+        append_table(workbook, "Projects", PROJECT_HEADERS, (project_row(p) for p in iterate(projects)))
+        return workbook_response(workbook, 'projects_export.xlsx')
     elif must_request_export(user):
         ExportRequest.objects.create(
             type='PROJECT',
@@ -595,41 +409,9 @@ def export_log(request):
         sort_field = '-' + sort_field
     logs = logs.order_by(sort_field)
 
-    import openpyxl
-    from openpyxl.utils import get_column_letter
-    from openpyxl.styles import Alignment
-    from io import BytesIO
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Logs"
-    headers = [
-        'User', 'User Email', 'Action', 'Model', 'Object ID', 'Object Repr', 'Timestamp', 'Details', 'URL'
-    ]
-    ws.append(headers)
-    for log in logs:
-        ws.append([
-            log.user.get_full_name() if log.user else '-',
-            log.user.email if log.user and log.user.email else '-',
-            log.get_action_display(),
-            log.model,
-            log.object_id,
-            log.object_repr,
-            log.timestamp.strftime('%Y-%m-%d %H:%M:%S') if log.timestamp else '',
-            log.details,
-            log.url,
-        ])
-    # Auto-fit column widths
-    for col_idx, col in enumerate(ws.columns, 1):
-        max_length = max(len(str(cell.value)) if cell.value is not None else 0 for cell in col)
-        ws.column_dimensions[get_column_letter(col_idx)].width = max(max_length + 2, 12)
-        for cell in col:
-            cell.alignment = Alignment(wrap_text=True, vertical='top')
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
-    response = HttpResponse(output.read(), content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="logs_export.xlsx"'
-    return response
+    workbook = new_workbook()
+    append_table(workbook, "Logs", LOG_HEADERS, (log_row(log) for log in iterate(logs)))
+    return workbook_response(workbook, 'logs_export.xlsx')
 
 @require_GET
 def export_goals(request):
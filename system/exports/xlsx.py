@@ -0,0 +1,113 @@
+"""
+Streaming XLSX exports.
+
+Workbooks are write-only (openpyxl's write_only mode): each appended row is
+written straight to disk instead of being kept as cell objects. Querysets
+are read in chunks with .iterator(), column widths are estimated from the
+header and the first rows only, and the finished file is served from a
+temporary file with FileResponse. Memory stays flat however many rows an
+export has.
+
+    workbook = new_workbook()
+    append_table(workbook, "Logs", LOG_HEADERS, (log_row(log) for log in iterate(logs)))
+    return workbook_response(workbook, 'logs_export.xlsx')
+"""
+
+import tempfile
+from itertools import chain, islice
+
+from django.http import FileResponse
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment
+from openpyxl.utils import get_column_letter
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Rows fetched per database round trip
+EXPORT_CHUNK_SIZE = 1000
+# Rows (after the header) that column widths are estimated from
+WIDTH_SAMPLE_ROWS = 200
+MIN_COLUMN_WIDTH = 12
+MAX_COLUMN_WIDTH = 60
+
+WRAPPED = Alignment(wrap_text=True, vertical='top')
+
+
+def new_workbook():
+    """An empty write-only workbook; add sheets with append_table or create_sheet."""
+    return Workbook(write_only=True)
+
+
+def iterate(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Rows of a queryset fetched in chunks (lists, e.g. Python-sorted results, pass through)."""
+    if hasattr(queryset, 'iterator'):
+        return queryset.iterator(chunk_size=chunk_size)
+    return iter(queryset)
+
+
+def styled(worksheet, value, font=None, number_format=None, alignment=None):
+    """A cell carrying a style, for rows appended to a write-only sheet."""
+    cell = WriteOnlyCell(worksheet, value=value)
+    if font is not None:
+        cell.font = font
+    if number_format is not None:
+        cell.number_format = number_format
+    if alignment is not None:
+        cell.alignment = alignment
+    return cell
+
+
+def estimate_widths(rows, min_width=MIN_COLUMN_WIDTH, max_width=MAX_COLUMN_WIDTH):
+    """Column widths fitting the longest value of each column in the given rows."""
+    widths = []
+    for row in rows:
+        for index, value in enumerate(row):
+            length = len(str(value)) if value is not None else 0
+            if index == len(widths):
+                widths.append(length)
+            elif length > widths[index]:
+                widths[index] = length
+    return [min(max(length + 2, min_width), max_width) for length in widths]
+
+
+def set_column_widths(worksheet, widths, start_column=1):
+    """Set widths; on a write-only sheet this must happen before the first row is appended."""
+    for offset, width in enumerate(widths):
+        worksheet.column_dimensions[get_column_letter(start_column + offset)].width = width
+
+
+def append_table(workbook, title, headers, rows, wrap_text=True, sample_size=WIDTH_SAMPLE_ROWS):
+    """
+    Add a sheet with a header row and the given rows (any iterable, consumed
+    once). Widths are estimated from the header and the first sample_size rows.
+
+    Returns:
+        int: the number of data rows written
+    """
+    worksheet = workbook.create_sheet(title=title)
+    rows = iter(rows)
+    sample = list(islice(rows, sample_size))
+    set_column_widths(worksheet, estimate_widths(chain([headers], sample)))
+
+    worksheet.append(headers)
+    count = 0
+    for row in chain(sample, rows):
+        if wrap_text:
+            row = [styled(worksheet, value, alignment=WRAPPED) for value in row]
+        worksheet.append(row)
+        count += 1
+    return count
+
+
+def save_workbook(workbook, fileobj):
+    """Write the finished workbook to a binary file object and rewind it."""
+    workbook.save(fileobj)
+    fileobj.seek(0)
+    return fileobj
+
+
+def workbook_response(workbook, filename):
+    """Serve the workbook as a download, streamed from a temporary file that is removed once sent."""
+    output = save_workbook(workbook, tempfile.TemporaryFile(suffix='.xlsx'))
+    return FileResponse(output, as_attachment=True, filename=filename, content_type=XLSX_CONTENT_TYPE)
@@ -49,6 +49,7 @@ class LogEntry(models.Model):
 def create_notifications_from_log_entry(sender, instance, created, **kwargs):
 	"""
 	Automatically create notifications when a log entry marked as is_notification is created
+	(fanned out by a Celery task once the transaction commits)
 	"""
 	if created and instance.is_notification:
 		from system.notifications.utils import create_notifications_from_log
@@ -0,0 +1,198 @@
+"""
+Per-user unread notification counters.
+
+Counters live in the 'counters' cache (its own Redis database, so page cache
+clears do not wipe them) and are kept current with atomic INCRBY/DECRBY:
+
+    notif_unread_<user id>           unread personal notifications
+    notif_broadcasts_total           broadcasts created so far
+    notif_broadcasts_read_<user id>  broadcasts that are read or not addressed
+                                     to the user (sent before they joined, or by them)
+
+so a user's unread count is ``unread + total - read``, one MGET per badge.
+A missing counter is rebuilt from the database on the next read; increments
+to a missing counter are dropped, since the rebuild will count them.
+reconcile_unread_counters rewrites every active user's counters to correct drift.
+"""
+
+import logging
+from collections import Counter
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Exists, Func, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+TOTAL_BROADCASTS_KEY = 'notif_broadcasts_total'
+
+# KEYS: counters, ARGV: their deltas. Counters that are not initialised are
+# skipped: they are rebuilt from the database on the next read.
+INCR_EXISTING_LUA = """
+for i, key in ipairs(KEYS) do
+    if redis.call('EXISTS', key) == 1 then
+        redis.call('INCRBY', key, ARGV[i])
+    end
+end
+return #KEYS
+"""
+INCR_CHUNK_SIZE = 1000
+
+
+def get_counter_cache():
+    return caches['counters']
+
+
+def unread_key(user_id):
+    return f'notif_unread_{user_id}'
+
+
+def broadcasts_read_key(user_id):
+    return f'notif_broadcasts_read_{user_id}'
+
+
+def _incr_many(deltas):
+    """Apply {key: delta} to the counters that exist, one EVALSHA round trip per chunk of keys."""
+    counters = get_counter_cache()
+    items = [(counters.make_key(key), delta) for key, delta in deltas.items() if delta]
+    try:
+        client = get_redis_connection('counters')
+        incr_existing = client.register_script(INCR_EXISTING_LUA)
+        for start in range(0, len(items), INCR_CHUNK_SIZE):
+            chunk = items[start:start + INCR_CHUNK_SIZE]
+            incr_existing(keys=[key for key, _ in chunk], args=[delta for _, delta in chunk])
+    except Exception as exc:
+        logger.warning("Unread counters not updated (%d keys): %s", len(items), exc)
+
+
+def adjust_counters(deltas):
+    """Apply counter deltas once the current transaction commits (nothing for rollbacks)."""
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if deltas:
+        transaction.on_commit(lambda: _incr_many(deltas))
+
+
+def notifications_created(recipient_ids):
+    """One more unread notification for each recipient ID (repeated IDs count twice)."""
+    adjust_counters({unread_key(user_id): count for user_id, count in Counter(recipient_ids).items()})
+
+
+def notifications_read(user_id, count):
+    adjust_counters({unread_key(user_id): -count})
+
+
+def broadcasts_created(actor_ids):
+    """A broadcast per actor ID; the actor does not receive their own."""
+    deltas = Counter(broadcasts_read_key(actor_id) for actor_id in actor_ids if actor_id)
+    deltas[TOTAL_BROADCASTS_KEY] = len(actor_ids)
+    adjust_counters(deltas)
+
+
+def broadcasts_read(user_id, count):
+    adjust_counters({broadcasts_read_key(user_id): count})
+
+
+def _total_broadcasts():
+    from .models import BroadcastNotification
+
+    counters = get_counter_cache()
+    total = counters.get(TOTAL_BROADCASTS_KEY)
+    if total is None:
+        total = BroadcastNotification.objects.count()
+        counters.add(TOTAL_BROADCASTS_KEY, total, timeout=None)
+    return total
+
+
+def get_unread_count(user):
+    """
+    Unread personal notifications plus unread broadcasts for ``user``.
+    Costs one cache round trip; the database is queried only to rebuild missing counters.
+    """
+    from .feed import unread_broadcasts
+    from .models import Notification
+
+    counters = get_counter_cache()
+    keys = [unread_key(user.id), TOTAL_BROADCASTS_KEY, broadcasts_read_key(user.id)]
+    try:
+        values = counters.get_many(keys)
+    except Exception as exc:
+        logger.warning("Unread counters unavailable: %s", exc)
+        values = {}
+        counters = None
+
+    unread = values.get(keys[0])
+    total = values.get(keys[1])
+    read = values.get(keys[2])
+    if unread is None:
+        unread = Notification.objects.filter(recipient_id=user.id, is_read=False).count()
+        if counters is not None:
+            counters.add(keys[0], unread, timeout=None)
+    if total is None or read is None:
+        total = _total_broadcasts() if counters is not None else 0
+        read = total - unread_broadcasts(user).count()
+        if counters is not None:
+            counters.add(keys[2], read, timeout=None)
+    return max(unread, 0) + max(total - read, 0)
+
+
+def _count(queryset):
+    """Correlated COUNT(*) subquery over ``queryset``."""
+    return Subquery(
+        queryset.order_by().annotate(count=Func('id', function='COUNT')).values('count'),
+        output_field=IntegerField(),
+    )
+
+
+def reconcile_unread_counters(chunk_size=1000):
+    """
+    Recompute every active user's counters from the database in one query
+    and rewrite the ones that drifted.
+
+    Returns:
+        dict: Users checked and counters rewritten (drifted or missing)
+    """
+    from system.users.models import User
+    from .models import BroadcastNotification, BroadcastReceipt, Notification
+
+    counters = get_counter_cache()
+    total = BroadcastNotification.objects.count()
+    counters.set(TOTAL_BROADCASTS_KEY, total, timeout=None)
+
+    # Same rules as feed.unread_broadcasts, correlated on the outer user
+    unread_broadcasts = BroadcastNotification.objects.filter(
+        created_at__gte=OuterRef('date_joined'),
+        id__gt=Coalesce(OuterRef('broadcast_cursor__last_read_id'), 0),
+    ).exclude(actor_id=OuterRef('pk')).exclude(Exists(
+        BroadcastReceipt.objects.filter(user_id=OuterRef(OuterRef('pk')), broadcast_id=OuterRef('pk'))
+    ))
+    users = User.objects.filter(is_active=True).annotate(
+        unread=_count(Notification.objects.filter(recipient_id=OuterRef('pk'), is_read=False)),
+        unread_broadcasts=_count(unread_broadcasts),
+    ).order_by().values_list('id', 'unread', 'unread_broadcasts')
+
+    checked = drifted = 0
+    expected = {}
+    for user_id, unread, unread_broadcast_count in users.iterator(chunk_size=chunk_size):
+        expected[unread_key(user_id)] = unread or 0
+        expected[broadcasts_read_key(user_id)] = total - (unread_broadcast_count or 0)
+        checked += 1
+        if len(expected) >= 2 * chunk_size:
+            drifted += _write_drifted(counters, expected)
+            expected = {}
+    drifted += _write_drifted(counters, expected)
+
+    if drifted:
+        print(f"✓ Unread counters: {drifted} rewritten across {checked} users")
+    return {'users': checked, 'rewritten': drifted}
+
+
+def _write_drifted(counters, expected):
+    if not expected:
+        return 0
+    current = counters.get_many(list(expected))
+    changed = {key: value for key, value in expected.items() if current.get(key) != value}
+    if changed:
+        counters.set_many(changed, timeout=None)
+    return len(changed)
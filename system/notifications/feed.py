@@ -0,0 +1,151 @@
+"""
+A user's notification feed: personal notifications merged with broadcasts.
+
+Personal notifications are Notification rows with their own is_read flag.
+Broadcasts (announcements) are stored once as BroadcastNotification; a
+broadcast is read for a user when its id is at or below their
+BroadcastCursor, or when they have a BroadcastReceipt for it.
+
+Unread counts come from the counters in counters.py, which every change
+here keeps up to date.
+"""
+
+from django.db import transaction
+from django.db.models import BooleanField, Case, CharField, Exists, Max, OuterRef, Value, When
+from django.utils import timezone
+
+from . import counters, stream
+from .models import BroadcastCursor, BroadcastNotification, BroadcastReceipt, Notification
+
+FEED_FIELDS = ('id', 'actor_id', 'action', 'model', 'object_id', 'object_repr', 'details', 'url', 'created_at')
+
+
+def visible_broadcasts(user):
+    """Broadcasts created since the user joined, except their own."""
+    return BroadcastNotification.objects.filter(created_at__gte=user.date_joined).exclude(actor_id=user.id)
+
+
+def get_broadcast_cursor(user):
+    return BroadcastCursor.objects.filter(user_id=user.id).values_list('last_read_id', flat=True).first() or 0
+
+
+def _receipt_exists(user):
+    return Exists(BroadcastReceipt.objects.filter(user_id=user.id, broadcast_id=OuterRef('pk')))
+
+
+def unread_broadcasts(user, cursor=None):
+    cursor = get_broadcast_cursor(user) if cursor is None else cursor
+    return visible_broadcasts(user).filter(id__gt=cursor).exclude(_receipt_exists(user))
+
+
+# ------------------------------------------------------------------
+# Listing
+# ------------------------------------------------------------------
+
+def get_notification_feed(user, filter_type='all'):
+    """
+    Personal notifications and broadcasts for ``user`` as one UNION query,
+    newest first. ``filter_type`` is 'all', 'unread' or 'read'.
+
+    Rows are dicts; pass a page of them to load_feed_items.
+    """
+    cursor = get_broadcast_cursor(user)
+
+    personal = Notification.objects.filter(recipient_id=user.id)
+    broadcasts = visible_broadcasts(user)
+    if filter_type == 'unread':
+        personal = personal.filter(is_read=False)
+        broadcasts = broadcasts.filter(id__gt=cursor).exclude(_receipt_exists(user))
+    elif filter_type == 'read':
+        personal = personal.filter(is_read=True)
+        broadcasts = broadcasts.filter(Case(
+            When(id__lte=cursor, then=True), default=_receipt_exists(user), output_field=BooleanField(),
+        ))
+
+    # Both sides select the same columns in the same order
+    personal = personal.order_by().annotate(
+        kind=Value('personal', output_field=CharField()),
+        read=Case(When(is_read=True, then=True), default=False, output_field=BooleanField()),
+    ).values(*FEED_FIELDS, 'kind', 'read')
+    broadcasts = broadcasts.order_by().annotate(
+        kind=Value('broadcast', output_field=CharField()),
+        read=Case(When(id__lte=cursor, then=True), default=_receipt_exists(user), output_field=BooleanField()),
+    ).values(*FEED_FIELDS, 'kind', 'read')
+
+    return personal.union(broadcasts, all=True).order_by('-created_at', '-id')
+
+
+def load_feed_items(rows):
+    """
+    Turn feed rows into Notification / BroadcastNotification instances with
+    ``is_read``, ``feed_key`` and ``actor`` set, loading all actors in one query.
+    """
+    from system.users.models import User
+
+    rows = list(rows)
+    actors = User.objects.in_bulk({row['actor_id'] for row in rows if row['actor_id']})
+
+    items = []
+    for row in rows:
+        kind = row.pop('kind')
+        is_read = bool(row.pop('read'))
+        if kind == 'broadcast':
+            item = BroadcastNotification(**row)
+            item.feed_key = f"broadcast/{item.id}"
+        else:
+            item = Notification(**row)
+            item.feed_key = str(item.id)
+        item.is_read = is_read
+        item.actor = actors.get(row['actor_id'])
+        items.append(item)
+    return items
+
+
+# ------------------------------------------------------------------
+# Unread count
+# ------------------------------------------------------------------
+
+def get_unread_notification_count(user):
+    """Unread personal notifications plus unread broadcasts, from the unread counters."""
+    return counters.get_unread_count(user)
+
+
+# ------------------------------------------------------------------
+# Read state
+# ------------------------------------------------------------------
+
+def mark_broadcast_read(user, broadcast):
+    """
+    Record a receipt for one of the user's visible broadcasts (see
+    visible_broadcasts) unless the cursor already covers it.
+    """
+    if broadcast.id > get_broadcast_cursor(user):
+        _, created = BroadcastReceipt.objects.get_or_create(user_id=user.id, broadcast=broadcast)
+        if created:
+            counters.broadcasts_read(user.id, 1)
+            stream.publish_unread_changed(user.id)
+
+
+def mark_all_notifications_read(user):
+    """
+    Mark every personal notification read and move the broadcast cursor to
+    the newest broadcast; receipts below the cursor are no longer needed.
+
+    Returns:
+        int: Number of notifications that were unread
+    """
+    with transaction.atomic():
+        updated = Notification.objects.filter(recipient_id=user.id, is_read=False).update(
+            is_read=True, read_at=timezone.now(),
+        )
+        counters.notifications_read(user.id, updated)
+        latest_id = visible_broadcasts(user).aggregate(latest=Max('id'))['latest']
+        if latest_id and latest_id > get_broadcast_cursor(user):
+            newly_read = unread_broadcasts(user).filter(id__lte=latest_id).count()
+            BroadcastCursor.objects.update_or_create(user_id=user.id, defaults={'last_read_id': latest_id})
+            BroadcastReceipt.objects.filter(user_id=user.id, broadcast_id__lte=latest_id).delete()
+            counters.broadcasts_read(user.id, newly_read)
+            updated += newly_read
+        if updated:
+            stream.publish_unread_changed(user.id)
+    return updated
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BroadcastCursor',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='broadcast_cursor', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('last_read_id', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Broadcast Cursor',
+                'verbose_name_plural': 'Broadcast Cursors',
+            },
+        ),
+        migrations.CreateModel(
+            name='BroadcastNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('CREATE', 'Created'), ('UPDATE', 'Updated'), ('DELETE', 'Deleted'), ('PUBLISH', 'Published')], max_length=16)),
+                ('model', models.CharField(max_length=64)),
+                ('object_id', models.PositiveIntegerField()),
+                ('object_repr', models.CharField(max_length=200)),
+                ('details', models.TextField(blank=True)),
+                ('url', models.CharField(blank=True, max_length=300)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='triggered_broadcasts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Broadcast Notification',
+                'verbose_name_plural': 'Broadcast Notifications',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BroadcastReceipt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('read_at', models.DateTimeField(auto_now_add=True)),
+                ('broadcast', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='receipts', to='notifications.broadcastnotification')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='broadcast_receipts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Broadcast Receipt',
+                'verbose_name_plural': 'Broadcast Receipts',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='broadcastnotification',
+            index=models.Index(fields=['-created_at'], name='broadcast_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='broadcastreceipt',
+            constraint=models.UniqueConstraint(fields=('user', 'broadcast'), name='unique_broadcast_receipt'),
+        ),
+    ]
@@ -1,7 +1,22 @@
 from django.db import models
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.conf import settings
 from django.utils import timezone
 
+
+class NotificationQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        """bulk_create skips post_save, so count and push the new unread notifications here."""
+        from .counters import notifications_created
+        from .stream import publish_notifications
+
+        created = super().bulk_create(objs, *args, **kwargs)
+        notifications_created(notif.recipient_id for notif in created if not notif.is_read)
+        publish_notifications(created)
+        return created
+
+
 class Notification(models.Model):
     """
     Notification model to track user-specific notifications
@@ -54,6 +69,10 @@ class Notification(models.Model):
     # When the notification was created
     created_at = models.DateTimeField(auto_now_add=True)
     
+    is_broadcast = False
+    
+    objects = NotificationQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -77,17 +96,20 @@ class Notification(models.Model):
         return f"{self.actor} {self.get_action_display()} {self.model}: {self.object_repr}"
     
     def mark_as_read(self):
-        """Mark notification as read and invalidate cache"""
+        """Mark notification as read and decrement the recipient's unread counter"""
         if not self.is_read:
-            from django.core.cache import cache
+            from .counters import notifications_read
+            from .stream import publish_unread_changed
             
             self.is_read = True
             self.read_at = timezone.now()
-            self.save(update_fields=['is_read', 'read_at'])
-            
-            # Invalidate cache so user sees updated count immediately
-            cache_key = f'unread_notif_count_{self.recipient_id}'
-            cache.delete(cache_key)
+            # Conditional update, so concurrent requests decrement the counter once
+            updated = Notification.objects.filter(pk=self.pk, is_read=False).update(
+                is_read=True, read_at=self.read_at
+            )
+            notifications_read(self.recipient_id, updated)
+            if updated:
+                publish_unread_changed(self.recipient_id)
     
     def get_message(self):
         """Generate a human-readable notification message"""
@@ -100,3 +122,97 @@ class Notification(models.Model):
         }.get(self.action, self.action.lower())
         
         return f"{actor_name} {action_past} {self.model.lower()}: {self.object_repr}"
+
+
+
+@receiver(post_save, sender=Notification)
+def count_new_notification(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        from .counters import notifications_created
+        from .stream import publish_notifications
+        notifications_created([instance.recipient_id])
+        publish_notifications([instance])
+
+class BroadcastNotification(models.Model):
+    """
+    Notification addressed to every user (announcements), stored once.
+
+    Read state is tracked per user by BroadcastCursor (everything up to
+    last_read_id is read) plus a BroadcastReceipt for each broadcast read
+    above the cursor. Users see broadcasts created after they joined,
+    except the ones they triggered themselves.
+    """
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='triggered_broadcasts'
+    )
+    action = models.CharField(max_length=16, choices=Notification.ACTION_CHOICES)
+    model = models.CharField(max_length=64)
+    object_id = models.PositiveIntegerField()
+    object_repr = models.CharField(max_length=200)
+    details = models.TextField(blank=True)
+    url = models.CharField(max_length=300, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    is_broadcast = True
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='broadcast_date_idx'),
+        ]
+        verbose_name = 'Broadcast Notification'
+        verbose_name_plural = 'Broadcast Notifications'
+
+    def __str__(self):
+        return f"{self.actor} {self.get_action_display()} {self.model}: {self.object_repr}"
+
+    def get_message(self):
+        return Notification.get_message(self)
+
+
+class BroadcastCursor(models.Model):
+    """A user's watermark: every broadcast with id <= last_read_id is read."""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='broadcast_cursor'
+    )
+    last_read_id = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Broadcast Cursor'
+        verbose_name_plural = 'Broadcast Cursors'
+
+    def __str__(self):
+        return f"{self.user_id} read up to {self.last_read_id}"
+
+
+class BroadcastReceipt(models.Model):
+    """A broadcast read individually, above the user's cursor."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='broadcast_receipts'
+    )
+    broadcast = models.ForeignKey(
+        BroadcastNotification,
+        on_delete=models.CASCADE,
+        related_name='receipts'
+    )
+    read_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'broadcast'], name='unique_broadcast_receipt'),
+        ]
+        verbose_name = 'Broadcast Receipt'
+        verbose_name_plural = 'Broadcast Receipts'
+
+    def __str__(self):
+        return f"{self.user_id} read broadcast {self.broadcast_id}"
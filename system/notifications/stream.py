@@ -0,0 +1,223 @@
+"""
+Server-sent notification events.
+
+Writers publish to Redis pub/sub once their transaction commits: a message on
+the recipient's channel for personal notifications and read-state changes,
+and one message on the broadcast channel per announcement. Each open
+/notifications/stream/ connection (an async view, served by the separate
+ASGI stream process) subscribes to its user's channel and the broadcast
+channel and forwards every message as an SSE event, followed by the user's
+unread count from the unread counters.
+
+The stream process has its own host unless a proxy routes the path to it.
+Pages then open NOTIFICATION_STREAM_URL with a signed token (stream_url)
+instead of relying on the session cookie, which is not sent to another
+site.
+
+Events:
+    unread        {"count": n}
+    notification  {"id", "message", "details", "url", "created_at", "is_broadcast"}
+"""
+
+import json
+import logging
+import time
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.db import close_old_connections, transaction
+from django.utils.crypto import constant_time_compare
+
+from system.utils.cache_utils import _get_redis_client
+
+logger = logging.getLogger(__name__)
+
+BROADCAST_CHANNEL = 'notifications:broadcast'
+STREAM_TOKEN_SALT = 'notifications.stream'
+
+
+def user_channel(user_id):
+    return f'notifications:user:{user_id}'
+
+
+# ------------------------------------------------------------------
+# Publishing
+# ------------------------------------------------------------------
+
+def _publish(messages):
+    try:
+        client = _get_redis_client()
+        if client is None:
+            return
+        pipe = client.pipeline(transaction=False)
+        for channel, payload in messages:
+            pipe.publish(channel, json.dumps(payload))
+        pipe.execute()
+    except Exception as exc:
+        # Streams fall back to the count they read on connect; nothing is lost in the database
+        logger.warning("Notification stream publish skipped for %d message(s): %s", len(messages), exc)
+
+
+def publish(messages):
+    """Publish (channel, payload) pairs once the current transaction commits."""
+    messages = list(messages)
+    if messages:
+        transaction.on_commit(lambda: _publish(messages))
+
+
+def notification_payload(notification):
+    return {
+        'type': 'notification',
+        'id': f"broadcast/{notification.id}" if notification.is_broadcast else str(notification.id),
+        'actor_id': notification.actor_id,
+        'message': notification.get_message(),
+        'details': notification.details,
+        'url': notification.url,
+        'created_at': notification.created_at.isoformat() if notification.created_at else None,
+        'is_broadcast': notification.is_broadcast,
+    }
+
+
+def _with_actors(notifications):
+    """Attach actors loaded in one query, so get_message does not fetch one per row."""
+    from system.users.models import User
+
+    actors = User.objects.in_bulk({notif.actor_id for notif in notifications if notif.actor_id})
+    for notif in notifications:
+        notif.actor = actors.get(notif.actor_id)
+    return notifications
+
+
+def publish_notifications(notifications):
+    """Push new personal notifications to their recipients."""
+    notifications = _with_actors([notif for notif in notifications if not notif.is_read])
+    publish((user_channel(notif.recipient_id), notification_payload(notif)) for notif in notifications)
+
+
+def publish_broadcasts(broadcasts):
+    """Push new broadcasts to every open stream with one message each."""
+    publish((BROADCAST_CHANNEL, notification_payload(broadcast)) for broadcast in _with_actors(list(broadcasts)))
+
+
+def publish_unread_changed(user_id):
+    """Tell the user's open streams (other tabs included) to refresh the unread count."""
+    publish([(user_channel(user_id), {'type': 'unread'})])
+
+
+# ------------------------------------------------------------------
+# Streaming
+# ------------------------------------------------------------------
+
+# One pool per stream process; each open stream holds one of its connections
+_stream_pool = None
+
+
+def _get_stream_pool():
+    global _stream_pool
+    if _stream_pool is None:
+        import redis.asyncio as redis
+        _stream_pool = redis.ConnectionPool.from_url(settings.REDIS_URL)
+    return _stream_pool
+
+
+def format_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream_token(user):
+    """Signed credential for opening the stream from another origin."""
+    return signing.dumps({'u': user.pk, 'h': user.get_session_auth_hash()}, salt=STREAM_TOKEN_SALT)
+
+
+def stream_url(user):
+    """The URL pages open the stream at: a path on this site, or the stream host with a token."""
+    url = settings.NOTIFICATION_STREAM_URL
+    if url.startswith('/'):
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{urlencode({'token': stream_token(user)})}"
+
+
+def _token_user(token):
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import AnonymousUser
+
+    User = get_user_model()
+    try:
+        data = signing.loads(token, salt=STREAM_TOKEN_SALT, max_age=settings.NOTIFICATION_STREAM_TOKEN_SECONDS)
+        user = User.objects.get(pk=data['u'], is_active=True)
+    except (signing.BadSignature, KeyError, TypeError, User.DoesNotExist):
+        return AnonymousUser()
+    # A password change invalidates the token like it ends the sessions
+    if not constant_time_compare(user.get_session_auth_hash(), data['h']):
+        return AnonymousUser()
+    return user
+
+
+def load_stream_user(request):
+    """
+    The user of a stream request (from its token, or from the session), loaded
+    with the sync auth backends (social auth has no async ones). The database
+    connection is released before the stream starts.
+    """
+    from django.contrib.auth import get_user
+
+    try:
+        token = request.GET.get('token')
+        return _token_user(token) if token else get_user(request)
+    finally:
+        close_old_connections()
+
+
+def _unread_count(user):
+    from .counters import get_unread_count
+
+    try:
+        return get_unread_count(user)
+    finally:
+        close_old_connections()
+
+
+async def event_stream(user):
+    """
+    Yield SSE frames for ``user`` until the client disconnects or
+    NOTIFICATION_STREAM_MAX_SECONDS pass (EventSource then reconnects,
+    which re-checks the session).
+
+    Between messages the stream holds no database connection: each count
+    refresh closes the one it opened.
+    """
+    import redis.asyncio as redis
+
+    unread_count = sync_to_async(_unread_count)
+    client = redis.Redis(connection_pool=_get_stream_pool())
+    pubsub = client.pubsub()
+    deadline = time.monotonic() + settings.NOTIFICATION_STREAM_MAX_SECONDS
+    try:
+        await pubsub.subscribe(user_channel(user.id), BROADCAST_CHANNEL)
+        yield f"retry: {settings.NOTIFICATION_STREAM_RETRY_MS}\n\n"
+        yield format_event('unread', {'count': await unread_count(user)})
+
+        while time.monotonic() < deadline:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS,
+            )
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+
+            payload = json.loads(message['data'])
+            if payload.get('is_broadcast') and payload.get('actor_id') == user.id:
+                continue  # Users do not receive their own announcements
+            if payload['type'] != 'unread':
+                yield format_event(payload.pop('type'), payload)
+            yield format_event('unread', {'count': await unread_count(user)})
+    except Exception as exc:
+        logger.warning("Notification stream for user %s closed: %s", user.id, exc)
+    finally:
+        try:
+            await pubsub.aclose()
+            await client.aclose()
+        except Exception:
+            pass
@@ -0,0 +1,15 @@
+from WBPMISUESO.celery import app
+from system.notifications.counters import reconcile_unread_counters
+from system.notifications.utils import fan_out_notifications
+
+
+@app.task(ignore_result=True)
+def fan_out_log_notifications(log_entry_ids):
+    """Create the notifications for log entries committed by a request."""
+    return fan_out_notifications(log_entry_ids)
+
+
+@app.task
+def reconcile_notification_counters():
+    """Correct drift in the per-user unread counters."""
+    return reconcile_unread_counters()
@@ -1,3 +1,105 @@
-from django.test import TestCase
+from urllib.parse import parse_qs, urlsplit
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, RequestFactory, TestCase, override_settings
+from django_redis import get_redis_connection
+
+from system.users.models import User
+from .counters import broadcasts_created, get_counter_cache, get_unread_count, reconcile_unread_counters, unread_key
+from .models import BroadcastNotification, Notification
+from .stream import load_stream_user, stream_url
+
+STREAM_HOST_URL = 'https://stream.example.com/notifications/stream/'
+
+
+class NotificationStreamTests(TestCase):
+    """Opening the stream from the site, directly or on the stream host."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='faculty', email='faculty@example.com', password='pw')
+
+    def token_request(self, url):
+        token = parse_qs(urlsplit(url).query)['token'][0]
+        return RequestFactory().get('/notifications/stream/', {'token': token})
+
+    def test_same_origin_url_has_no_token(self):
+        self.assertEqual(stream_url(self.user), '/notifications/stream/')
+
+    @override_settings(NOTIFICATION_STREAM_URL=STREAM_HOST_URL)
+    def test_token_identifies_user(self):
+        url = stream_url(self.user)
+        self.assertTrue(url.startswith(STREAM_HOST_URL + '?token='))
+        self.assertEqual(load_stream_user(self.token_request(url)), self.user)
+
+    @override_settings(NOTIFICATION_STREAM_URL=STREAM_HOST_URL)
+    def test_password_change_revokes_token(self):
+        request = self.token_request(stream_url(self.user))
+        self.user.set_password('changed')
+        self.user.save()
+        self.assertFalse(load_stream_user(request).is_authenticated)
+
+    def test_tampered_token_is_rejected(self):
+        request = RequestFactory().get('/notifications/stream/', {'token': 'not-a-token'})
+        self.assertFalse(load_stream_user(request).is_authenticated)
+
+    def test_site_process_declines_stream(self):
+        self.client.force_login(self.user, backend='django.contrib.auth.backends.ModelBackend')
+        self.assertEqual(self.client.get('/notifications/stream/').status_code, 204)
+
+    @override_settings(NOTIFICATION_STREAM_URL=STREAM_HOST_URL, NOTIFICATION_STREAM_ALLOWED_ORIGINS=['https://site.example.com'])
+    async def test_stream_host_allows_site_origin(self):
+        url = await sync_to_async(stream_url)(self.user)
+        token = parse_qs(urlsplit(url).query)['token'][0]
+        client = AsyncClient()
+        response = await client.get('/notifications/stream/', {'token': token}, headers={'Origin': 'https://site.example.com'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Access-Control-Allow-Origin'], 'https://site.example.com')
+        [chunk async for chunk in response.streaming_content]
+
+        response = await client.get('/notifications/stream/', {'token': 'expired'})
+        self.assertEqual(response.status_code, 403)
+
+
+
+class UnreadCounterTests(TestCase):
+    """Counters follow creates and reads, and reconciliation repairs drift."""
+
+    def setUp(self):
+        get_redis_connection('counters').flushdb()
+        self.user = User.objects.create_user(username='faculty', email='faculty@example.com', password='pw')
+        self.actor = User.objects.create_user(username='ueso', email='ueso@example.com', password='pw')
+
+    def notify(self, count=1):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Notification.objects.bulk_create([
+                Notification(recipient=self.user, actor=self.actor, action='CREATE', model='Project',
+                             object_id=1, object_repr='Project')
+                for _ in range(count)
+            ])
+
+    def test_counters_follow_creates_and_reads(self):
+        self.assertEqual(get_unread_count(self.user), 0)  # Initialises the counters
+        notifications = self.notify(3)
+        self.assertEqual(get_counter_cache().get(unread_key(self.user.id)), 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            notifications[0].mark_as_read()
+            BroadcastNotification.objects.create(actor=self.actor, action='CREATE', model='Announcement',
+                                                 object_id=1, object_repr='Announcement')
+            broadcasts_created([self.actor.id])
+        with self.assertNumQueries(0):
+            self.assertEqual(get_unread_count(self.user), 3)  # Two notifications and the broadcast
+
+    def test_increments_skip_missing_counters(self):
+        self.notify(2)
+        self.assertIsNone(get_counter_cache().get(unread_key(self.user.id)))
+        self.assertEqual(get_unread_count(self.user), 2)
+
+    def test_reconcile_repairs_drift(self):
+        self.notify(2)
+        get_unread_count(self.user)
+        get_counter_cache().set(unread_key(self.user.id), 7, timeout=None)
+        result = reconcile_unread_counters()
+        self.assertEqual(result['users'], 2)
+        self.assertGreaterEqual(result['rewritten'], 1)
+        self.assertEqual(get_unread_count(self.user), 2)
+        self.assertEqual(reconcile_unread_counters()['rewritten'], 0)
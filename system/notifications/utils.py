@@ -2,19 +2,35 @@
 Utility functions for creating notifications based on log entries
 """
 import logging
+import threading
 
+from django.conf import settings
 from django.utils import timezone
-from django.core.cache import cache
-from .models import Notification
+
+from system.utils.commit_hooks import mark_dispatched, on_commit_once
+from .models import BroadcastNotification, Notification
 
 
 logger = logging.getLogger(__name__)
 
+# Log entries waiting for this thread's transaction to commit before their fan-out
+_fanout_state = threading.local()
+
+
+def _pending_fanout():
+    if not hasattr(_fanout_state, 'log_entry_ids'):
+        _fanout_state.log_entry_ids = []
+    return _fanout_state.log_entry_ids
+
 
 def create_notifications_from_log(log_entry):
     """
-    Create notifications for relevant users based on a log entry
-    Uses bulk_create for better performance when creating multiple notifications
+    Stamp a notification log entry and queue its fan-out.
+
+    Notifications are created by fan_out_notifications, in a Celery task
+    dispatched once the surrounding transaction commits (or right away
+    when NOTIFICATION_FANOUT_EAGER is set), so a publish to the whole
+    userbase does not hold up the request.
     """
     if not log_entry.is_notification:
         return
@@ -23,14 +39,143 @@ def create_notifications_from_log(log_entry):
     log_entry.notification_date = timezone.now()
     log_entry.save(update_fields=['notification_date'])
     
+    queue_notification_fanout([log_entry.id])
+
+
+def queue_notification_fanout(log_entry_ids):
+    """
+    Add log entries to this transaction's fan-out batch. Every entry logged
+    before the commit goes out in one task.
+    """
+    _pending_fanout().extend(log_entry_ids)
+    on_commit_once(dispatch_notification_fanout)
+
+
+def dispatch_notification_fanout():
+    """Send the pending log entries to the fan-out task (inline if the broker is unreachable)."""
+    mark_dispatched(dispatch_notification_fanout)
+    pending = _pending_fanout()
+    log_entry_ids = list(dict.fromkeys(pending))
+    pending.clear()
+    if not log_entry_ids:
+        return
+
+    if settings.NOTIFICATION_FANOUT_EAGER:
+        fan_out_notifications(log_entry_ids)
+        return
+
+    from .tasks import fan_out_log_notifications
+    try:
+        fan_out_log_notifications.apply_async(args=[log_entry_ids], retry=False)
+    except Exception as exc:
+        logger.warning("Notification fan-out task not queued (%s); fanning out inline", exc)
+        fan_out_notifications(log_entry_ids)
+
+
+def fan_out_notifications(log_entry_ids):
+    """
+    Create the notifications for the given log entries.
+
+    Recipient IDs are streamed from the database and inserted in chunks of
+    NOTIFICATION_FANOUT_CHUNK_SIZE, so memory stays flat. Announcements
+    become one BroadcastNotification each instead of a row per user.
+    Entries that no longer exist (rolled back or deleted) are skipped.
+
+    Returns:
+        int: Number of notifications created
+    """
+    from system.logs.models import LogEntry
+
+    chunk_size = settings.NOTIFICATION_FANOUT_CHUNK_SIZE
+    log_entries = list(LogEntry.objects.filter(id__in=log_entry_ids, is_notification=True).order_by('id'))
+    created = len(create_broadcasts(log_entries))
+    for log_entry in log_entries:
+        if is_broadcast_log(log_entry):
+            continue
+        chunk = []
+        for recipient_id in get_notification_recipient_ids(log_entry):
+            if recipient_id == log_entry.user_id:
+                continue  # Don't notify the actor about their own action
+            chunk.append(recipient_id)
+            if len(chunk) >= chunk_size:
+                created += _insert_notifications(log_entry, chunk)
+                chunk = []
+        if chunk:
+            created += _insert_notifications(log_entry, chunk)
+
+    return created
+
+
+def _insert_notifications(log_entry, recipient_ids):
+    Notification.objects.bulk_create(build_notifications_for_log(log_entry, recipient_ids))
+    return len(recipient_ids)
+
+
+def create_notifications_from_logs(log_entries):
+    """
+    Create notifications for log entries that were bulk-inserted (no post_save signal).
+    All notifications are written with one bulk_create.
+    The entries' notification_date must already be set.
+    """
+    log_entries = [log_entry for log_entry in log_entries if log_entry.is_notification]
+    broadcasts = create_broadcasts(log_entries)
+
+    notifications_to_create = []
+    recipients_by_object = {}
+    for log_entry in log_entries:
+        if is_broadcast_log(log_entry):
+            continue
+        # Entries about the same object and action share their recipients
+        key = (log_entry.model, log_entry.action, log_entry.object_id)
+        if key not in recipients_by_object:
+            recipients_by_object[key] = list(get_notification_recipient_ids(log_entry))
+        notifications_to_create.extend(build_notifications_for_log(log_entry, recipients_by_object[key]))
+
+    if not notifications_to_create:
+        return broadcasts
+
+    created_notifications = Notification.objects.bulk_create(notifications_to_create, batch_size=500)
+    return broadcasts + created_notifications
+
+
+def is_broadcast_log(log_entry):
+    """Announcements go to every user, so they are stored once as a broadcast."""
+    return log_entry.model == 'Announcement' and log_entry.action in ['CREATE', 'PUBLISH']
+
+
+def create_broadcasts(log_entries):
+    """Create one BroadcastNotification per announcement log entry."""
+    from .counters import broadcasts_created
+    from .stream import publish_broadcasts
+
+    broadcasts = BroadcastNotification.objects.bulk_create([
+        BroadcastNotification(
+            actor_id=log_entry.user_id,
+            action=log_entry.action,
+            model=log_entry.model,
+            object_id=log_entry.object_id,
+            object_repr=log_entry.object_repr,
+            details=log_entry.details,
+            url=log_entry.url,
+        )
+        for log_entry in log_entries
+        if is_broadcast_log(log_entry)
+    ])
+    broadcasts_created([broadcast.actor_id for broadcast in broadcasts])
+    publish_broadcasts(broadcasts)
+    return broadcasts
+
+
+def build_notifications_for_log(log_entry, recipient_ids=None):
+    """Return unsaved notifications for a log entry's recipients (skipping the actor)."""
     # Determine recipients based on model type and action
-    recipients = get_notification_recipients(log_entry)
-    
-    # Prepare notifications for bulk creation (skip actor)
-    notifications_to_create = [
+    if recipient_ids is None:
+        recipient_ids = get_notification_recipient_ids(log_entry)
+
+    return [
         Notification(
-            recipient=recipient,
-            actor=log_entry.user,
+            recipient_id=recipient_id,
+            actor_id=log_entry.user_id,
             action=log_entry.action,
             model=log_entry.model,
             object_id=log_entry.object_id,
@@ -38,47 +183,37 @@ def create_notifications_from_log(log_entry):
             details=log_entry.details,
             url=log_entry.url,
         )
-        for recipient in recipients
-        if recipient != log_entry.user  # Don't notify the actor about their own action
+        for recipient_id in recipient_ids
+        if recipient_id != log_entry.user_id  # Don't notify the actor about their own action
     ]
-    
-    # Bulk create all notifications at once (much faster for multiple recipients)
-    if notifications_to_create:
-        created_notifications = Notification.objects.bulk_create(
-            notifications_to_create, 
-            batch_size=100
-        )
-        
-        # Invalidate cache for all recipients so they see updated counts
-        cache_keys = [f'unread_notif_count_{notif.recipient_id}' for notif in notifications_to_create]
-        for cache_key in set(cache_keys):
-            try:
-                cache.delete(cache_key)
-            except Exception as exc:
-                # Redis can be unavailable during local bootstrap; notifications are still persisted.
-                logger.warning("Skipping cache invalidation for %s: %s", cache_key, exc)
-        
-        return created_notifications
-    
-    return []
 
 
-def get_notification_recipients(log_entry):
+def _active_user_ids(**filters):
+    from system.users.models import User
+    return User.objects.filter(is_confirmed=True, is_active=True, **filters).values_list('id', flat=True)
+
+
+def _supervisor_ids():
+    """UESO, Director and VP accounts."""
+    return _active_user_ids(role__in=['UESO', 'DIRECTOR', 'VP'])
+
+
+def get_notification_recipient_ids(log_entry):
     """
-    Determine who should receive notifications based on the log entry
+    Determine who should receive notifications based on the log entry.
+
+    Announcements are not addressed per user; see create_broadcasts.
+
+    Returns:
+        list: Distinct recipient user IDs
     """
-    from system.users.models import User
-    
-    recipients = []
     model = log_entry.model
     action = log_entry.action
     
-    # Announcement - notify all confirmed users
-    if model == 'Announcement' and action in ['CREATE', 'PUBLISH']:
-        recipients = User.objects.filter(is_confirmed=True, is_active=True)
+    recipients = []
     
     # Project actions
-    elif model == 'Project':
+    if model == 'Project':
         recipients = get_project_notification_recipients(log_entry)
     
     # Submission actions
@@ -101,16 +236,15 @@ def get_notification_recipients(log_entry):
     elif model == 'User' and action == 'UPDATE':
         recipients = get_user_update_notification_recipients(log_entry)
     
-    return list(set(recipients))  # Remove duplicates
+    return list(dict.fromkeys(recipient_id for recipient_id in recipients if recipient_id))  # Remove duplicates
 
 
 def get_project_notification_recipients(log_entry):
     """
-    Get recipients for project notifications
+    Get recipient user IDs for project notifications
     Director added Faculty & Implementer in a Project → Faculty & Implementer will be notified
     """
     from shared.projects.models import Project
-    from system.users.models import User
     
     recipients = []
     
@@ -118,11 +252,7 @@ def get_project_notification_recipients(log_entry):
     # So we notify all admin roles (UESO, Director, VP) who performed the action
     if log_entry.action == 'DELETE':
         # Notify UESO, Director, VP (admins who can see this happened)
-        supervisors = User.objects.filter(
-            role__in=['UESO', 'DIRECTOR', 'VP'],
-            is_confirmed=True,
-            is_active=True
-        )
+        supervisors = _supervisor_ids()
         recipients.extend(supervisors)
         # Note: Project members were already notified via the log entry details
         # which includes all involved users when the delete view created the log
@@ -135,38 +265,25 @@ def get_project_notification_recipients(log_entry):
         
         # Notify project leader
         if project.project_leader:
-            recipients.append(project.project_leader)
+            recipients.append(project.project_leader_id)
         
         # Notify all providers (Faculty & Implementers)
-        recipients.extend(project.providers.all())
+        recipients.extend(provider.id for provider in project.providers.all())
         
         # For CREATE/UPDATE, also notify supervisors (Coordinator, Dean, Program Head, UESO, Director, VP)
         if log_entry.action in ['CREATE', 'UPDATE']:
             # Get coordinator of the same college as the project leader
-            if project.project_leader and project.project_leader.college:
-                coordinators = User.objects.filter(
-                    role='COORDINATOR',
-                    college=project.project_leader.college,
-                    is_confirmed=True,
-                    is_active=True
-                )
+            if project.project_leader and project.project_leader.college_id:
+                coordinators = _active_user_ids(role='COORDINATOR', college_id=project.project_leader.college_id)
                 recipients.extend(coordinators)
             
             # Notify UESO, Director, VP
-            supervisors = User.objects.filter(
-                role__in=['UESO', 'DIRECTOR', 'VP'],
-                is_confirmed=True,
-                is_active=True
-            )
+            supervisors = _supervisor_ids()
             recipients.extend(supervisors)
         
     except Project.DoesNotExist:
         # If project doesn't exist, only notify admins
-        supervisors = User.objects.filter(
-            role__in=['UESO', 'DIRECTOR', 'VP'],
-            is_confirmed=True,
-            is_active=True
-        )
+        supervisors = _supervisor_ids()
         recipients.extend(supervisors)
     
     return recipients
@@ -174,13 +291,12 @@ def get_project_notification_recipients(log_entry):
 
 def get_submission_notification_recipients(log_entry):
     """
-    Get recipients for submission notifications
+    Get recipient user IDs for submission notifications
     - Director added Submission in Project → Faculty & Implementer will be notified
     - Faculty submitted Submission → Coordinator (of the same college) will be notified
     - Coordinator forwarded to UESO → UESO, Director, VP will be notified
     """
     from internal.submissions.models import Submission
-    from system.users.models import User
     
     recipients = []
     
@@ -188,11 +304,7 @@ def get_submission_notification_recipients(log_entry):
     # So we notify all admin roles (UESO, Director, VP) who can see this happened
     if log_entry.action == 'DELETE':
         # Notify UESO, Director, VP (admins who can see this happened)
-        supervisors = User.objects.filter(
-            role__in=['UESO', 'DIRECTOR', 'VP'],
-            is_confirmed=True,
-            is_active=True
-        )
+        supervisors = _supervisor_ids()
         recipients.extend(supervisors)
         # Note: Project members were already notified via the log entry details
         return recipients
@@ -210,61 +322,43 @@ def get_submission_notification_recipients(log_entry):
         if log_entry.action == 'CREATE':
             # Notify project leader
             if project.project_leader:
-                recipients.append(project.project_leader)
+                recipients.append(project.project_leader_id)
             # Notify all providers
-            recipients.extend(project.providers.all())
+            recipients.extend(provider.id for provider in project.providers.all())
         
         # If submission was updated (could be faculty submitting, coordinator reviewing, etc.)
         elif log_entry.action == 'UPDATE':
             # Check the status to determine who to notify
             if submission.status == 'SUBMITTED':
                 # Faculty submitted → notify coordinator of same college
-                if project.project_leader and project.project_leader.college:
-                    coordinators = User.objects.filter(
-                        role='COORDINATOR',
-                        college=project.project_leader.college,
-                        is_confirmed=True,
-                        is_active=True
-                    )
+                if project.project_leader and project.project_leader.college_id:
+                    coordinators = _active_user_ids(role='COORDINATOR', college_id=project.project_leader.college_id)
                     recipients.extend(coordinators)
             
             elif submission.status == 'FORWARDED':
                 # Coordinator forwarded → notify UESO, Director, VP
-                supervisors = User.objects.filter(
-                    role__in=['UESO', 'DIRECTOR', 'VP'],
-                    is_confirmed=True,
-                    is_active=True
-                )
+                supervisors = _supervisor_ids()
                 recipients.extend(supervisors)
             
             elif submission.status == 'REVISION_REQUESTED':
                 # Coordinator requested revision → notify project leader and providers
                 if project.project_leader:
-                    recipients.append(project.project_leader)
-                recipients.extend(project.providers.all())
+                    recipients.append(project.project_leader_id)
+                recipients.extend(provider.id for provider in project.providers.all())
             
             elif submission.status in ['APPROVED', 'REJECTED']:
                 # UESO/Director/VP approved/rejected → notify project leader, providers, and coordinator
                 if project.project_leader:
-                    recipients.append(project.project_leader)
-                recipients.extend(project.providers.all())
+                    recipients.append(project.project_leader_id)
+                recipients.extend(provider.id for provider in project.providers.all())
                 
-                if project.project_leader and project.project_leader.college:
-                    coordinators = User.objects.filter(
-                        role='COORDINATOR',
-                        college=project.project_leader.college,
-                        is_confirmed=True,
-                        is_active=True
-                    )
+                if project.project_leader and project.project_leader.college_id:
+                    coordinators = _active_user_ids(role='COORDINATOR', college_id=project.project_leader.college_id)
                     recipients.extend(coordinators)
         
     except Submission.DoesNotExist:
         # If submission doesn't exist, only notify admins
-        supervisors = User.objects.filter(
-            role__in=['UESO', 'DIRECTOR', 'VP'],
-            is_confirmed=True,
-            is_active=True
-        )
+        supervisors = _supervisor_ids()
         recipients.extend(supervisors)
     
     return recipients
@@ -272,7 +366,7 @@ def get_submission_notification_recipients(log_entry):
 
 def get_meeting_event_notification_recipients(log_entry):
     """
-    Get recipients for meeting event notifications
+    Get recipient user IDs for meeting event notifications
     Notify all participants
     """
     from shared.event_calendar.models import MeetingEvent
@@ -280,9 +374,9 @@ def get_meeting_event_notification_recipients(log_entry):
     recipients = []
     
     try:
-        meeting = MeetingEvent.objects.prefetch_related('participants').get(id=log_entry.object_id)
+        meeting = MeetingEvent.objects.get(id=log_entry.object_id)
         # Notify all participants
-        recipients.extend(meeting.participants.all())
+        recipients.extend(meeting.participants.values_list('id', flat=True))
     except MeetingEvent.DoesNotExist:
         pass
     
@@ -291,40 +385,31 @@ def get_meeting_event_notification_recipients(log_entry):
 
 def get_export_request_notification_recipients(log_entry):
     """
-    Get recipients for export request notifications
+    Get recipient user IDs for export request notifications
     - CREATE: Notify UESO, Director, VP who can approve/reject
     - UPDATE (status change): Notify the requester + UESO, Director, VP
     """
     from system.exports.models import ExportRequest
-    from system.users.models import User
     
     recipients = []
     
     try:
-        export_request = ExportRequest.objects.select_related('submitted_by').get(
+        export_request = ExportRequest.objects.only('submitted_by').get(
             id=log_entry.object_id
         )
         
         if log_entry.action == 'CREATE':
             # Notify those who can approve (UESO, Director, VP)
-            approvers = User.objects.filter(
-                role__in=['UESO', 'DIRECTOR', 'VP'],
-                is_confirmed=True,
-                is_active=True
-            )
+            approvers = _supervisor_ids()
             recipients.extend(approvers)
         
         elif log_entry.action == 'UPDATE':
             # Notify the requester about status changes (APPROVED/REJECTED)
-            if export_request.submitted_by:
-                recipients.append(export_request.submitted_by)
+            if export_request.submitted_by_id:
+                recipients.append(export_request.submitted_by_id)
             
             # Also notify UESO, Director, VP about the status change
-            approvers = User.objects.filter(
-                role__in=['UESO', 'DIRECTOR', 'VP'],
-                is_confirmed=True,
-                is_active=True
-            )
+            approvers = _supervisor_ids()
             recipients.extend(approvers)
         
     except ExportRequest.DoesNotExist:
@@ -335,39 +420,30 @@ def get_export_request_notification_recipients(log_entry):
 
 def get_client_request_notification_recipients(log_entry):
     """
-    Get recipients for client request notifications
+    Get recipient user IDs for client request notifications
     Notify relevant parties based on status changes
     """
     from shared.request.models import ClientRequest
-    from system.users.models import User
     
     recipients = []
     
     try:
-        client_request = ClientRequest.objects.select_related('submitted_by').get(
+        client_request = ClientRequest.objects.only('submitted_by').get(
             id=log_entry.object_id
         )
         
         if log_entry.action == 'CREATE':
             # New client request → notify UESO, Director, VP
-            supervisors = User.objects.filter(
-                role__in=['UESO', 'DIRECTOR', 'VP'],
-                is_confirmed=True,
-                is_active=True
-            )
+            supervisors = _supervisor_ids()
             recipients.extend(supervisors)
         
         elif log_entry.action == 'UPDATE':
             # Status changed → notify the client who submitted
-            if client_request.submitted_by:
-                recipients.append(client_request.submitted_by)
+            if client_request.submitted_by_id:
+                recipients.append(client_request.submitted_by_id)
             
             # Also notify UESO, Director, VP
-            supervisors = User.objects.filter(
-                role__in=['UESO', 'DIRECTOR', 'VP'],
-                is_confirmed=True,
-                is_active=True
-            )
+            supervisors = _supervisor_ids()
             recipients.extend(supervisors)
         
     except ClientRequest.DoesNotExist:
@@ -378,17 +454,14 @@ def get_client_request_notification_recipients(log_entry):
 
 def get_user_update_notification_recipients(log_entry):
     """
-    Get recipients for user update notifications
+    Get recipient user IDs for user update notifications
     Notify the user who was updated (for role changes, confirmations, etc.)
     """
     from system.users.models import User
     
     recipients = []
     
-    try:
-        user = User.objects.get(id=log_entry.object_id)
-        recipients.append(user)
-    except User.DoesNotExist:
-        pass
+    if User.objects.filter(id=log_entry.object_id).exists():
+        recipients.append(log_entry.object_id)
     
     return recipients
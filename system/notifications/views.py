@@ -1,9 +1,19 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.views import redirect_to_login
 from django.views.decorators.http import require_POST
 from django.core.paginator import Paginator
 from .models import Notification
+from .stream import event_stream, load_stream_user
+from .feed import (
+    get_notification_feed, get_unread_notification_count, load_feed_items,
+    mark_all_notifications_read, mark_broadcast_read, visible_broadcasts,
+)
 
 
 def get_role_constants():
@@ -32,28 +42,17 @@ def notification_list(request):
     # Get filter parameter
     filter_type = request.GET.get('filter', 'all')  # all, unread, read
     
-    # Get all notifications for the current user
-    notifications = Notification.objects.filter(recipient=request.user).select_related('actor')
-    
-    # Apply filter
-    if filter_type == 'unread':
-        notifications = notifications.filter(is_read=False)
-    elif filter_type == 'read':
-        notifications = notifications.filter(is_read=True)
+    # Personal notifications and broadcasts, merged in one query
+    notifications = get_notification_feed(request.user, filter_type)
     
     # Pagination
     page_number = request.GET.get('page', 1)
     paginator = Paginator(notifications, 20)  # 20 notifications per page
     page_obj = paginator.get_page(page_number)
+    page_obj.object_list = load_feed_items(page_obj.object_list)
     
     # Count unread notifications (use cache)
-    from django.core.cache import cache
-    cache_key = f'unread_notif_count_{request.user.id}'
-    unread_count = cache.get(cache_key)
-    
-    if unread_count is None:
-        unread_count = Notification.objects.filter(recipient=request.user, is_read=False).count()
-        cache.set(cache_key, unread_count, 300)
+    unread_count = get_unread_notification_count(request.user)
 
     context = {
         'base_template': base_template,
@@ -85,26 +84,26 @@ def mark_as_read(request, notification_id):
     })
 
 
+@login_required
+@require_POST
+def mark_broadcast_as_read(request, broadcast_id):
+    """Mark a single broadcast (announcement) notification as read"""
+    broadcast = get_object_or_404(visible_broadcasts(request.user), id=broadcast_id)
+    mark_broadcast_read(request.user, broadcast)
+    
+    return JsonResponse({
+        'success': True,
+        'notification_id': f'broadcast/{broadcast_id}',
+        'is_read': True
+    })
+
+
 @login_required
 @require_POST
 def mark_all_as_read(request):
     """Mark all notifications as read for the current user"""
-    from django.utils import timezone
-    from django.core.cache import cache
-    now = timezone.now()
-    
-    # Update all unread notifications in a single query
-    updated_count = Notification.objects.filter(
-        recipient=request.user, 
-        is_read=False
-    ).update(
-        is_read=True,
-        read_at=now
-    )
-    
-    # Invalidate cache so user sees updated count immediately
-    cache_key = f'unread_notif_count_{request.user.id}'
-    cache.delete(cache_key)
+    # One update for personal notifications, one cursor move for broadcasts
+    updated_count = mark_all_notifications_read(request.user)
     
     return JsonResponse({
         'success': True,
@@ -115,16 +114,7 @@ def mark_all_as_read(request):
 @login_required
 def get_unread_count(request):
     """Get count of unread notifications (for AJAX requests)"""
-    from django.core.cache import cache
-    
-    # Try cache first
-    cache_key = f'unread_notif_count_{request.user.id}'
-    count = cache.get(cache_key)
-    
-    if count is None:
-        # Cache miss - query database
-        count = Notification.objects.filter(recipient=request.user, is_read=False).count()
-        cache.set(cache_key, count, 300)  # Cache for 5 minutes
+    count = get_unread_notification_count(request.user)
     
     return JsonResponse({
         'count': count
@@ -134,18 +124,15 @@ def get_unread_count(request):
 @login_required
 def get_recent_notifications(request):
     """Get recent notifications (for dropdown/badge)"""
-    from django.core.cache import cache
-    
     limit = int(request.GET.get('limit', 5))
     
-    notifications = Notification.objects.filter(
-        recipient=request.user
-    ).select_related('actor')[:limit]
+    notifications = load_feed_items(get_notification_feed(request.user)[:limit])
     
     data = []
     for notif in notifications:
         data.append({
-            'id': notif.id,
+            'id': notif.feed_key,
+            'is_broadcast': notif.is_broadcast,
             'message': notif.get_message(),
             'url': notif.url,
             'is_read': notif.is_read,
@@ -154,14 +141,31 @@ def get_recent_notifications(request):
         })
     
     # Use cached count
-    cache_key = f'unread_notif_count_{request.user.id}'
-    unread_count = cache.get(cache_key)
-    
-    if unread_count is None:
-        unread_count = Notification.objects.filter(recipient=request.user, is_read=False).count()
-        cache.set(cache_key, unread_count, 300)
+    unread_count = get_unread_notification_count(request.user)
     
     return JsonResponse({
         'notifications': data,
         'unread_count': unread_count
     })
+
+
+async def notification_stream(request):
+    """Server-sent events with new notifications and unread counts (served by the ASGI stream process)"""
+    if not isinstance(request, ASGIRequest):
+        # The WSGI site would hold a thread for the whole stream and send it
+        # all at the end; 204 tells EventSource not to reconnect
+        return HttpResponse(status=204)
+    user = await sync_to_async(load_stream_user)(request)
+    if not user.is_authenticated:
+        if 'token' in request.GET:
+            return HttpResponseForbidden()  # Expired or revoked: EventSource stops until the next page load
+        return redirect_to_login(request.get_full_path())
+    response = StreamingHttpResponse(event_stream(user), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop proxies from buffering the stream
+    # Pages of the site open it from their own origin when the stream has its own host
+    origin = request.headers.get('Origin')
+    if origin and origin in settings.NOTIFICATION_STREAM_ALLOWED_ORIGINS:
+        response['Access-Control-Allow-Origin'] = origin
+        patch_vary_headers(response, ['Origin'])
+    return response
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderDispatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('MEETING', 'Meeting'), ('ACTIVITY', 'Project Activity')], max_length=16)),
+                ('event_id', models.PositiveIntegerField()),
+                ('reminder', models.CharField(choices=[('3_DAYS', '3 Days Before'), ('DAY_OF', 'Day Of')], max_length=16)),
+                ('event_date', models.DateField()),
+                ('run_id', models.UUIDField(db_index=True)),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminder_dispatches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Reminder Dispatch',
+                'verbose_name_plural': 'Reminder Dispatches',
+                'indexes': [models.Index(fields=['event_date'], name='reminder_event_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'event_type', 'event_id', 'reminder', 'event_date'), name='unique_reminder_dispatch')],
+            },
+        ),
+    ]
@@ -1,4 +1,48 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
-# This app handles scheduled tasks and does not have database models
+
+class ReminderDispatch(models.Model):
+    """
+    One event reminder delivered to one user.
+
+    send_event_reminders claims a row per (user, event, reminder, event date)
+    before queueing the email, so reruns (beat, the Celery startup hook,
+    manual runs) never send the same reminder twice. A rescheduled event
+    gets a new event_date and is reminded again.
+    """
+    EVENT_TYPE_CHOICES = [
+        ('MEETING', 'Meeting'),
+        ('ACTIVITY', 'Project Activity'),
+    ]
+
+    REMINDER_CHOICES = [
+        ('3_DAYS', '3 Days Before'),
+        ('DAY_OF', 'Day Of'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='reminder_dispatches')
+    event_type = models.CharField(max_length=16, choices=EVENT_TYPE_CHOICES)
+    event_id = models.PositiveIntegerField()
+    reminder = models.CharField(max_length=16, choices=REMINDER_CHOICES)
+    event_date = models.DateField()
+
+    # Run that claimed the row: lets concurrent runs tell which inserts were theirs
+    run_id = models.UUIDField(db_index=True)
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Reminder Dispatch'
+        verbose_name_plural = 'Reminder Dispatches'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'event_type', 'event_id', 'reminder', 'event_date'],
+                name='unique_reminder_dispatch',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['event_date'], name='reminder_event_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_reminder_display()} {self.get_event_type_display()} #{self.event_id} -> user {self.user_id}"
@@ -1,62 +1,63 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from django.utils import timezone
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q
 from datetime import timedelta
 from django.core.management import call_command
 from pytz import timezone as pytz_timezone
 
+from .transitions import TransitionRun, bulk_transition, create_log_entries
+
 
 def publish_scheduled_announcements():
     """
     Check and publish announcements that are scheduled and past their scheduled time.
     Runs every minute to ensure announcements are published on time.
+
+    Returns:
+        dict: Rows transitioned and elapsed time (see TransitionRun.report)
     """
     from shared.announcements.models import Announcement
     from system.logs.models import LogEntry
     from django.urls import reverse
     
     now = timezone.now()
+    run = TransitionRun('publish_scheduled_announcements')
     
-    # Find announcements that are scheduled and past their scheduled time
-    scheduled_announcements = Announcement.objects.filter(
-        is_scheduled=True,
-        scheduled_at__lte=now,
-        published_at__isnull=True
-    )
-    
-    count = 0
-    for announcement in scheduled_announcements:
-        try:
-            # Publish the announcement
-            announcement.is_scheduled = False
-            announcement.published_at = now
-            announcement.published_by = announcement.scheduled_by
-            
-            # Set flag to skip duplicate log entries from signal
-            announcement._skip_log = True
-            announcement.save()
-            
-            # Create log entry for notification system
-            url = reverse('announcement_details', args=[announcement.id])
-            LogEntry.objects.create(
-                user=announcement.published_by,
+    try:
+        # Publish every announcement that is scheduled and past its scheduled time in one UPDATE
+        published_ids = bulk_transition(
+            Announcement.objects.filter(
+                is_scheduled=True,
+                scheduled_at__lte=now,
+                published_at__isnull=True
+            ),
+            is_scheduled=False,
+            published_at=now,
+            published_by=F('scheduled_by'),
+        )
+        run.record('published', published_ids)
+        
+        # Log entries for the notification system, written in one batch
+        published = Announcement.objects.filter(id__in=published_ids).values_list('id', 'title', 'published_by_id')
+        create_log_entries([
+            LogEntry(
+                user_id=published_by_id,
                 action='CREATE',
                 model='Announcement',
-                object_id=announcement.id,
-                object_repr=announcement.title,
+                object_id=announcement_id,
+                object_repr=title,
                 details="A new announcement has been published",
-                url=url,
+                url=reverse('announcement_details', args=[announcement_id]),
                 is_notification=True
             )
-            
-            print(f"✓ Auto-published: {announcement.title}")
-            count += 1
-            
-        except Exception as e:
-            print(f"✗ Failed to publish announcement '{announcement.title}': {str(e)}")
+            for announcement_id, title, published_by_id in published
+        ])
+    
+    except Exception as e:
+        print(f"✗ Failed to publish scheduled announcements: {str(e)}")
     
-    if count > 0:
-        print(f"✓ Published {count} scheduled announcement(s) at {now.strftime('%Y-%m-%d %H:%M:%S')}")
+    return run.report()
 
 
 def clear_expired_sessions():
@@ -77,84 +78,40 @@ def update_event_statuses():
     - SCHEDULED -> ONGOING when event date is today
     - ONGOING -> COMPLETED when event date is in the past
     
+    Each change is one UPDATE per model; status changes are not logged.
     Runs daily at midnight.
+
+    Returns:
+        dict: Rows transitioned and elapsed time (see TransitionRun.report)
     """
     from shared.event_calendar.models import MeetingEvent
     from shared.projects.models import ProjectEvent
     
     today = timezone.now().date()
-    count_ongoing = 0
-    count_completed = 0
+    run = TransitionRun('update_event_statuses')
     
     try:
-        # Update MeetingEvent statuses
-        # SCHEDULED -> ONGOING (events today)
-        meetings_to_ongoing = MeetingEvent.objects.filter(
-            status='SCHEDULED',
-            datetime__date=today
-        )
-        
-        for meeting in meetings_to_ongoing:
-            try:
-                meeting.status = 'ONGOING'
-                meeting._skip_log = True  # Skip duplicate log entries
-                meeting.save()
-                count_ongoing += 1
-                print(f"✓ Meeting now ongoing: {meeting.title}")
-            except Exception as e:
-                print(f"✗ Failed to update meeting '{meeting.title}': {str(e)}")
-        
-        # ONGOING -> COMPLETED (events in the past)
-        meetings_to_complete = MeetingEvent.objects.filter(
-            status='ONGOING',
-            datetime__date__lt=today
-        )
-        
-        for meeting in meetings_to_complete:
-            try:
-                meeting.status = 'COMPLETED'
-                meeting._skip_log = True  # Skip duplicate log entries
-                meeting.save()
-                count_completed += 1
-                print(f"✓ Meeting completed: {meeting.title}")
-            except Exception as e:
-                print(f"✗ Failed to complete meeting '{meeting.title}': {str(e)}")
-        
-        # Update ProjectEvent statuses
-        # SCHEDULED -> ONGOING (events today)
-        project_events_to_ongoing = ProjectEvent.objects.filter(
-            status='SCHEDULED',
-            datetime__date=today
-        )
-        
-        for event in project_events_to_ongoing:
-            try:
-                event.status = 'ONGOING'
-                event.save()
-                count_ongoing += 1
-                print(f"✓ Project event now ongoing: {event.title}")
-            except Exception as e:
-                print(f"✗ Failed to update project event '{event.title}': {str(e)}")
-        
-        # ONGOING -> COMPLETED (events in the past)
-        project_events_to_complete = ProjectEvent.objects.filter(
-            status='ONGOING',
-            datetime__date__lt=today
-        )
-        
-        for event in project_events_to_complete:
-            try:
-                event.status = 'COMPLETED'
-                event.save()
-                count_completed += 1
-            except Exception as e:
-                pass
-
-        if count_ongoing > 0 or count_completed > 0:
-            print(f"✓ Updated event statuses at {timezone.now().strftime('%Y-%m-%d %H:%M:%S')}: {count_ongoing} ongoing, {count_completed} completed")
+        for model, label in ((MeetingEvent, 'meetings'), (ProjectEvent, 'project events')):
+            # SCHEDULED -> ONGOING (events today)
+            ids = bulk_transition(
+                model.objects.filter(status='SCHEDULED', datetime__date=today),
+                status='ONGOING',
+                updated_at=timezone.now(),
+            )
+            run.record(f'{label} ongoing', ids)
+            
+            # ONGOING -> COMPLETED (events in the past)
+            ids = bulk_transition(
+                model.objects.filter(status='ONGOING', datetime__date__lt=today),
+                status='COMPLETED',
+                updated_at=timezone.now(),
+            )
+            run.record(f'{label} completed', ids)
     
     except Exception as e:
         print(f"✗ Failed to update event statuses: {str(e)}")
+    
+    return run.report()
 
 
 def update_project_statuses():
@@ -164,170 +121,283 @@ def update_project_statuses():
     - IN_PROGRESS -> COMPLETED when estimated_end_date is passed (only if no final submission required)
     
     Runs daily at midnight.
+
+    Returns:
+        dict: Rows transitioned and elapsed time (see TransitionRun.report)
     """
     from shared.projects.models import Project
-    from system.logs.models import LogEntry
-    from django.urls import reverse
     
     now = timezone.now().date()
-    count_started = 0
-    count_completed = 0
+    run = TransitionRun('update_project_statuses')
     
     try:
         # Update NOT_STARTED -> IN_PROGRESS
-        projects_to_start = Project.objects.filter(
-            status='NOT_STARTED',
-            start_date__lte=now
+        started_ids = bulk_transition(
+            Project.objects.filter(
+                status='NOT_STARTED',
+                start_date__lte=now
+            ),
+            status='IN_PROGRESS',
+            updated_at=timezone.now(),
         )
-        
-        for project in projects_to_start:
-            try:
-                project.status = 'IN_PROGRESS'
-                project.save()
-                notify_project_status_change(project, 'NOT_STARTED', 'IN_PROGRESS')
-                count_started += 1
-                print(f"✓ Started project: {project.title}")
-            except Exception as e:
-                print(f"✗ Failed to start project '{project.title}': {str(e)}")
+        run.record('started', started_ids)
+        apply_project_status_side_effects(started_ids, 'NOT_STARTED', 'IN_PROGRESS')
         
         # Update IN_PROGRESS -> COMPLETED (only if no final submission required)
-        projects_to_complete = Project.objects.filter(
-            status='IN_PROGRESS',
-            estimated_end_date__lt=now,
-            has_final_submission=False
+        completed_ids = bulk_transition(
+            Project.objects.filter(
+                status='IN_PROGRESS',
+                estimated_end_date__lt=now,
+                has_final_submission=False
+            ),
+            status='COMPLETED',
+            updated_at=timezone.now(),
         )
+        run.record('completed', completed_ids)
+        apply_project_status_side_effects(completed_ids, 'IN_PROGRESS', 'COMPLETED')
         
-        for project in projects_to_complete:
-            try:
-                project.status = 'COMPLETED'
-                project.save()
-                notify_project_status_change(project, 'IN_PROGRESS', 'COMPLETED')
-                count_completed += 1
-                print(f"✓ Completed project: {project.title}")
-            except Exception as e:
-                print(f"✗ Failed to complete project '{project.title}': {str(e)}")
-        
-        if count_started > 0 or count_completed > 0:
-            print(f"✓ Updated project statuses at {timezone.now().strftime('%Y-%m-%d %H:%M:%S')}: {count_started} started, {count_completed} completed")
+        if started_ids or completed_ids:
+            # The expert search index filters experts by their project statuses
+            from internal.experts.lexical_index import bump_index_version
+            transaction.on_commit(bump_index_version)
     
     except Exception as e:
         print(f"✗ Failed to update project statuses: {str(e)}")
+    
+    return run.report()
 
 
-def update_user_expert_status():
+def apply_project_status_side_effects(project_ids, old_status, new_status):
+    """
+    Fan out what Project.save() signals did per project for a bulk status change:
+    status log entries and notifications, project alerts for the team, and the
+    unspent budget return for completed projects.
+    """
+    from django.urls import reverse
+    from shared.projects.models import Project, ProjectUpdate, PROJECT_STATUS_MESSAGES, return_unspent_budget
+    from system.logs.models import LogEntry
+    
+    if not project_ids:
+        return
+    
+    projects = list(
+        Project.objects.filter(id__in=project_ids)
+        .select_related('project_leader__college')
+        .prefetch_related('providers')
+    )
+    
+    entries = []
+    team = {}
+    for project in projects:
+        user = project.updated_by_id or project.created_by_id
+        entries.append(LogEntry(
+            user_id=user,
+            action='UPDATE',
+            model='Project',
+            object_id=project.id,
+            object_repr=project.title,
+            details=PROJECT_STATUS_MESSAGES.get(new_status, f"Project Status: {project.get_status_display()}"),
+            url=reverse('project_profile', args=[project.pk]),
+            is_notification=True
+        ))
+        entries.extend(project_status_change_entries(project, old_status, new_status))
+        
+        members = [project.project_leader] if project.project_leader else []
+        members.extend(project.providers.all())
+        team[project.id] = {member.id for member in members}
+        
+        if new_status == 'COMPLETED':
+            return_unspent_budget(project, project.updated_by or project.created_by)
+    
+    create_log_entries(entries)
+    
+    # Project alerts: refresh existing (user, project, status) rows and insert the rest
+    now = timezone.now()
+    existing = ProjectUpdate.objects.filter(
+        project_id__in=project_ids,
+        submission__isnull=True,
+        status=new_status,
+    ).values_list('id', 'user_id', 'project_id')
+    refresh_ids = []
+    for update_id, user_id, project_id in existing:
+        if user_id in team.get(project_id, ()):
+            refresh_ids.append(update_id)
+            team[project_id].discard(user_id)
+    if refresh_ids:
+        ProjectUpdate.objects.filter(id__in=refresh_ids).update(viewed=False, updated_at=now)
+    ProjectUpdate.objects.bulk_create([
+        ProjectUpdate(user_id=user_id, project_id=project_id, submission=None, status=new_status, viewed=False, updated_at=now)
+        for project_id, user_ids in team.items()
+        for user_id in user_ids
+    ], batch_size=500)
+
+
+def update_user_expert_status(user_ids=None):
     """
     Update is_expert flag for faculty users based on project involvement.
     - Faculty with at least 1 project as leader or provider -> is_expert = True
     - Faculty with no projects -> is_expert = False
     
-    Runs daily at midnight and on startup.
+    Two set-based UPDATEs driven by Exists() subqueries over led_projects and
+    member_projects. Runs daily at midnight and on startup over all faculty, and
+    for just the affected users when projects or providers change.
+
+    Args:
+        user_ids (iterable): Optional users to re-evaluate (incremental mode)
+
+    Returns:
+        dict: Rows transitioned and elapsed time (see TransitionRun.report)
     """
     from system.users.models import User
     from shared.projects.models import Project
     
-    count_experts = 0
-    count_removed = 0
+    run = TransitionRun('update_user_expert_status')
     
     try:
-        # Get all faculty users
         faculty_users = User.objects.filter(role=User.Role.FACULTY)
+        if user_ids is not None:
+            faculty_users = faculty_users.filter(id__in=list(user_ids))
         
-        for user in faculty_users:
-            # Check if faculty has at least 1 project (as leader or provider)
-            has_projects = Project.objects.filter(
-                Q(project_leader=user) | Q(providers=user)
-            ).exists()
-            
-            # Update is_expert status if needed
-            if has_projects and not user.is_expert:
-                user.is_expert = True
-                user.save(update_fields=['is_expert'])
-                count_experts += 1
-
-            elif not has_projects and user.is_expert:
-                user.is_expert = False
-                user.save(update_fields=['is_expert'])
-                count_removed += 1
+        # Faculty has at least 1 project (as leader or provider)
+        has_projects = (
+            Q(Exists(Project.objects.filter(project_leader=OuterRef('pk'))))
+            | Q(Exists(Project.providers.through.objects.filter(user=OuterRef('pk'))))
+        )
+        
+        added_ids = bulk_transition(faculty_users.filter(has_projects, is_expert=False), is_expert=True)
+        run.record('added', added_ids)
         
-        if count_experts > 0 or count_removed > 0:
-            print(f"✓ Updated expert statuses at {timezone.now().strftime('%Y-%m-%d %H:%M:%S')}: {count_experts} added, {count_removed} removed")
+        removed_ids = bulk_transition(faculty_users.filter(~has_projects, is_expert=True), is_expert=False)
+        run.record('removed', removed_ids)
+        
+        if added_ids or removed_ids:
+            # The expert search index only holds experts
+            from internal.experts.lexical_index import bump_index_version
+            transaction.on_commit(bump_index_version)
     
     except Exception as e:
         print(f"✗ Failed to update expert statuses: {str(e)}")
+    
+    return run.report()
+
+
+def queue_expert_status_refresh(user_ids):
+    """
+    Re-evaluate the expert flag of the given users once the current transaction
+    commits (incremental mode, see EXPERT_STATUS_INCREMENTAL).
+    """
+    from django.conf import settings
+    
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if not user_ids or not getattr(settings, 'EXPERT_STATUS_INCREMENTAL', True):
+        return
+    transaction.on_commit(lambda: update_user_expert_status(user_ids=user_ids))
 
 
-def notify_project_status_change(project, old_status, new_status):
+def project_status_change_entries(project, old_status, new_status):
     """
-    Send notifications to project team and internal users about status change.
+    Build the notification log entry telling the project leader about an automatic status change.
     
     Args:
         project: The Project instance
         old_status: Previous status
         new_status: New status
+    
+    Returns:
+        list: Unsaved LogEntry instances (see transitions.create_log_entries)
     """
     from system.logs.models import LogEntry
     from django.urls import reverse
     
-    try:
-        url = reverse('project_profile', args=[project.id])
-        status_display = {
-            'NOT_STARTED': 'Not Started',
-            'IN_PROGRESS': 'In Progress',
-            'COMPLETED': 'Completed',
-            'ON_HOLD': 'On Hold',
-            'CANCELLED': 'Cancelled'
-        }
-        
-        details = f"Project status automatically changed from '{status_display.get(old_status, old_status)}' to '{status_display.get(new_status, new_status)}'"
-        
-        # Notify project leader
-        if project.project_leader:
-            LogEntry.objects.create(
-                user=project.project_leader,
-                action='UPDATE',
-                model='Project',
-                object_id=project.id,
-                object_repr=project.title,
-                details=details,
-                url=url,
-                is_notification=True
-            )
-        
-        # Notify service providers
-        for provider in project.service_providers.all():
-            LogEntry.objects.create(
-                user=provider,
-                action='UPDATE',
-                model='Project',
-                object_id=project.id,
-                object_repr=project.title,
-                details=details,
-                url=url,
-                is_notification=True
-            )
-        
-        # Notify internal users (Program Head, Dean, Coordinator) from same college
-        if project.college:
-            from system.users.models import User
-            internal_users = User.objects.filter(
-                college=project.college,
-                role__in=['PROGRAM_HEAD', 'DEAN', 'COORDINATOR']
-            )
-            
-            for user in internal_users:
-                LogEntry.objects.create(
-                    user=user,
-                    action='UPDATE',
-                    model='Project',
-                    object_id=project.id,
-                    object_repr=project.title,
-                    details=details,
-                    url=url,
-                    is_notification=True
-                )
+    if not project.project_leader_id:
+        return []
     
-    except Exception as e:
-        print(f"✗ Failed to send notifications for project '{project.title}': {str(e)}")
+    status_display = {
+        'NOT_STARTED': 'Not Started',
+        'IN_PROGRESS': 'In Progress',
+        'COMPLETED': 'Completed',
+        'ON_HOLD': 'On Hold',
+        'CANCELLED': 'Cancelled'
+    }
+    details = f"Project status automatically changed from '{status_display.get(old_status, old_status)}' to '{status_display.get(new_status, new_status)}'"
+    
+    return [LogEntry(
+        user_id=project.project_leader_id,
+        action='UPDATE',
+        model='Project',
+        object_id=project.id,
+        object_repr=project.title,
+        details=details,
+        url=reverse('project_profile', args=[project.id]),
+        is_notification=True
+    )]
+
+
+# Days before an event that the advance reminder goes out
+REMINDER_LEAD_DAYS = 3
+
+
+def plan_event_reminders(today=None):
+    """
+    Collect the reminders due today: meetings and project activities three days
+    out (still scheduled) and today (scheduled or ongoing).
+
+    One query per model covers both windows, with participants, providers and
+    leaders prefetched.
+
+    Returns:
+        dict: {user_id: (user, [(event_type, event, reminder), ...])}
+    """
+    from django.db.models import Prefetch
+    from shared.event_calendar.models import MeetingEvent
+    from shared.projects.models import ProjectEvent
+    from system.users.models import User
+
+    today = today or timezone.localdate()
+    windows = {
+        today: 'DAY_OF',
+        today + timedelta(days=REMINDER_LEAD_DAYS): '3_DAYS',
+    }
+    recipients = User.objects.only('id', 'email')
+
+    def due_reminder(event):
+        reminder = windows.get(timezone.localdate(event.datetime))
+        if reminder == '3_DAYS' and event.status != 'SCHEDULED':
+            return None
+        return reminder
+
+    plan = {}
+
+    def add(user, event_type, event, reminder):
+        if user is not None and user.email:
+            plan.setdefault(user.id, (user, []))[1].append((event_type, event, reminder))
+
+    meetings = MeetingEvent.objects.filter(
+        status__in=['SCHEDULED', 'ONGOING'],
+        datetime__date__in=list(windows),
+    ).prefetch_related(Prefetch('participants', queryset=recipients))
+
+    for meeting in meetings:
+        reminder = due_reminder(meeting)
+        if reminder:
+            for participant in meeting.participants.all():
+                add(participant, 'MEETING', meeting, reminder)
+
+    activities = ProjectEvent.objects.filter(
+        status__in=['SCHEDULED', 'ONGOING'],
+        datetime__date__in=list(windows),
+        placeholder=False,
+    ).select_related('project__project_leader').prefetch_related(Prefetch('project__providers', queryset=recipients))
+
+    for activity in activities:
+        reminder = due_reminder(activity)
+        if reminder:
+            team = {activity.project.project_leader_id: activity.project.project_leader}
+            team.update((provider.id, provider) for provider in activity.project.providers.all())
+            for member in team.values():
+                add(member, 'ACTIVITY', activity, reminder)
+
+    return plan
 
 
 def send_event_reminders():
@@ -336,133 +406,61 @@ def send_event_reminders():
     - 3 days before: Send reminder
     - Day of (12:00 AM): Send day-of reminder
     
+    Every recipient gets one digest email per run covering all of their due
+    reminders. Each (user, event, reminder) is claimed in ReminderDispatch in
+    the same transaction that queues the email in the outbox, so reruns and the
+    Celery worker startup hook never resend a reminder.
+    
     Runs daily at midnight.
+
+    Returns:
+        dict: Reminders and digest emails sent, and elapsed time (see TransitionRun.report)
     """
-    from shared.event_calendar.models import MeetingEvent
-    from shared.projects.models import ProjectEvent
-    from system.utils.email_utils import async_send_event_reminder
-    
-    now = timezone.now()
-    today = now.date()
-    three_days_later = today + timedelta(days=3)
-    
-    reminder_count = 0
+    import uuid
+    from system.utils.email_utils import async_send_event_reminder_digest
+    from .models import ReminderDispatch
+
+    run = TransitionRun('send_event_reminders')
     
     try:
-        # --- Meeting Event Reminders ---
-        
-        # 3 days before reminders for meetings
-        meetings_3_days = MeetingEvent.objects.filter(
-            status='SCHEDULED',
-            datetime__date=three_days_later
-        ).prefetch_related('participants')
-        
-        for meeting in meetings_3_days:
-            participants = meeting.participants.all()
-            participant_emails = [p.email for p in participants if p.email]
-            
-            if participant_emails:
-                async_send_event_reminder(
-                    recipient_emails=participant_emails,
-                    event_title=meeting.title,
-                    event_datetime=meeting.datetime,
-                    event_location=meeting.location,
-                    event_description=meeting.description,
-                    event_type='meeting',
-                    days_before=3
-                )
-                reminder_count += 1
-                print(f"✓ Sent 3-day reminder for meeting: {meeting.title}")
-        
-        # Day-of reminders for meetings
-        meetings_today = MeetingEvent.objects.filter(
-            status__in=['SCHEDULED', 'ONGOING'],
-            datetime__date=today
-        ).prefetch_related('participants')
-        
-        for meeting in meetings_today:
-            participants = meeting.participants.all()
-            participant_emails = [p.email for p in participants if p.email]
-            
-            if participant_emails:
-                async_send_event_reminder(
-                    recipient_emails=participant_emails,
-                    event_title=meeting.title,
-                    event_datetime=meeting.datetime,
-                    event_location=meeting.location,
-                    event_description=meeting.description,
-                    event_type='meeting',
-                    days_before=None
-                )
-                reminder_count += 1
-                print(f"✓ Sent day-of reminder for meeting: {meeting.title}")
-        
-        # --- Project Event Reminders ---
-        
-        # 3 days before reminders for project events
-        project_events_3_days = ProjectEvent.objects.filter(
-            status='SCHEDULED',
-            datetime__date=three_days_later,
-            placeholder=False
-        ).select_related('project__project_leader').prefetch_related('project__providers')
-        
-        for event in project_events_3_days:
-            # Get project team members
-            team_emails = []
-            if event.project.project_leader and event.project.project_leader.email:
-                team_emails.append(event.project.project_leader.email)
-            for provider in event.project.providers.all():
-                if provider.email:
-                    team_emails.append(provider.email)
-            
-            team_emails = list(set(team_emails))  # Remove duplicates
-            
-            if team_emails:
-                async_send_event_reminder(
-                    recipient_emails=team_emails,
-                    event_title=event.title,
-                    event_datetime=event.datetime,
-                    event_location=event.location,
-                    event_description=event.description,
-                    event_type='activity',
-                    days_before=3
-                )
-                reminder_count += 1
-                print(f"✓ Sent 3-day reminder for project event: {event.title}")
-        
-        # Day-of reminders for project events
-        project_events_today = ProjectEvent.objects.filter(
-            status__in=['SCHEDULED', 'ONGOING'],
-            datetime__date=today,
-            placeholder=False
-        ).select_related('project__project_leader').prefetch_related('project__providers')
-        
-        for event in project_events_today:
-            # Get project team members
-            team_emails = []
-            if event.project.project_leader and event.project.project_leader.email:
-                team_emails.append(event.project.project_leader.email)
-            for provider in event.project.providers.all():
-                if provider.email:
-                    team_emails.append(provider.email)
-            
-            team_emails = list(set(team_emails))  # Remove duplicates
-            
-            if team_emails:
-                async_send_event_reminder(
-                    recipient_emails=team_emails,
-                    event_title=event.title,
-                    event_datetime=event.datetime,
-                    event_location=event.location,
-                    event_description=event.description,
-                    event_type='activity',
-                    days_before=None
+        plan = plan_event_reminders()
+        if not plan:
+            return run.report()
+
+        run_id = uuid.uuid4()
+        with transaction.atomic():
+            ReminderDispatch.objects.bulk_create([
+                ReminderDispatch(
+                    user_id=user_id,
+                    event_type=event_type,
+                    event_id=event.id,
+                    reminder=reminder,
+                    event_date=timezone.localdate(event.datetime),
+                    run_id=run_id,
                 )
-                reminder_count += 1
-                print(f"✓ Sent day-of reminder for project event: {event.title}")
-        
-        if reminder_count > 0:
-            print(f"✓ Sent {reminder_count} event reminder(s) at {now.strftime('%Y-%m-%d %H:%M:%S')}")
+                for user_id, (user, reminders) in plan.items()
+                for event_type, event, reminder in reminders
+            ], batch_size=500, ignore_conflicts=True)
+
+            # Rows another run already holds were skipped by the unique constraint
+            claimed = set(ReminderDispatch.objects.filter(run_id=run_id).values_list(
+                'user_id', 'event_type', 'event_id', 'reminder',
+            ))
+            run.record('reminders', claimed)
+
+            for user_id, (user, reminders) in plan.items():
+                due = [
+                    (event_type, event, reminder) for event_type, event, reminder in reminders
+                    if (user_id, event_type, event.id, reminder) in claimed
+                ]
+                if due:
+                    async_send_event_reminder_digest(user.email, due)
+                    run.record('digest emails', [user_id])
+
+        # Dispatch rows are only needed while their event can still be reminded
+        ReminderDispatch.objects.filter(event_date__lt=timezone.localdate() - timedelta(days=7)).delete()
     
     except Exception as e:
-        print(f"✗ Failed to send event reminders: {str(e)}")
\ No newline at end of file
+        print(f"✗ Failed to send event reminders: {str(e)}")
+
+    return run.report()
@@ -10,7 +10,7 @@ from system.scheduler.scheduler import (
 
 @app.task
 def celery_publish_scheduled_announcements():
-    publish_scheduled_announcements()
+    return publish_scheduled_announcements()
 
 @app.task
 def celery_clear_expired_sessions():
@@ -18,19 +18,19 @@ def celery_clear_expired_sessions():
 
 @app.task
 def celery_update_event_statuses():
-    update_event_statuses()
+    return update_event_statuses()
 
 @app.task
 def celery_update_project_statuses():
-    update_project_statuses()
+    return update_project_statuses()
 
 @app.task
 def celery_update_user_expert_status():
-    update_user_expert_status()
+    return update_user_expert_status()
 
 @app.task
 def celery_send_event_reminders():
-    send_event_reminders()
+    return send_event_reminders()
 
 
 # celery -A WBPMISUESO worker --pool=solo 
@@ -1,3 +1,71 @@
+from datetime import date, timedelta
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from internal.analytics.cache import get_analytics_version
+from shared.announcements.models import Announcement
+from shared.projects.models import Project
+from system.logs.models import LogEntry
+from system.notifications.models import BroadcastNotification, Notification
+from system.users.models import User
+from system.utils.cache_utils import object_tag, tag_cache_key
+from .scheduler import publish_scheduled_announcements, update_project_statuses
+from .transitions import bulk_transition
+
+
+class BulkTransitionTests(TestCase):
+    """Set-based transitions still do what Model.save() and its signals did."""
+
+    def setUp(self):
+        get_redis_connection('default').flushdb()
+        self.staff = User.objects.create_user(username='ueso', email='ueso@example.com', password='pw', role='UESO')
+        self.leader = User.objects.create_user(username='leader', email='leader@example.com', password='pw', role='FACULTY')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project = Project.objects.create(
+                title='Water Quality Training', project_leader=self.leader, created_by=self.staff,
+                estimated_events=2, estimated_trainees=10, primary_beneficiary='Community',
+                primary_location='Campus', logistics_type='BOTH',
+                start_date=date.today() - timedelta(days=1), estimated_end_date=date.today() + timedelta(days=30),
+            )
+
+    def test_only_matching_rows_change(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ids = bulk_transition(Project.objects.filter(status='NOT_STARTED'), status='IN_PROGRESS')
+            self.assertEqual(bulk_transition(Project.objects.filter(status='NOT_STARTED'), status='IN_PROGRESS'), [])
+        self.assertEqual(ids, [self.project.id])
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.status, 'IN_PROGRESS')
+
+    def test_transition_evicts_pages_and_marks_analytics_stale(self):
+        cache.set('page', 'cached')
+        tag_cache_key('page', [object_tag(Project, self.project.id)], 60)
+        version = get_analytics_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_transition(Project.objects.filter(pk=self.project.pk), status='IN_PROGRESS')
+        self.assertIsNone(cache.get('page'))
+        self.assertNotEqual(get_analytics_version(), version)
+
+    def test_project_status_update_logs_and_notifies(self):
+        logs = LogEntry.objects.count()
+        with self.captureOnCommitCallbacks(execute=True):
+            report = update_project_statuses()
+        self.assertEqual(report['transitions']['started'], 1)
+        self.assertGreater(LogEntry.objects.count(), logs)
+        self.assertTrue(Notification.objects.filter(recipient=self.leader, object_id=self.project.id).exists())
 
-# Create your tests here.
+    def test_scheduled_announcement_is_published_and_broadcast(self):
+        announcement = Announcement.objects.create(
+            title='Orientation', body='Details', is_scheduled=True,
+            scheduled_at=timezone.now() - timedelta(minutes=1), scheduled_by=self.staff,
+        )
+        version = get_analytics_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            publish_scheduled_announcements()
+        announcement.refresh_from_db()
+        self.assertFalse(announcement.is_scheduled)
+        self.assertEqual(announcement.published_by, self.staff)
+        self.assertTrue(BroadcastNotification.objects.filter(model='Announcement', object_id=announcement.id).exists())
+        self.assertEqual(get_analytics_version(), version)  # Announcements are not analytics sources
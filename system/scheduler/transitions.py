@@ -0,0 +1,116 @@
+"""
+Set-based state transitions for the scheduler.
+
+Each state change is a single UPDATE ... WHERE over the matching rows (with
+RETURNING where the database supports it), instead of loading every row and
+calling .save(). Side effects that .save() used to trigger row by row are fanned
+out once per run: one LogEntry bulk insert, one Notification bulk insert, and for
+each transition one cache invalidation for the changed rows and, for the models
+the analytics read, one analytics version bump.
+"""
+
+import time
+
+from django.db import connections, transaction
+from django.db.models import sql
+from django.utils import timezone
+
+from system.utils.cache_utils import mark_cache_dirty, model_tag, object_tag
+
+
+def bulk_transition(queryset, **values):
+    """
+    Apply ``values`` to every row matching ``queryset`` with one UPDATE, then
+    queue what post_save would have triggered (see invalidate_transitioned).
+
+    Returns:
+        list: Primary keys of the rows that were changed
+    """
+    model = queryset.model
+    connection = connections[queryset.db]
+
+    if connection.features.can_return_columns_from_insert:
+        # PostgreSQL and SQLite >= 3.35: UPDATE ... RETURNING pk in one statement
+        query = queryset.query.chain(sql.UpdateQuery)
+        query.add_update_values(values)
+        compiler = query.get_compiler(queryset.db)
+        compiler.pre_sql_setup()
+        update_sql, params = compiler.as_sql()
+        if not update_sql:
+            return []
+        pk_column = connection.ops.quote_name(model._meta.pk.column)
+        with transaction.atomic(using=queryset.db), connection.cursor() as cursor:
+            cursor.execute(f"{update_sql} RETURNING {pk_column}", params)
+            ids = [row[0] for row in cursor.fetchall()]
+    else:
+        with transaction.atomic(using=queryset.db):
+            ids = list(queryset.select_for_update().values_list('pk', flat=True))
+            if ids:
+                model._base_manager.using(queryset.db).filter(pk__in=ids).update(**values)
+
+    invalidate_transitioned(model, ids)
+    return ids
+
+
+def invalidate_transitioned(model, ids):
+    """
+    Queue one cache invalidation covering every transitioned row of ``model``
+    and, if the analytics read ``model``, mark the cached analytics stale on commit.
+    """
+    from internal.analytics.cache import bump_analytics_version
+    from internal.analytics.models import FACT_DAY_FIELDS
+
+    if ids:
+        mark_cache_dirty(model, tags=[model_tag(model)] + [object_tag(model, pk) for pk in ids])
+        if model in FACT_DAY_FIELDS:
+            transaction.on_commit(bump_analytics_version)
+
+
+def create_log_entries(entries):
+    """
+    Insert log entries in one query and create their notifications in one more.
+    bulk_create skips the LogEntry post_save signal, so notifications are fanned out here.
+    """
+    from system.logs.models import LogEntry
+    from system.notifications.utils import create_notifications_from_logs
+
+    if not entries:
+        return []
+    now = timezone.now()
+    for entry in entries:
+        if entry.is_notification and entry.notification_date is None:
+            entry.notification_date = now
+    created = LogEntry.objects.bulk_create(entries, batch_size=500)
+    create_notifications_from_logs(created)
+    return created
+
+
+class TransitionRun:
+    """
+    Rows transitioned per state change and elapsed time for one scheduler job.
+    """
+
+    def __init__(self, job):
+        self.job = job
+        self.transitions = {}
+        self.started = time.monotonic()
+
+    def record(self, label, ids):
+        self.transitions[label] = self.transitions.get(label, 0) + len(ids)
+
+    @property
+    def total(self):
+        return sum(self.transitions.values())
+
+    def report(self):
+        """Print a one-line summary and return it as a dict."""
+        elapsed_ms = round((time.monotonic() - self.started) * 1000, 1)
+        if self.total:
+            changes = ", ".join(f"{count} {label}" for label, count in self.transitions.items() if count)
+            print(f"✓ {self.job}: {changes} in {elapsed_ms} ms at {timezone.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        return {
+            'job': self.job,
+            'transitions': dict(self.transitions),
+            'total': self.total,
+            'elapsed_ms': elapsed_ms,
+        }
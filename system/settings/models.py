@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.conf import settings
 from rest_framework_api_key.models import APIKey
 
@@ -52,4 +54,19 @@ class APIConnection(models.Model):
         return f"{self.name} ({self.get_status_display()})"
 
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+
+
+@receiver(post_save, sender=APIConnection)
+@receiver(post_delete, sender=APIConnection)
+def revoke_cached_connection_key(sender, instance, **kwargs):
+    """Status or tier changes take effect on the next API request."""
+    from system.api.keys import revoke_cached_key
+    revoke_cached_key(instance.api_key_id)
+
+
+@receiver(post_save, sender=APIKey)
+@receiver(post_delete, sender=APIKey)
+def revoke_cached_api_key(sender, instance, **kwargs):
+    from system.api.keys import revoke_cached_key
+    revoke_cached_key(instance.id)
@@ -1,3 +1,54 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django_redis import get_redis_connection
+from rest_framework_api_key.models import APIKey
 
-# Create your tests here.
+from system.api.ratelimit import consume
+from system.users.models import User
+from .models import APIConnection
+
+API_URL = '/analytics/api/all-project-data/'
+
+
+@override_settings(API_RATE_LIMITS={'TIER_1': 2, 'TIER_2': 0})
+class APIRateLimitTests(TestCase):
+    """Token buckets per API connection, reported in RateLimit-* headers."""
+
+    def setUp(self):
+        get_redis_connection('default').flushdb()
+        self.user = User.objects.create_user(username='partner', email='partner@example.com', password='pw')
+        api_key, self.key = APIKey.objects.create_key(name='partner')
+        self.connection = APIConnection.objects.create(
+            name='Partner', requested_by=self.user, api_key=api_key, status='ACTIVE', tier='TIER_1',
+        )
+
+    def test_bucket_allows_burst_then_denies(self):
+        first, second, third = (consume(self.connection.id, 'TIER_1') for _ in range(3))
+        self.assertEqual((first.allowed, first.remaining), (True, 1))
+        self.assertEqual((second.allowed, second.remaining), (True, 0))
+        self.assertFalse(third.allowed)
+        self.assertGreaterEqual(third.retry_after, 1)
+        self.assertTrue(consume(self.connection.id + 1, 'TIER_1').allowed)  # Buckets are per connection
+
+    def test_unlimited_tier(self):
+        self.assertIsNone(consume(self.connection.id, 'TIER_2'))
+
+    def test_responses_carry_rate_limit_headers(self):
+        self.client.force_login(self.user, backend='django.contrib.auth.backends.ModelBackend')
+        headers = {'X-Api-Key': self.key}
+        response = self.client.get(API_URL, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['RateLimit-Limit'], '2')
+        self.assertEqual(response['RateLimit-Remaining'], '1')
+        self.assertEqual(response['RateLimit-Policy'], '2;w=60')
+        self.assertNotIn('Retry-After', response)
+
+        self.client.get(API_URL, headers=headers)
+        response = self.client.get(API_URL, headers=headers)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['RateLimit-Remaining'], '0')
+        self.assertIn('Retry-After', response)
+
+    def test_requests_without_key_are_not_limited(self):
+        self.client.force_login(self.user, backend='django.contrib.auth.backends.ModelBackend')
+        response = self.client.get(API_URL)
+        self.assertNotIn('RateLimit-Limit', response)
@@ -8,6 +8,7 @@ urlpatterns = [
     # Main settings page
     path('', views.settings_view, name='settings'),
     path('api/docs/', views.api_docs, name='api_docs'),
+    path('api/usage/', views.api_usage, name='api_usage'),
     
     # College CRUD
     path('colleges/', views.manage_colleges, name='manage_colleges'),
@@ -1,4 +1,5 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.conf import settings
 from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import logout
@@ -586,4 +587,40 @@ def api_docs(request):
     context = {
         'base_template': base_template,
     }
-    return render(request, 'settings/api_docs.html', context)
\ No newline at end of file
+    return render(request, 'settings/api_docs.html', context)
+
+
+@role_required(allowed_roles=INTERNAL_ACCESS_ROLES, require_confirmed=True)
+def api_usage(request):
+    """Per-connection, per-endpoint API usage and latency. Admins see every connection."""
+    from system.api.usage import get_usage_report
+
+    user = request.user
+    is_admin = getattr(user, 'role', None) in ADMIN_ROLES
+    if getattr(user, 'role', None) in ["VP", "DIRECTOR", "UESO", "PROGRAM_HEAD", "DEAN", "COORDINATOR"]:
+        base_template = "base_internal.html"
+    else:
+        base_template = "base_public.html"
+
+    try:
+        days = min(max(int(request.GET.get('days', 7)), 1), settings.API_USAGE_RETENTION_DAYS)
+    except ValueError:
+        days = 7
+
+    connections = APIConnection.objects.all() if is_admin else APIConnection.objects.filter(requested_by=user)
+    connections = connections.in_bulk()
+    rows = [row for row in get_usage_report(days) if row['connection_id'] in connections]
+    for row in rows:
+        row['connection'] = connections[row['connection_id']]
+        row['rate_limit'] = settings.API_RATE_LIMITS.get(row['connection'].tier)
+
+    context = {
+        'base_template': base_template,
+        'admin': is_admin,
+        'rows': rows,
+        'days': days,
+        'day_options': [1, 7, 30],
+        'total_requests': sum(row['requests'] for row in rows),
+        'total_throttled': sum(row['throttled'] for row in rows),
+    }
+    return render(request, 'settings/api_usage.html', context)
@@ -2,10 +2,12 @@ from django.utils.cache import patch_cache_control
 from django.utils.deprecation import MiddlewareMixin
 from django.conf import settings
 from django.core.cache import caches
-from django.db.models.signals import post_save, post_delete
 from django.apps import apps
 from django.http import StreamingHttpResponse, FileResponse
 
+from system.utils.cache_utils import cache_invalidation_batch, collect_cache_tags, tag_cache_key
+from system.utils.signals import connect_cache_invalidation
+
 class SmartCacheMiddleware(MiddlewareMixin):
     """
     SmartCacheMiddleware
@@ -13,12 +15,17 @@ class SmartCacheMiddleware(MiddlewareMixin):
     - Caches GET page responses for all users:
         * Anonymous users: 24h cache (configurable)
         * Logged-in users: per-user cache (configurable duration)
-    - Automatically invalidates all cached pages on any model change (post_save/post_delete).
+    - Tags each cached page with the models and objects it read (see system.utils.cache_utils).
+    - On any model change (post_save/post_delete/m2m_changed), evicts only the pages carrying that model's tags,
+      once per request after the transaction commits (see system.utils.signals).
     - Skips caching for streaming and file responses (e.g., media/static files, BufferedReader/FileResponse), preventing serialization errors.
     - Does not cache non-GET requests.
-    - For large systems, selective cache invalidation can be implemented for efficiency.
+    - Sync only: under ASGI, Django runs it (and sync views) in one thread, where
+      the per-thread database execute wrapper sees the view's queries.
     """
 
+    async_capable = False
+
     def __init__(self, get_response=None):
         """
         Initialize SmartCacheMiddleware, set cache, timeouts, and connect model signals for cache invalidation.
@@ -27,6 +34,8 @@ class SmartCacheMiddleware(MiddlewareMixin):
         self.cache = caches['default']
         self.anonymous_timeout = getattr(settings, 'CACHE_MIDDLEWARE_SECONDS', 86400)
         self.logged_in_timeout = getattr(settings, 'USER_CACHE_SECONDS', 600)
+        # Tag sets must outlive every page registered in them
+        self.tag_timeout = max(self.anonymous_timeout, self.logged_in_timeout)
         self.cache_bypass_prefixes = tuple(getattr(settings, 'SMART_CACHE_BYPASS_PREFIXES', (
             '/oauth/',
             '/login/',
@@ -44,6 +53,8 @@ class SmartCacheMiddleware(MiddlewareMixin):
             '/admin/',
             '/static/',
             '/media/',
+            '/notifications/stream/',
+            '/analytics/data/',  # Cached per day range by internal.analytics.cache
             '/api/ ',
         )))
         self._connect_signals()
@@ -51,37 +62,28 @@ class SmartCacheMiddleware(MiddlewareMixin):
 
     def _connect_signals(self):
         """
-        Connect post_save and post_delete signals for all models to cache invalidation handler.
+        Connect cache invalidation for all models (many-to-many changes are handled in system.utils.signals).
         """
         for model in apps.get_models():
-            post_save.connect(self._invalidate_cache, sender=model, dispatch_uid=f'invalidate_{model._meta.label}_save')
-            post_delete.connect(self._invalidate_cache, sender=model, dispatch_uid=f'invalidate_{model._meta.label}_delete')
+            connect_cache_invalidation(model)
 
 
-    def _invalidate_cache(self, sender, **kwargs):
+    def __call__(self, request):
         """
-        Clears all cached pages for both anonymous and logged-in users.
-        For large systems, consider selective invalidation for efficiency.
+        Run the request with a tag collector on the database connection so the
+        response can be tagged with everything it read, and flush the request's
+        cache invalidations once at the end.
         """
-        try:
-            if hasattr(self.cache, 'delete_pattern'):
-                self.cache.delete_pattern('anon:*')
-                self.cache.delete_pattern('user:*')
-                return
-
-            if hasattr(self.cache, 'keys'):
-                keys = [key for key in self.cache.keys('anon:*')] + [key for key in self.cache.keys('user:*')]
-                for key in keys:
-                    self.cache.delete(key)
-                return
-
-            self.cache.clear()
-        except Exception:
-            self.cache.clear()
+        with cache_invalidation_batch(), collect_cache_tags() as collector:
+            request._cache_tag_collector = collector
+            return super().__call__(request)
 
 
     def _should_bypass_cache(self, request):
         """Skip cache for auth/session-sensitive and non-cacheable paths."""
+        # API clients: every call must pass the key, tier and rate limit checks
+        if request.META.get('HTTP_X_API_KEY') or request.META.get('HTTP_AUTHORIZATION'):
+            return True
         path = request.path or '/'
         return any(path.startswith(prefix) for prefix in self.cache_bypass_prefixes)
 
@@ -98,6 +100,8 @@ class SmartCacheMiddleware(MiddlewareMixin):
         key = self._generate_cache_key(request)
         response = self.cache.get(key)
         if response:
+            # Served as cached: storing it again would outlive the tag sets it was registered in
+            request._cache_update_cache = False
             timeout = self.anonymous_timeout if not request.user.is_authenticated else self.logged_in_timeout
             patch_cache_control(response, max_age=timeout)
             return response
@@ -134,6 +138,9 @@ class SmartCacheMiddleware(MiddlewareMixin):
         timeout = self.anonymous_timeout if not request.user.is_authenticated else self.logged_in_timeout
         try:
             self.cache.set(key, response, timeout=timeout)
+            collector = getattr(request, '_cache_tag_collector', None)
+            if collector is not None:
+                tag_cache_key(key, collector.tags, self.tag_timeout)
         except Exception:
             pass
 
@@ -1,3 +1,69 @@
-from django.test import TestCase
+import time
 
-# Create your tests here.
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.test import TestCase, override_settings
+from django.urls import path
+from django_redis import get_redis_connection
+
+from system.utils.cache_utils import CACHE_TAG_PREFIX, model_tag
+from .models import College, User
+
+
+def college_names(request):
+    return HttpResponse(', '.join(College.objects.order_by('name').values_list('name', flat=True)))
+
+
+urlpatterns = [
+    path('colleges/', college_names),
+]
+
+
+@override_settings(ROOT_URLCONF='system.users.tests')
+class SmartCacheMiddlewareTests(TestCase):
+    """Pages are cached with the tags of what they read and evicted by writes to it."""
+
+    def setUp(self):
+        get_redis_connection('default').flushdb()
+        College.objects.create(name='Engineering')
+
+    def get(self, client=None):
+        return (client or self.client).get('/colleges/').content.decode()
+
+    def write(self, name):
+        with self.captureOnCommitCallbacks(execute=True):
+            College.objects.create(name=name)
+
+    def test_page_is_cached_and_tagged(self):
+        self.assertEqual(self.get(), 'Engineering')
+        self.assertIsNotNone(caches['default'].get('anon:/colleges/'))
+        tag_key = f'{CACHE_TAG_PREFIX}{model_tag(College)}'
+        self.assertTrue(get_redis_connection('default').exists(tag_key))
+
+    def test_write_evicts_cached_page(self):
+        self.get()
+        self.write('Nursing')
+        self.assertIsNone(caches['default'].get('anon:/colleges/'))
+        self.assertEqual(self.get(), 'Engineering, Nursing')
+
+    def test_write_evicts_logged_in_pages(self):
+        user = User.objects.create_user(username='ueso', email='ueso@example.com', password='pw', role='UESO')
+        self.client.force_login(user, backend='django.contrib.auth.backends.ModelBackend')
+        self.assertEqual(self.get(), 'Engineering')
+        self.write('Nursing')
+        self.assertEqual(self.get(), 'Engineering, Nursing')
+
+    def test_unrelated_write_keeps_page(self):
+        self.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(username='other', email='other@example.com', password='pw')
+        self.assertIsNotNone(caches['default'].get('anon:/colleges/'))
+
+    @override_settings(CACHE_MIDDLEWARE_SECONDS=1, USER_CACHE_SECONDS=1)
+    def test_cache_hit_does_not_outlive_its_tags(self):
+        self.assertEqual(self.get(), 'Engineering')
+        time.sleep(0.6)
+        self.assertEqual(self.get(), 'Engineering')  # Hit
+        time.sleep(0.6)  # The page's tag sets have expired by now
+        self.write('Nursing')
+        self.assertEqual(self.get(), 'Engineering, Nursing')
@@ -2,9 +2,16 @@
 Cache utility functions for managing site-wide cache invalidation.
 """
 
+from contextlib import contextmanager
+from functools import lru_cache
+import logging
+import re
+import threading
+
+from django.apps import apps
 from django.core.cache import cache
 from django.core.cache.utils import make_template_fragment_key
-import logging
+from django.db import connection, transaction
 
 logger = logging.getLogger(__name__)
 
@@ -53,3 +60,332 @@ def invalidate_related_caches(model_name, instance_id=None):
         logger.info(f"Cache invalidated for {model_name} (ID: {instance_id})")
     else:
         logger.info(f"Cache invalidated for {model_name}")
+
+
+# ============================================================
+# DEPENDENCY TAGS FOR CACHED PAGES
+# ============================================================
+#
+# Every cached page is tagged with what it read while it was being built:
+#   model:<app_label.Model>          - the page ran a query over the table
+#   obj:<app_label.Model>:<pk>       - the page only fetched that one row by pk
+#
+# Tags are stored in Redis sets (cachetag:<tag> -> {cache keys}), so a write
+# evicts only the pages carrying its tags instead of scanning the keyspace.
+
+CACHE_TAG_PREFIX = 'cachetag:'
+
+_TABLE_RE = re.compile(r'\b(?:FROM|JOIN)\s+["`]?(\w+)["`]?', re.IGNORECASE)
+_PK_LOOKUP_RE = re.compile(
+    r'\bFROM\s+["`]?(\w+)["`]?\s+WHERE\s+["`]?(\w+)["`]?\.["`]?(\w+)["`]?\s*=\s*%s'
+    r'(?:\s+LIMIT\s+\d+)?\s*$',
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=1)
+def _table_index():
+    """
+    Map database table names to (model label, primary key column).
+    Includes auto-created many-to-many tables so joins through them are tagged too.
+    """
+    return {
+        model._meta.db_table: (model._meta.label, model._meta.pk.column)
+        for model in apps.get_models(include_auto_created=True)
+    }
+
+
+def model_tag(model):
+    """Tag for any query that reads the given model's table."""
+    return f"model:{model._meta.label}"
+
+
+def object_tag(model, pk):
+    """Tag for a page that fetched a single object by primary key."""
+    return f"obj:{model._meta.label}:{pk}"
+
+
+def tags_for_instance(sender, instance=None):
+    """
+    Tags invalidated by a write to ``instance``.
+    A write changes list and aggregate results over the table as well as the
+    object itself, so both tags are returned.
+    """
+    tags = [model_tag(sender)]
+    if instance is not None and instance.pk is not None:
+        tags.append(object_tag(sender, instance.pk))
+    return tags
+
+
+class CacheTagCollector:
+    """
+    Database execute wrapper that records the tags of every SELECT run while
+    a response is being built.
+
+    Single-row primary key lookups (``Model.objects.get(pk=...)``, the auth
+    middleware loading ``request.user``, forward foreign key access) are
+    recorded as object tags; every other query tags the whole table.
+    """
+
+    def __init__(self):
+        self.tags = set()
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and isinstance(sql, str) and sql.lstrip()[:6].upper() == 'SELECT':
+            try:
+                self._collect(sql, params)
+            except Exception as exc:
+                logger.debug(f"Could not tag query for caching: {exc}")
+        return execute(sql, params, many, context)
+
+    def _collect(self, sql, params):
+        tables = _table_index()
+        referenced = _TABLE_RE.findall(sql)
+        match = _PK_LOOKUP_RE.search(sql) if len(referenced) == 1 else None
+        if match and params and len(params) == 1:
+            table, alias, column = match.groups()
+            entry = tables.get(table)
+            if entry and alias == table and column == entry[1]:
+                self.tags.add(f"obj:{entry[0]}:{params[0]}")
+                return
+
+        for table in referenced:
+            entry = tables.get(table)
+            if entry:
+                self.tags.add(f"model:{entry[0]}")
+
+
+@contextmanager
+def collect_cache_tags():
+    """
+    Collect cache tags for all queries run on the default connection inside the block.
+
+    Usage:
+        with collect_cache_tags() as collector:
+            response = get_response(request)
+        tag_cache_key(key, collector.tags, timeout)
+    """
+    collector = CacheTagCollector()
+    with connection.execute_wrapper(collector):
+        yield collector
+
+
+def _get_redis_client():
+    """Return the raw Redis client behind the default cache, or None for other backends."""
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+    except Exception:
+        return None
+
+
+def tag_cache_key(key, tags, timeout):
+    """
+    Register a cached key under each of its dependency tags.
+
+    Args:
+        key (str): The cache key as passed to ``cache.set``
+        tags (iterable): Tags collected while building the cached value
+        timeout (int): Lifetime of the tag sets, at least as long as the cached value
+
+    Returns:
+        bool: True if the key was tagged, False if tagging is unavailable
+    """
+    client = _get_redis_client()
+    if client is None or not tags:
+        return False
+
+    raw_key = cache.make_key(key)
+    pipe = client.pipeline(transaction=False)
+    for tag in tags:
+        tag_key = f"{CACHE_TAG_PREFIX}{tag}"
+        pipe.sadd(tag_key, raw_key)
+        pipe.expire(tag_key, timeout)
+    pipe.execute()
+    return True
+
+
+def invalidate_cache_tags(tags):
+    """
+    Delete every cached key registered under any of the given tags.
+
+    Args:
+        tags (iterable): Tags to invalidate (see ``tags_for_instance``)
+
+    Returns:
+        int: Number of cache keys evicted, or None if the cache backend has no
+             tag index and the page cache was cleared by pattern instead
+    """
+    tags = list(tags)
+    if not tags:
+        return 0
+
+    client = _get_redis_client()
+    if client is None:
+        _clear_page_cache()
+        return None
+
+    tag_keys = [f"{CACHE_TAG_PREFIX}{tag}" for tag in tags]
+    keys = client.sunion(tag_keys)
+    pipe = client.pipeline(transaction=False)
+    if keys:
+        pipe.delete(*keys)
+    pipe.delete(*tag_keys)
+    pipe.execute()
+    return len(keys)
+
+
+def _clear_page_cache():
+    """Fallback for backends without a tag index: drop every cached page."""
+    try:
+        if hasattr(cache, 'delete_pattern'):
+            cache.delete_pattern('anon:*')
+            cache.delete_pattern('user:*')
+        else:
+            cache.clear()
+    except Exception as e:
+        logger.error(f"Error clearing page cache: {e}")
+
+
+# ============================================================
+# TRANSACTION-AWARE, BATCHED INVALIDATION
+# ============================================================
+#
+# Model signals only mark tags dirty. The tags are queued once the surrounding
+# transaction commits (nothing is evicted for rolled-back writes) and evicted
+# together when the enclosing request or Celery task finishes, so a project save
+# that also writes log entries and notifications costs one Redis round trip.
+
+CACHE_EVICTION_STATS_KEY = 'cachestats:evictions'
+
+_invalidation_state = threading.local()
+
+
+def _get_invalidation_state():
+    state = _invalidation_state
+    if not hasattr(state, 'pending'):
+        state.pending = {}
+        state.depth = 0
+    return state
+
+
+def mark_cache_dirty(sender, instance=None, tags=None):
+    """
+    Queue cache invalidation for a changed model instance.
+
+    The tags are added to the pending batch on transaction commit; if no batch
+    is open (management commands, shell) they are flushed immediately.
+
+    Args:
+        sender: The model class that changed
+        instance: Optional changed instance, adds its object tag
+        tags (iterable): Optional explicit tags, defaults to ``tags_for_instance``
+    """
+    label = sender._meta.label
+    tags = set(tags) if tags is not None else set(tags_for_instance(sender, instance))
+
+    def enqueue():
+        state = _get_invalidation_state()
+        state.pending.setdefault(label, set()).update(tags)
+        if state.depth == 0:
+            flush_cache_invalidations()
+
+    transaction.on_commit(enqueue)
+
+
+@contextmanager
+def cache_invalidation_batch():
+    """
+    Coalesce every invalidation committed inside the block into one flush on exit.
+    Nested batches flush only when the outermost one exits.
+    """
+    state = _get_invalidation_state()
+    state.depth += 1
+    try:
+        yield
+    finally:
+        state.depth -= 1
+        if state.depth == 0:
+            flush_cache_invalidations()
+
+
+def begin_cache_invalidation_batch():
+    """Open a batch without a ``with`` block (e.g. from Celery task_prerun)."""
+    _get_invalidation_state().depth += 1
+
+
+def end_cache_invalidation_batch():
+    """Close a batch opened with ``begin_cache_invalidation_batch`` and flush if outermost."""
+    state = _get_invalidation_state()
+    state.depth = max(state.depth - 1, 0)
+    if state.depth == 0:
+        flush_cache_invalidations()
+
+
+def flush_cache_invalidations():
+    """
+    Evict every cache key registered under the pending tags in one pipeline,
+    and count the evicted keys per model in the ``cachestats:evictions`` hash.
+
+    Returns:
+        dict: Number of keys evicted per model label
+    """
+    state = _get_invalidation_state()
+    pending, state.pending = state.pending, {}
+    if not pending:
+        return {}
+
+    client = _get_redis_client()
+    if client is None:
+        _clear_page_cache()
+        logger.info(f"Page cache cleared for {', '.join(sorted(pending))}")
+        return {}
+
+    try:
+        tag_keys = sorted({f"{CACHE_TAG_PREFIX}{tag}" for tags in pending.values() for tag in tags})
+        pipe = client.pipeline(transaction=False)
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        members = dict(zip(tag_keys, pipe.execute()))
+
+        evicted = {}
+        all_keys = set()
+        for label, tags in pending.items():
+            keys = set()
+            for tag in tags:
+                keys |= members[f"{CACHE_TAG_PREFIX}{tag}"]
+            evicted[label] = len(keys)
+            all_keys |= keys
+
+        pipe = client.pipeline(transaction=False)
+        if all_keys:
+            pipe.delete(*all_keys)
+        pipe.delete(*tag_keys)
+        for label, count in evicted.items():
+            if count:
+                pipe.hincrby(CACHE_EVICTION_STATS_KEY, label, count)
+        pipe.execute()
+
+        logger.debug(f"Cache invalidation evicted {len(all_keys)} keys: {evicted}")
+        return evicted
+    except Exception as e:
+        logger.error(f"Error flushing cache invalidations: {e}")
+        _clear_page_cache()
+        return {}
+
+
+def get_cache_eviction_stats():
+    """
+    Number of cache keys evicted per model since the counters were last reset.
+
+    Returns:
+        dict: {model label: evicted key count}, sorted by count descending
+    """
+    client = _get_redis_client()
+    if client is None:
+        return {}
+    stats = {
+        label.decode() if isinstance(label, bytes) else label: int(count)
+        for label, count in client.hgetall(CACHE_EVICTION_STATS_KEY).items()
+    }
+    return dict(sorted(stats.items(), key=lambda item: item[1], reverse=True))
@@ -0,0 +1,62 @@
+"""
+One after-commit dispatch per transaction.
+
+Batching helpers (analytics fact refreshes, notification fan-out, the email
+outbox) collect their work in thread-local state while a transaction runs
+and register their dispatch function with on_commit_once. Registrations are
+tracked per thread and cleared by the dispatch function (mark_dispatched)
+when it runs, so later calls in the same transaction add to the batch
+without registering again.
+
+A rollback drops the callback without running it. Such a registration is
+noticed the next time the thread queues work outside a transaction, and
+flushed at the end of every request and Celery task (run_pending_dispatches),
+so dispatch functions must be safe to run with nothing pending.
+"""
+
+import logging
+import threading
+
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+_state = threading.local()
+
+
+def _registered():
+    if not hasattr(_state, 'callbacks'):
+        _state.callbacks = []
+    return _state.callbacks
+
+
+def on_commit_once(dispatch):
+    """Run ``dispatch`` after the current transaction commits, unless it is already registered."""
+    registered = _registered()
+    if dispatch in registered:
+        if transaction.get_connection().in_atomic_block:
+            return
+        # Outside any transaction: the registering one rolled back
+        registered.remove(dispatch)
+    registered.append(dispatch)
+    transaction.on_commit(dispatch)
+
+
+def mark_dispatched(dispatch):
+    """Called by a dispatch function as it runs, so the next transaction registers it again."""
+    registered = _registered()
+    if dispatch in registered:
+        registered.remove(dispatch)
+
+
+def run_pending_dispatches():
+    """Run dispatches whose transaction rolled back, for the work queued after it."""
+    if transaction.get_connection().in_atomic_block:
+        return
+    for dispatch in list(_registered()):
+        try:
+            dispatch()
+        except Exception as exc:
+            logger.error("Pending dispatch %s failed: %s", dispatch.__qualname__, exc)
+        finally:
+            mark_dispatched(dispatch)
@@ -0,0 +1,381 @@
+"""
+Durable email outbox.
+
+async_send_mail stores each message as an EmailOutbox row and, once the
+transaction commits, asks a Celery worker to drain the outbox. The worker claims
+due rows in batches, coalesces rows with identical content into one provider
+request (one SendGrid personalization per row) over a single pooled HTTP session,
+and retries failures with exponential backoff. Rows survive worker restarts:
+a claimed row that is never finished is picked up again when its lease expires.
+
+With EMAIL_OUTBOX_TRANSPORT = 'django' the same pipeline delivers through
+Django's EMAIL_BACKEND (console locally, or a local SMTP server), so it can be
+exercised offline with `python manage.py drain_email_outbox`.
+"""
+
+import hashlib
+import logging
+import random
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Min
+from django.utils import timezone
+
+from system.utils.commit_hooks import mark_dispatched, on_commit_once
+from system.utils.models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+SENDGRID_SEND_URL = 'https://api.sendgrid.com/v3/mail/send'
+
+# SendGrid accepts at most 1000 recipients (and personalizations) per request
+MAX_RECIPIENTS_PER_REQUEST = 1000
+
+
+class TransientEmailError(Exception):
+    """The provider could not take the message right now (network error, 429, 5xx)."""
+
+
+class PermanentEmailError(Exception):
+    """The provider rejected the message; retrying will not help."""
+
+
+def content_hash(from_email, subject, body_text, body_html):
+    digest = hashlib.sha256()
+    for part in (from_email, subject, body_text, body_html):
+        digest.update((part or '').encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def enqueue_email(subject, body_text, from_email, recipient_list, body_html=None):
+    """
+    Store a message in the outbox and schedule a drain once the transaction commits.
+    Recipient lists above the per-request limit are split over several rows.
+
+    Returns:
+        list: The created EmailOutbox rows
+    """
+    recipients = list(dict.fromkeys(email.strip() for email in recipient_list if email and email.strip()))
+    if not recipients:
+        return []
+
+    body_html = body_html or ''
+    message_hash = content_hash(from_email, subject, body_text, body_html)
+    rows = EmailOutbox.objects.bulk_create([
+        EmailOutbox(
+            from_email=from_email,
+            recipients=recipients[start:start + MAX_RECIPIENTS_PER_REQUEST],
+            subject=subject,
+            body_text=body_text or '',
+            body_html=body_html,
+            content_hash=message_hash,
+        )
+        for start in range(0, len(recipients), MAX_RECIPIENTS_PER_REQUEST)
+    ])
+    # One drain per transaction, however many messages it queued
+    on_commit_once(schedule_drain)
+    return rows
+
+
+def schedule_drain():
+    """Ask a worker to drain the outbox (or drain here when EMAIL_OUTBOX_EAGER is set)."""
+    mark_dispatched(schedule_drain)
+    if settings.EMAIL_OUTBOX_EAGER:
+        drain_outbox()
+        return
+
+    from system.utils.tasks import drain_email_outbox
+    try:
+        drain_email_outbox.apply_async(retry=False)
+    except Exception as e:
+        # Broker unavailable: the rows stay queued for the periodic drain.
+        logger.warning(f"Could not schedule email outbox drain: {e}")
+
+
+# ------------------------------------------------------------------
+# Transports
+# ------------------------------------------------------------------
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_sendgrid_session():
+    """One keep-alive HTTP session per process, shared by every drain."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=settings.EMAIL_OUTBOX_POOL_SIZE))
+                session.headers.update({
+                    'Authorization': f'Bearer {settings.SENDGRID_API_KEY}',
+                    'Content-Type': 'application/json',
+                })
+                _session = session
+    return _session
+
+
+class SendGridTransport:
+    """Sends a group of identical messages as one v3 mail/send request."""
+
+    def open(self):
+        self.session = get_sendgrid_session()
+
+    def close(self):
+        pass
+
+    def send(self, messages):
+        import requests
+
+        first = messages[0]
+        content = []
+        if first.body_text:
+            content.append({'type': 'text/plain', 'value': first.body_text})
+        if first.body_html:
+            content.append({'type': 'text/html', 'value': first.body_html})
+        payload = {
+            'personalizations': [
+                {'to': [{'email': email} for email in message.recipients]}
+                for message in messages
+            ],
+            'from': {'email': first.from_email},
+            'subject': first.subject,
+            'content': content or [{'type': 'text/plain', 'value': ' '}],
+        }
+
+        try:
+            response = self.session.post(SENDGRID_SEND_URL, json=payload, timeout=settings.EMAIL_OUTBOX_TIMEOUT)
+        except requests.RequestException as e:
+            raise TransientEmailError(str(e))
+
+        if response.status_code == 429 or response.status_code >= 500:
+            raise TransientEmailError(f"SendGrid {response.status_code}: {response.text[:500]}")
+        if response.status_code >= 400:
+            raise PermanentEmailError(f"SendGrid {response.status_code}: {response.text[:500]}")
+
+
+class DjangoMailTransport:
+    """Sends through EMAIL_BACKEND over one connection per drain (console, SMTP, locmem)."""
+
+    def open(self):
+        from django.core.mail import get_connection
+
+        self.connection = get_connection(fail_silently=False)
+        self.connection.open()
+
+    def close(self):
+        self.connection.close()
+
+    def send(self, messages):
+        from django.core.mail import EmailMultiAlternatives
+
+        emails = []
+        for message in messages:
+            email = EmailMultiAlternatives(
+                subject=message.subject,
+                body=message.body_text,
+                from_email=message.from_email,
+                to=message.recipients,
+                connection=self.connection,
+            )
+            if message.body_html:
+                email.attach_alternative(message.body_html, 'text/html')
+            emails.append(email)
+        try:
+            self.connection.send_messages(emails)
+        except Exception as e:
+            raise TransientEmailError(str(e))
+
+
+TRANSPORTS = {
+    'sendgrid': SendGridTransport,
+    'django': DjangoMailTransport,
+}
+
+
+def get_transport():
+    return TRANSPORTS[settings.EMAIL_OUTBOX_TRANSPORT]()
+
+
+# ------------------------------------------------------------------
+# Draining
+# ------------------------------------------------------------------
+
+def claim_batch(batch_size):
+    """
+    Lease up to ``batch_size`` due rows to this worker.
+    Rows locked by another worker are skipped; leases that expire are claimable again,
+    unless the row already used EMAIL_OUTBOX_MAX_ATTEMPTS (it is marked FAILED instead).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        # Every attempt ended without a result (e.g. the message kills its worker): stop retrying it
+        abandoned = EmailOutbox.objects.filter(
+            status='SENDING', next_attempt_at__lte=now, attempts__gte=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        ).update(status='FAILED', last_error='Lease expired on every attempt')
+        if abandoned:
+            logger.error(f"Email outbox: {abandoned} message(s) failed after {settings.EMAIL_OUTBOX_MAX_ATTEMPTS} expired leases")
+
+        ids = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status__in=['PENDING', 'SENDING'], next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+        EmailOutbox.objects.filter(id__in=ids).update(
+            status='SENDING',
+            attempts=F('attempts') + 1,
+            next_attempt_at=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS),
+        )
+    return list(EmailOutbox.objects.filter(id__in=ids).order_by('id'))
+
+
+def group_messages(messages):
+    """Split claimed rows into provider requests of identical content within the recipient limit."""
+    by_content = {}
+    for message in messages:
+        by_content.setdefault(message.content_hash, []).append(message)
+
+    for group in by_content.values():
+        chunk, recipients = [], 0
+        for message in group:
+            if chunk and recipients + len(message.recipients) > MAX_RECIPIENTS_PER_REQUEST:
+                yield chunk
+                chunk, recipients = [], 0
+            chunk.append(message)
+            recipients += len(message.recipients)
+        if chunk:
+            yield chunk
+
+
+def retry_delay(attempts):
+    """Exponential backoff with jitter, capped at EMAIL_OUTBOX_MAX_BACKOFF seconds."""
+    delay = min(settings.EMAIL_OUTBOX_BASE_BACKOFF * 2 ** (attempts - 1), settings.EMAIL_OUTBOX_MAX_BACKOFF)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _mark_sent(messages):
+    EmailOutbox.objects.filter(id__in=[message.id for message in messages]).update(
+        status='SENT', sent_at=timezone.now(), last_error='',
+    )
+
+
+def _mark_failed(messages, error, permanent):
+    """Reschedule the rows with backoff, or give up after EMAIL_OUTBOX_MAX_ATTEMPTS."""
+    now = timezone.now()
+    failed = 0
+    for message in messages:
+        message.last_error = error[:2000]
+        if permanent or message.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            message.status = 'FAILED'
+            failed += 1
+        else:
+            message.status = 'PENDING'
+            message.next_attempt_at = now + timedelta(seconds=retry_delay(message.attempts))
+    EmailOutbox.objects.bulk_update(messages, ['status', 'next_attempt_at', 'last_error'])
+    return failed
+
+
+def drain_outbox(batch_size=None, max_batches=None):
+    """
+    Send due outbox rows until none are left or ``max_batches`` batches were claimed.
+
+    Returns:
+        dict: Messages sent, rescheduled and failed, provider requests made,
+              elapsed time and the outbox metrics after the drain
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    max_batches = max_batches or settings.EMAIL_OUTBOX_MAX_BATCHES
+    started = time.monotonic()
+    sent = retried = failed = requests_made = 0
+
+    transport = None
+    try:
+        for _ in range(max_batches):
+            messages = claim_batch(batch_size)
+            if not messages:
+                break
+            if transport is None:
+                transport = get_transport()
+                transport.open()
+
+            for group in group_messages(messages):
+                requests_made += 1
+                try:
+                    transport.send(group)
+                except PermanentEmailError as e:
+                    logger.error(f"Email rejected for {len(group)} message(s) '{group[0].subject}': {e}")
+                    failed += _mark_failed(group, str(e), permanent=True)
+                except Exception as e:
+                    logger.warning(f"Email delivery failed for {len(group)} message(s) '{group[0].subject}': {e}")
+                    group_failed = _mark_failed(group, str(e), permanent=False)
+                    failed += group_failed
+                    retried += len(group) - group_failed
+                else:
+                    _mark_sent(group)
+                    sent += len(group)
+    finally:
+        if transport is not None:
+            transport.close()
+
+    report = {
+        'sent': sent,
+        'retried': retried,
+        'failed': failed,
+        'requests': requests_made,
+        'elapsed_ms': round((time.monotonic() - started) * 1000, 1),
+        **get_outbox_stats(),
+    }
+    if requests_made:
+        print(
+            f"✓ Email outbox: {sent} sent, {retried} retrying, {failed} failed in {requests_made} request(s) "
+            f"({report['elapsed_ms']} ms); queue depth {report['queue_depth']}, "
+            f"p95 latency {report['latency_p95_seconds']}s"
+        )
+    return report
+
+
+def get_outbox_stats(window_minutes=60):
+    """
+    Outbox queue depth and delivery latency (queued -> sent) over the last ``window_minutes``.
+    """
+    now = timezone.now()
+    queued = EmailOutbox.objects.filter(status__in=['PENDING', 'SENDING']).aggregate(
+        count=Count('id'), oldest=Min('created_at'),
+    )
+    failed = EmailOutbox.objects.filter(status='FAILED').count()
+    latencies = sorted(
+        (sent_at - created_at).total_seconds()
+        for created_at, sent_at in EmailOutbox.objects.filter(
+            status='SENT', sent_at__gte=now - timedelta(minutes=window_minutes),
+        ).values_list('created_at', 'sent_at')
+    )
+
+    return {
+        'queue_depth': queued['count'],
+        'oldest_queued_seconds': round((now - queued['oldest']).total_seconds(), 1) if queued['oldest'] else 0,
+        'failed_total': failed,
+        'sent_in_window': len(latencies),
+        'latency_avg_seconds': round(sum(latencies) / len(latencies), 2) if latencies else None,
+        'latency_p95_seconds': round(latencies[int(0.95 * (len(latencies) - 1))], 2) if latencies else None,
+    }
+
+
+def purge_sent_emails(days=None):
+    """Delete sent rows older than EMAIL_OUTBOX_RETENTION_DAYS. Failed rows are kept for inspection."""
+    days = days or settings.EMAIL_OUTBOX_RETENTION_DAYS
+    deleted, _ = EmailOutbox.objects.filter(
+        status='SENT', sent_at__lt=timezone.now() - timedelta(days=days),
+    ).delete()
+    return deleted
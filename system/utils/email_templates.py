@@ -0,0 +1,89 @@
+"""
+Email body rendering.
+
+HTML bodies live in system/utils/templates/emails/ and share emails/base.html.
+Each template is compiled once per process, and rendered bodies are kept in a
+bounded LRU keyed by template name and context, so sending the same message
+to many recipients or events renders it once.
+"""
+
+import threading
+from collections import OrderedDict
+
+from django.template.loader import get_template
+
+# Rendered bodies kept per process
+RENDER_CACHE_SIZE = 512
+
+_templates = {}
+_rendered = OrderedDict()
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def get_email_template(name):
+    """Return the compiled ``emails/<name>.html`` template, loading it on first use."""
+    template = _templates.get(name)
+    if template is None:
+        template = get_template(f'emails/{name}.html')
+        _templates[name] = template
+    return template
+
+
+def _freeze(value):
+    """Hashable form of a context value (lists and dicts of plain values become tuples)."""
+    if isinstance(value, dict):
+        return (dict, tuple(sorted((key, _freeze(item)) for key, item in value.items())))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def render_email(name, context, cache=True):
+    """
+    Render ``emails/<name>.html`` with ``context``.
+
+    Contexts of plain values (the email helpers pass formatted strings, numbers,
+    booleans and lists or dicts of them) are served from the render cache after
+    the first render.
+    Pass cache=False for one-off bodies holding secrets such as verification codes.
+    """
+    key = None
+    if cache:
+        try:
+            key = (name, _freeze(context))
+            hash(key)
+        except TypeError:
+            key = None
+
+    if key is not None:
+        with _lock:
+            html = _rendered.get(key)
+            if html is not None:
+                _rendered.move_to_end(key)
+                _stats['hits'] += 1
+                return html
+
+    html = get_email_template(name).render(context)
+
+    if key is not None:
+        with _lock:
+            _stats['misses'] += 1
+            _rendered[key] = html
+            while len(_rendered) > RENDER_CACHE_SIZE:
+                _rendered.popitem(last=False)
+    return html
+
+
+def get_render_cache_stats():
+    """Render cache hits, misses and size for this process."""
+    with _lock:
+        return {**_stats, 'size': len(_rendered), 'templates': len(_templates)}
+
+
+def clear_render_cache():
+    """Drop compiled templates and rendered bodies (after template edits, or for benchmarks)."""
+    with _lock:
+        _templates.clear()
+        _rendered.clear()
+        _stats.update(hits=0, misses=0)
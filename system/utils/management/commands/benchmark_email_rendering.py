@@ -0,0 +1,80 @@
+import time
+
+from django.core.management.base import BaseCommand
+from system.utils.email_templates import (
+    clear_render_cache,
+    get_email_template,
+    get_render_cache_stats,
+    render_email,
+)
+
+# Representative contexts for the largest and most frequently sent bodies
+SAMPLE_CONTEXTS = {
+    'verification_code': {'verification_code': '123456'},
+    'export_approved': {'export_type': 'Projects', 'download_url': 'https://example.com/exports/1/download/'},
+    'email_changed': {'user_name': 'Juan Dela Cruz', 'old_email': 'old@example.com', 'new_email': 'new@example.com'},
+    'event_reminder': {
+        'title': 'Quarterly Extension Review',
+        'event_datetime': 'March 03, 2026 at 9:00 AM',
+        'location': 'Conference Room A',
+        'description': 'Review of ongoing extension projects.',
+        'message_intro': 'This is a reminder that you have a meeting coming up in 3 days.',
+        'days_before': 3,
+    },
+    'added_to_project': {
+        'role_display': 'Project Provider',
+        'title': 'Community Literacy Program',
+        'project_type': 'Needs Based',
+        'start_date': 'January 05, 2026',
+        'end_date': 'June 30, 2026',
+        'location': 'Barangay San Jose',
+        'beneficiary': 'Elementary students',
+        'estimated_events': 4,
+    },
+}
+
+class Command(BaseCommand):
+    help = 'Measures email body rendering throughput: compiled-template renders vs render cache hits.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000, help='Renders per template and mode')
+        parser.add_argument('--recipients', type=int, default=500, help='Recipients in the simulated reminder fan-out')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+
+        clear_render_cache()
+        started = time.perf_counter()
+        for name in SAMPLE_CONTEXTS:
+            get_email_template(name)
+        self.stdout.write(f"Template compile (first load): {(time.perf_counter() - started) * 1000:.1f} ms for {len(SAMPLE_CONTEXTS)} templates")
+
+        for name, context in SAMPLE_CONTEXTS.items():
+            template = get_email_template(name)
+            started = time.perf_counter()
+            for i in range(iterations):
+                # A distinct context every time: always a real render
+                template.render({**context, '_n': i})
+            uncached = iterations / (time.perf_counter() - started)
+
+            started = time.perf_counter()
+            for _ in range(iterations):
+                render_email(name, context)
+            cached = iterations / (time.perf_counter() - started)
+
+            self.stdout.write(f"  {name:<20} render {uncached:>10,.0f}/s   cached {cached:>12,.0f}/s")
+
+        # Reminder fan-out: one context shared by every recipient
+        clear_render_cache()
+        recipients = options['recipients']
+        context = SAMPLE_CONTEXTS['event_reminder']
+        started = time.perf_counter()
+        for _ in range(recipients):
+            render_email('event_reminder', context)
+        elapsed = (time.perf_counter() - started) * 1000
+        stats = get_render_cache_stats()
+        self.stdout.write(
+            f"Reminder fan-out: {recipients} recipients in {elapsed:.1f} ms "
+            f"({stats['misses']} render(s), {stats['hits']} cache hit(s))"
+        )
+        self.stdout.write(self.style.SUCCESS("Email rendering benchmark complete."))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from system.utils.email_outbox import drain_outbox, get_outbox_stats
+
+class Command(BaseCommand):
+    help = 'Sends due emails from the outbox, or prints outbox queue depth and latency with --stats.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stats', action='store_true', help='Only print outbox metrics')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            stats = get_outbox_stats()
+        else:
+            self.stdout.write("Running: drain_outbox...")
+            stats = drain_outbox()
+        for key, value in stats.items():
+            self.stdout.write(f"  {key}: {value}")
+        self.stdout.write(self.style.SUCCESS("Email outbox check complete."))
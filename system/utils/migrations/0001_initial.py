@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:13
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_email', models.CharField(max_length=254)),
+                ('recipients', models.JSONField(default=list)),
+                ('subject', models.CharField(max_length=998)),
+                ('body_text', models.TextField(blank=True)),
+                ('body_html', models.TextField(blank=True)),
+                ('content_hash', models.CharField(db_index=True, max_length=64)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('SENDING', 'Sending'), ('SENT', 'Sent'), ('FAILED', 'Failed')], default='PENDING', max_length=16)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Email Outbox Message',
+                'verbose_name_plural': 'Email Outbox',
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'), models.Index(fields=['status', 'sent_at'], name='outbox_sent_idx')],
+            },
+        ),
+    ]
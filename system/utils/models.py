@@ -0,0 +1,47 @@
+from django.db import models
+from django.utils import timezone
+
+
+class EmailOutbox(models.Model):
+    """
+    Outgoing email waiting to be delivered by the outbox worker.
+
+    async_send_mail writes one row per message; drain_email_outbox sends them
+    in batches. Rows with the same content_hash (same sender, subject and bodies)
+    go out in one provider request, one personalization per row.
+    """
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('SENDING', 'Sending'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    ]
+
+    from_email = models.CharField(max_length=254)
+    recipients = models.JSONField(default=list)
+    subject = models.CharField(max_length=998)
+    body_text = models.TextField(blank=True)
+    body_html = models.TextField(blank=True)
+
+    # sha256 of sender, subject and bodies: rows sharing it are coalesced into one request
+    content_hash = models.CharField(max_length=64, db_index=True)
+
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    # Earliest time the row may be claimed: the retry backoff, or the lease of a claimed row
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Email Outbox Message'
+        verbose_name_plural = 'Email Outbox'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+            models.Index(fields=['status', 'sent_at'], name='outbox_sent_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
@@ -1,13 +1,23 @@
 """
 Django signals for automatic cache invalidation.
-Clears cache whenever models are created, updated, or deleted.
+Marks the changed model's cache tags dirty whenever models are created, updated, or deleted;
+the tags are evicted together once the transaction commits and the request or Celery task ends.
 """
 
-from django.db.models.signals import post_save, post_delete
+from celery.signals import task_prerun, task_postrun
+from django.core.signals import request_finished
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
-from django.core.cache import cache
 import logging
 
+from system.utils.cache_utils import (
+    begin_cache_invalidation_batch,
+    end_cache_invalidation_batch,
+    mark_cache_dirty,
+    model_tag,
+)
+from system.utils.commit_hooks import run_pending_dispatches
+
 logger = logging.getLogger(__name__)
 
 # Import all models that should trigger cache clearing
@@ -38,24 +48,61 @@ from system.users.models import Campus, College, User
 
 
 
-def clear_site_cache(sender, instance, **kwargs):
+def clear_site_cache(sender, instance=None, **kwargs):
     """
-    Clear all site cache when any model changes.
-    This ensures users always see fresh data.
+    Queue invalidation of the cached pages that depend on the changed model.
+    Nothing is evicted until the transaction commits, and all changes made
+    during one request or task are evicted together.
     """
     try:
-        cache.clear()
-        model_name = sender.__name__
+        mark_cache_dirty(sender, instance)
         action = kwargs.get('created', None)
-        
+
         if action is True:
-            logger.info(f"Cache cleared: {model_name} created (ID: {instance.pk})")
+            logger.debug(f"Cache marked dirty: {sender.__name__} created (ID: {instance.pk})")
         elif action is False:
-            logger.info(f"Cache cleared: {model_name} updated (ID: {instance.pk})")
+            logger.debug(f"Cache marked dirty: {sender.__name__} updated (ID: {instance.pk})")
         else:
-            logger.info(f"Cache cleared: {model_name} deleted")
+            logger.debug(f"Cache marked dirty: {sender.__name__} deleted")
     except Exception as e:
-        logger.error(f"Error clearing cache for {sender.__name__}: {e}")
+        logger.error(f"Error marking cache dirty for {sender.__name__}: {e}")
+
+
+@receiver(m2m_changed, dispatch_uid='invalidate_m2m_changed')
+def clear_m2m_cache(sender, action=None, **kwargs):
+    """
+    Queue invalidation of cached pages that joined through a changed many-to-many table.
+    """
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        mark_cache_dirty(sender, tags=[model_tag(sender)])
+
+
+def connect_cache_invalidation(model):
+    """
+    Connect cache invalidation for a model.
+    The dispatch_uid makes repeated calls (e.g. from SmartCacheMiddleware) a no-op.
+    """
+    post_save.connect(clear_site_cache, sender=model, dispatch_uid=f'invalidate_{model._meta.label}_save')
+    post_delete.connect(clear_site_cache, sender=model, dispatch_uid=f'invalidate_{model._meta.label}_delete')
+
+
+@task_prerun.connect(dispatch_uid='cache_invalidation_task_prerun')
+def open_task_invalidation_batch(**kwargs):
+    """Coalesce invalidations made by a Celery task into one flush."""
+    begin_cache_invalidation_batch()
+
+
+@task_postrun.connect(dispatch_uid='cache_invalidation_task_postrun')
+def close_task_invalidation_batch(**kwargs):
+    """Flush invalidations collected while the Celery task ran."""
+    end_cache_invalidation_batch()
+
+
+@receiver(request_finished, dispatch_uid='commit_hooks_request_finished')
+@task_postrun.connect(dispatch_uid='commit_hooks_task_postrun')
+def finish_pending_dispatches(**kwargs):
+    """Dispatch batches left registered by a rolled-back transaction."""
+    run_pending_dispatches()
 
 
 # Connect signals for cache clearing
@@ -92,5 +139,4 @@ models_to_monitor = [
 ]
 
 for model in models_to_monitor:
-    post_save.connect(clear_site_cache, sender=model)
-    post_delete.connect(clear_site_cache, sender=model)
\ No newline at end of file
+    connect_cache_invalidation(model)
\ No newline at end of file
@@ -0,0 +1,13 @@
+from WBPMISUESO.celery import app
+from system.utils.email_outbox import drain_outbox, purge_sent_emails
+
+
+@app.task
+def drain_email_outbox():
+    """Send every due email in the outbox (triggered after each enqueue and every minute by beat)."""
+    return drain_outbox()
+
+
+@app.task
+def purge_email_outbox():
+    return purge_sent_emails()
@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .email_outbox import claim_batch, drain_outbox, enqueue_email
+from .models import EmailOutbox
+
+
+@override_settings(EMAIL_OUTBOX_EAGER=False, EMAIL_OUTBOX_TRANSPORT='django', EMAIL_OUTBOX_MAX_ATTEMPTS=3)
+class EmailOutboxClaimTests(TestCase):
+    """Claimed rows are leased, and rows whose leases keep expiring are given up on."""
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            self.message = enqueue_email('Subject', 'Body', 'ueso@example.com', ['faculty@example.com'])[0]
+
+    def expire_lease(self):
+        EmailOutbox.objects.filter(pk=self.message.pk).update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+
+    def test_claim_leases_rows(self):
+        claimed = claim_batch(10)
+        self.assertEqual([message.pk for message in claimed], [self.message.pk])
+        self.assertEqual(claimed[0].status, 'SENDING')
+        self.assertEqual(claimed[0].attempts, 1)
+        self.assertGreater(claimed[0].next_attempt_at, timezone.now())
+        self.assertEqual(claim_batch(10), [])  # Still leased
+
+    def test_expired_lease_is_claimed_again(self):
+        claim_batch(10)
+        self.expire_lease()
+        self.assertEqual(claim_batch(10)[0].attempts, 2)
+
+    def test_row_fails_after_max_attempts_of_expired_leases(self):
+        for _ in range(3):
+            self.assertEqual(len(claim_batch(10)), 1)
+            self.expire_lease()
+        self.assertEqual(claim_batch(10), [])
+        self.message.refresh_from_db()
+        self.assertEqual(self.message.status, 'FAILED')
+        self.assertEqual(self.message.attempts, 3)
+
+    def test_drain_sends_and_marks_rows(self):
+        report = drain_outbox()
+        self.assertEqual(report['sent'], 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.message.refresh_from_db()
+        self.assertEqual(self.message.status, 'SENT')